@@ -0,0 +1,25 @@
+from django.contrib import admin
+from apps.tasks.admin import LargeTableAdminMixin
+from .models import ActivityEvent
+
+
+@admin.register(ActivityEvent)
+class ActivityEventAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ['id', 'organization', 'object_type', 'object_repr', 'action', 'created_at']
+    list_filter = ['object_type', 'action']
+    search_fields = ['object_repr']
+    list_select_related = ['organization']
+    readonly_fields = [
+        'organization', 'project', 'object_type', 'object_id', 'action',
+        'object_repr', 'changed_fields', 'created_at'
+    ]
+
+    # The log is append-only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
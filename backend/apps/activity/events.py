@@ -0,0 +1,251 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import F, Value
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from apps.projects.models import Project
+from apps.tasks.models import ArchivedTask, ArchivedTaskComment, Task, TaskComment
+from .models import ActivityEvent
+from .rollups import add_events
+
+
+# recentActivityCount covers this much time
+RECENT_ACTIVITY_WINDOW = timedelta(days=7)
+
+# Events older than this are assumed committed, so counts of them can be
+# cached; newer ones may still appear below the highest id seen so far.
+SETTLE_TIME = timedelta(minutes=1)
+
+
+def _describe(instance):
+    """Object type, project id and label of a project, task or comment"""
+    if isinstance(instance, Project):
+        return 'PROJECT', instance.pk, instance.name
+    if isinstance(instance, Task):
+        return 'TASK', instance.project_id, instance.title
+    if isinstance(instance, TaskComment):
+        return 'COMMENT', instance.task.project_id, Truncator(instance.content).chars(80)
+    raise TypeError(f'No activity is recorded for {type(instance).__name__}')
+
+
+def _organization_id(instance, project_id):
+    if isinstance(instance, Project):
+        return instance.organization_id
+    if isinstance(instance, Task) and Task.project.is_cached(instance):
+        return instance.project.organization_id
+    return Project.all_objects.filter(pk=project_id).values_list('organization_id', flat=True).first()
+
+
+def record_event(instance, action, changed_fields=None):
+    """
+    Append an event for ``action`` ('CREATED', 'UPDATED' or 'DELETED') on
+    ``instance`` and add it to the daily counters.
+    """
+    object_type, project_id, label = _describe(instance)
+    event = ActivityEvent.objects.create(
+        organization_id=_organization_id(instance, project_id),
+        project_id=project_id,
+        object_type=object_type,
+        object_id=instance.pk,
+        action=action,
+        object_repr=label[:200],
+        changed_fields=changed_fields or {},
+    )
+    add_events([event])
+    return event
+
+
+def record_task_updates(queryset, **new_values):
+    """
+    Append UPDATED events for the tasks in ``queryset`` whose fields differ
+    from ``new_values`` (values or expressions). Call it just before the
+    ``queryset.update(**new_values)`` it describes, which bypasses saves.
+    """
+    fields = list(new_values)
+    rows = queryset.annotate(**{
+        f'new_{field}': value if hasattr(value, 'resolve_expression') else Value(value)
+        for field, value in new_values.items()
+    }).annotate(organization_id=F('project__organization_id')).values(
+        'id', 'title', 'project_id', 'organization_id', *fields, *[f'new_{field}' for field in fields]
+    ).order_by('id')
+
+    now = timezone.now()
+    events = []
+    for row in rows:
+        changes = {
+            field: [row[field], row[f'new_{field}']]
+            for field in fields if row[field] != row[f'new_{field}']
+        }
+        if changes:
+            events.append(ActivityEvent(
+                organization_id=row['organization_id'],
+                project_id=row['project_id'],
+                object_type='TASK',
+                object_id=row['id'],
+                action='UPDATED',
+                object_repr=row['title'],
+                changed_fields=changes,
+                created_at=now,
+            ))
+    ActivityEvent.objects.bulk_create(events, batch_size=1000)
+    add_events(events)
+    return len(events)
+
+
+def record_deletions(queryset):
+    """
+    Append DELETED events for the tasks or comments in ``queryset`` and, for
+    tasks, the comments deleted with them. Call it just before the
+    ``queryset.delete()`` it describes, which bypasses the models' delete().
+    """
+    comments = queryset
+    rows = []
+    if queryset.model is Task:
+        comments = TaskComment.objects.filter(task__in=queryset.values('pk'))
+        rows += [
+            ('TASK', *row) for row in queryset.values_list(
+                'id', 'title', 'project_id', 'project__organization_id'
+            ).order_by('id')
+        ]
+    rows += [
+        ('COMMENT', comment_id, Truncator(content).chars(80), project_id, organization_id)
+        for comment_id, content, project_id, organization_id in comments.values_list(
+            'id', 'content', 'task__project_id', 'task__project__organization_id'
+        ).order_by('id')
+    ]
+
+    now = timezone.now()
+    events = [
+        ActivityEvent(
+            organization_id=organization_id,
+            project_id=project_id,
+            object_type=object_type,
+            object_id=object_id,
+            action='DELETED',
+            object_repr=label[:200],
+            created_at=now,
+        )
+        for object_type, object_id, label, project_id, organization_id in rows
+    ]
+    ActivityEvent.objects.bulk_create(events, batch_size=1000)
+    add_events(events)
+    return len(events)
+
+
+def record_archive_events(project_id, archived_at):
+    """
+    Append the events of archiving (``archived_at`` set) or restoring
+    (``archived_at`` None) a project: the project is UPDATED, and its tasks
+    and comments are DELETED from, or CREATED again in, the hot tables. Call
+    it in the transaction that moves the rows, before they move.
+    """
+    project = Project.all_objects.get(pk=project_id)
+    if archived_at is None:
+        action, tasks, comments = 'CREATED', ArchivedTask.objects, ArchivedTaskComment.objects
+    else:
+        action, tasks, comments = 'DELETED', Task.objects, TaskComment.objects
+    changes = {'archived_at': [project.archived_at, archived_at]}
+
+    now = timezone.now()
+    def event(object_type, object_id, action, label):
+        return ActivityEvent(
+            organization_id=project.organization_id,
+            project_id=project_id,
+            object_type=object_type,
+            object_id=object_id,
+            action=action,
+            object_repr=label[:200],
+            changed_fields=changes,
+            created_at=now,
+        )
+
+    events = [event('PROJECT', project_id, 'UPDATED', project.name)]
+    events += [
+        event('TASK', task_id, action, title)
+        for task_id, title in tasks.filter(project_id=project_id).values_list('id', 'title').order_by('id')
+    ]
+    events += [
+        event('COMMENT', comment_id, action, Truncator(content).chars(80))
+        for comment_id, content in comments.filter(task__project_id=project_id)
+        .values_list('id', 'content').order_by('id')
+    ]
+    ActivityEvent.objects.bulk_create(events, batch_size=1000)
+    add_events(events)
+    return len(events)
+
+
+def _first_event_id(since):
+    """Id of the first event recorded at or after ``since``, or one past the last event"""
+    first = ActivityEvent.objects.filter(created_at__gte=since).order_by('created_at', 'id')
+    event_id = first.values_list('id', flat=True).first()
+    if event_id is None:
+        last = ActivityEvent.objects.order_by('-id').values_list('id', flat=True).first()
+        event_id = (last or 0) + 1
+    return event_id
+
+
+def recent_activity_count(organization, now=None):
+    """
+    Number of events of ``organization`` in the last RECENT_ACTIVITY_WINDOW.
+
+    The count of settled events is cached with the id range it covers; later
+    calls only count the events that entered or left the window since, plus
+    the unsettled tail, each a short range of the (organization, id) index.
+    """
+    if now is None:
+        now = timezone.now()
+    start = _first_event_id(now - RECENT_ACTIVITY_WINDOW)
+    settled = max(start, _first_event_id(now - SETTLE_TIME))
+    events = ActivityEvent.objects.filter(organization_id=organization.pk)
+
+    key = f'activity:recent:{organization.pk}'
+    cached = cache.get(key)
+    if cached is not None and cached[0] <= start <= cached[1] <= settled:
+        cached_start, cached_end, count = cached
+        if settled > cached_end:
+            count += events.filter(id__gte=cached_end, id__lt=settled).count()
+        if start > cached_start:
+            count -= events.filter(id__gte=cached_start, id__lt=start).count()
+    else:
+        count = events.filter(id__gte=start, id__lt=settled).count()
+    cache.set(key, (start, settled, count), RECENT_ACTIVITY_WINDOW.total_seconds())
+
+    return count + events.filter(id__gte=settled).count()
+
+
+def changed_objects(organization, after_id, limit):
+    """
+    Ids of the projects, tasks and comments of ``organization`` with events
+    after ``after_id``, reading at most ``limit`` events.
+
+    Returns ``(changed, project_ids, cursor, has_more)``: ``changed`` maps
+    object types to sets of ids, ``project_ids`` holds the projects of the
+    changed tasks, and ``cursor`` is the event id to resume from. The final
+    page's cursor stays behind events younger than SETTLE_TIME, which may
+    still be joined by lower ids committing late, so those are sent again.
+    Without ``after_id`` nothing is returned but the current cursor.
+    """
+    settled = _first_event_id(timezone.now() - SETTLE_TIME)
+    if after_id is None:
+        return {object_type: set() for object_type, _ in ActivityEvent.OBJECT_TYPE_CHOICES}, set(), settled - 1, False
+
+    events = list(
+        organization.activity_events.filter(id__gt=after_id).order_by('id')
+        .values_list('id', 'object_type', 'object_id', 'project_id')[:limit + 1]
+    )
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    changed = {object_type: set() for object_type, _ in ActivityEvent.OBJECT_TYPE_CHOICES}
+    project_ids = set()
+    for _, object_type, object_id, project_id in events:
+        changed[object_type].add(object_id)
+        if object_type == 'TASK':
+            project_ids.add(project_id)
+
+    cursor = events[-1][0] if events else after_id
+    if not has_more:
+        cursor = max(after_id, min(cursor, settled - 1))
+    return changed, project_ids, cursor, has_more
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.jobs.registry import job
+from .rollups import reconcile_rollups
+
+
+def reconcile_recent_days(days=None):
+    """Reconcile the counters of the ``days`` (ROLLUP_RECONCILE_DAYS) days before today"""
+    if days is None:
+        days = settings.ROLLUP_RECONCILE_DAYS
+    today = timezone.localdate()
+    return reconcile_rollups(today - timedelta(days=days), today - timedelta(days=1))
+
+
+@job('activity.reconcile_rollups')
+def reconcile_rollups_job(job, days=None):
+    """Recompute the daily counters of the last few days from the activity log"""
+    return reconcile_recent_days(days)
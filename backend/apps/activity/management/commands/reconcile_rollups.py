@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.activity.jobs import reconcile_recent_days, reconcile_rollups_job
+
+
+class Command(BaseCommand):
+    help = ('Recompute the daily activity counters of the last few days from activity_events. '
+            'Run it from cron nightly, after midnight.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ROLLUP_RECONCILE_DAYS,
+                            help='Reconcile this many days before today')
+        parser.add_argument('--queue', action='store_true',
+                            help='Enqueue a background job instead of reconciling in this process')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+
+        if options['queue']:
+            queued = reconcile_rollups_job.enqueue(days=options['days'])
+            self.stdout.write(self.style.SUCCESS(f'Queued job {queued.pk}'))
+            return
+
+        counts = reconcile_recent_days(options['days'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled {counts['days']} days ({counts['organizations']} organization "
+            f"and {counts['projects']} project rows)"
+        ))
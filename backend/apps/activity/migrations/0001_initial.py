@@ -0,0 +1,71 @@
+# Generated by Django 4.2.23 on 2026-10-19 09:12
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from datetime import timedelta
+
+
+def backfill_recent_activity(apps, schema_editor):
+    """Record the last week's tasks and comments, which recentActivityCount used to count"""
+    Task = apps.get_model('tasks', 'Task')
+    TaskComment = apps.get_model('tasks', 'TaskComment')
+    ActivityEvent = apps.get_model('activity', 'ActivityEvent')
+    since = django.utils.timezone.now() - timedelta(days=7)
+
+    events = [
+        ActivityEvent(
+            organization_id=task['project__organization_id'], project_id=task['project_id'],
+            object_type='TASK', object_id=task['id'], action='CREATED',
+            object_repr=task['title'][:200], created_at=task['created_at'],
+        )
+        for task in Task.objects.filter(created_at__gte=since).values(
+            'id', 'title', 'project_id', 'project__organization_id', 'created_at'
+        )
+    ] + [
+        ActivityEvent(
+            organization_id=comment['task__project__organization_id'], project_id=comment['task__project_id'],
+            object_type='COMMENT', object_id=comment['id'], action='CREATED',
+            object_repr=comment['content'][:80], created_at=comment['created_at'],
+        )
+        for comment in TaskComment.objects.filter(created_at__gte=since).values(
+            'id', 'content', 'task__project_id', 'task__project__organization_id', 'created_at'
+        )
+    ]
+    events.sort(key=lambda event: event.created_at)
+    ActivityEvent.objects.bulk_create(events, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('organizations', '0003_soft_delete'),
+        ('projects', '0003_project_archived_at'),
+        ('tasks', '0005_overdue_flag'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('PROJECT', 'Project'), ('TASK', 'Task'), ('COMMENT', 'Comment')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('CREATED', 'Created'), ('UPDATED', 'Updated'), ('DELETED', 'Deleted')], max_length=10)),
+                ('object_repr', models.CharField(max_length=200)),
+                ('changed_fields', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('organization', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='activity_events', to='organizations.organization')),
+                ('project', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='projects.project')),
+            ],
+            options={
+                'db_table': 'activity_events',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['organization', 'id'], name='activity_org_id_idx'), models.Index(fields=['created_at'], name='activity_created_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_recent_activity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.23 on 2026-10-19 09:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0003_soft_delete'),
+        ('projects', '0003_project_archived_at'),
+        ('activity', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationDailyCounts',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('tasks_created', models.IntegerField(default=0)),
+                ('tasks_completed', models.IntegerField(default=0)),
+                ('status_changes', models.IntegerField(default=0)),
+                ('comments_created', models.IntegerField(default=0)),
+                ('organization', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='daily_counts', to='organizations.organization')),
+            ],
+            options={
+                'db_table': 'organization_daily_counts',
+                'ordering': ['organization', 'date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectDailyCounts',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('tasks_created', models.IntegerField(default=0)),
+                ('tasks_completed', models.IntegerField(default=0)),
+                ('status_changes', models.IntegerField(default=0)),
+                ('comments_created', models.IntegerField(default=0)),
+                ('organization', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='organizations.organization')),
+                ('project', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='daily_counts', to='projects.project')),
+            ],
+            options={
+                'db_table': 'project_daily_counts',
+                'ordering': ['project', 'date'],
+                'indexes': [models.Index(fields=['date'], name='project_daily_counts_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='projectdailycounts',
+            constraint=models.UniqueConstraint(fields=('project', 'date'), name='project_daily_counts_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='organizationdailycounts',
+            index=models.Index(fields=['date'], name='org_daily_counts_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='organizationdailycounts',
+            constraint=models.UniqueConstraint(fields=('organization', 'date'), name='org_daily_counts_unique'),
+        ),
+    ]
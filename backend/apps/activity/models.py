@@ -0,0 +1,122 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class ActivityEvent(models.Model):
+    """
+    One change to a project, task or comment. Rows are only ever appended;
+    ids increase with time, so an organization's feed and its recent activity
+    are ranges of the (organization, id) index.
+    """
+    OBJECT_TYPE_CHOICES = [
+        ('PROJECT', 'Project'),
+        ('TASK', 'Task'),
+        ('COMMENT', 'Comment'),
+    ]
+    ACTION_CHOICES = [
+        ('CREATED', 'Created'),
+        ('UPDATED', 'Updated'),
+        ('DELETED', 'Deleted'),
+    ]
+
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='activity_events',
+        db_index=False
+    )
+    # Kept after the project is purged, so no database constraint
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.DO_NOTHING,
+        related_name='+',
+        db_constraint=False,
+        db_index=False,
+        null=True
+    )
+    object_type = models.CharField(max_length=10, choices=OBJECT_TYPE_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    # Name, title or comment excerpt at the time of the change
+    object_repr = models.CharField(max_length=200)
+    # {field: [old, new]} for updates
+    changed_fields = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'activity_events'
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['organization', 'id'], name='activity_org_id_idx'),
+            # Finds where the recent-activity window starts
+            models.Index(fields=['created_at'], name='activity_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_object_type_display()} {self.object_repr!r} {self.action.lower()}"
+
+
+class DailyCounts(models.Model):
+    """Counters of one day's events, kept by apps.activity.rollups"""
+    date = models.DateField()
+    tasks_created = models.IntegerField(default=0)
+    tasks_completed = models.IntegerField(default=0)
+    status_changes = models.IntegerField(default=0)
+    comments_created = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class OrganizationDailyCounts(DailyCounts):
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='daily_counts',
+        db_index=False
+    )
+
+    class Meta:
+        db_table = 'organization_daily_counts'
+        ordering = ['organization', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['organization', 'date'], name='org_daily_counts_unique'),
+        ]
+        indexes = [
+            # Reconciliation replaces a range of days across all organizations
+            models.Index(fields=['date'], name='org_daily_counts_date_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.organization_id} on {self.date}'
+
+
+class ProjectDailyCounts(DailyCounts):
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False
+    )
+    # Deleted by purge_project along with the project row
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.DO_NOTHING,
+        related_name='daily_counts',
+        db_constraint=False,
+        db_index=False
+    )
+
+    class Meta:
+        db_table = 'project_daily_counts'
+        ordering = ['project', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'date'], name='project_daily_counts_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='project_daily_counts_date_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.project_id} on {self.date}'
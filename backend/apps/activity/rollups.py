@@ -0,0 +1,178 @@
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from apps.organizations.models import Organization
+from .models import ActivityEvent, OrganizationDailyCounts, ProjectDailyCounts
+
+
+METRICS = ['tasks_created', 'tasks_completed', 'status_changes', 'comments_created']
+
+# Truncation of the rollup dates for each bucket, which starts on a Monday for weeks
+BUCKETS = {
+    'DAY': None,
+    'WEEK': TruncWeek,
+    'MONTH': TruncMonth,
+}
+
+# Counts of the events each metric counts, for reconciliation
+METRIC_FILTERS = {
+    'tasks_created': Q(object_type='TASK', action='CREATED') & ~Q(changed_fields__has_key='archived_at'),
+    'tasks_completed': Q(object_type='TASK', action='UPDATED', changed_fields__status__1='DONE'),
+    'status_changes': Q(object_type='TASK', action='UPDATED', changed_fields__has_key='status'),
+    'comments_created': Q(object_type='COMMENT', action='CREATED') & ~Q(changed_fields__has_key='archived_at'),
+}
+
+
+def event_counts(object_type, action, changed_fields):
+    """The metrics an event adds one to; the incremental twin of METRIC_FILTERS"""
+    # Restoring an archived project brings its tasks and comments back, it does not create them
+    if 'archived_at' in changed_fields:
+        return []
+    if action == 'CREATED' and object_type == 'TASK':
+        return ['tasks_created']
+    if action == 'CREATED' and object_type == 'COMMENT':
+        return ['comments_created']
+    if action == 'UPDATED' and object_type == 'TASK' and 'status' in changed_fields:
+        if changed_fields['status'][1] == 'DONE':
+            return ['status_changes', 'tasks_completed']
+        return ['status_changes']
+    return []
+
+
+def _upsert(model, key_columns, unique_columns, totals):
+    """
+    Add ``totals`` ({(*key_columns, date): Counter}) to the rows of ``model``,
+    creating the missing ones; ``unique_columns`` is its unique constraint.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = key_columns + ['date'] + METRICS
+    placeholders = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    params = []
+    # Rows are locked in key order, so concurrent upserts cannot deadlock
+    for key in sorted(totals):
+        params += [*key, *(totals[key][metric] for metric in METRICS)]
+    updates = ', '.join(f'{metric} = {table}.{metric} + EXCLUDED.{metric}' for metric in METRICS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} ({", ".join(columns)}) VALUES {", ".join([placeholders] * len(totals))} '
+            f'ON CONFLICT ({", ".join(unique_columns)}) DO UPDATE SET {updates}',
+            params,
+        )
+
+
+def add_events(events):
+    """
+    Add ActivityEvents to the daily counters of their projects and
+    organizations, with one upsert per table. Call it in the transaction
+    that records them.
+    """
+    projects = defaultdict(Counter)
+    organizations = defaultdict(Counter)
+    for event in events:
+        metrics = event_counts(event.object_type, event.action, event.changed_fields)
+        if not metrics:
+            continue
+        date = timezone.localdate(event.created_at)
+        organizations[(event.organization_id, date)].update(metrics)
+        if event.project_id is not None:
+            projects[(event.organization_id, event.project_id, date)].update(metrics)
+
+    if projects:
+        _upsert(ProjectDailyCounts, ['organization_id', 'project_id'], ['project_id', 'date'], projects)
+    if organizations:
+        _upsert(OrganizationDailyCounts, ['organization_id'], ['organization_id', 'date'], organizations)
+
+
+def reconcile_rollups(start, end):
+    """
+    Recompute the counters of the days ``start`` to ``end`` (inclusive) from
+    activity_events, replacing what the incremental updates left there.
+
+    Best run on days that are over: an event recorded while its day is being
+    reconciled may be counted once the next time only. The organizations
+    whose counters were rewritten get their data version bumped.
+    """
+    since = timezone.make_aware(datetime.combine(start, time.min))
+    until = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+    rows = ActivityEvent.objects.filter(
+        created_at__gte=since, created_at__lt=until, object_type__in=['TASK', 'COMMENT']
+    ).annotate(date=TruncDate('created_at')).values('organization_id', 'project_id', 'date').annotate(
+        **{metric: Count('id', filter=condition) for metric, condition in METRIC_FILTERS.items()}
+    ).order_by()
+
+    projects = []
+    organizations = {}
+    for row in rows:
+        if not any(row[metric] for metric in METRICS):
+            continue
+        counts = {metric: row[metric] for metric in METRICS}
+        projects.append(ProjectDailyCounts(
+            organization_id=row['organization_id'], project_id=row['project_id'], date=row['date'], **counts
+        ))
+        key = (row['organization_id'], row['date'])
+        if key not in organizations:
+            organizations[key] = OrganizationDailyCounts(organization_id=key[0], date=key[1])
+        for metric, value in counts.items():
+            setattr(organizations[key], metric, getattr(organizations[key], metric) + value)
+
+    touched = {organization_id for organization_id, _ in organizations}
+    with transaction.atomic():
+        for model, objects, unique_fields in [
+            (ProjectDailyCounts, projects, ['project', 'date']),
+            (OrganizationDailyCounts, list(organizations.values()), ['organization', 'date']),
+        ]:
+            existing = model.objects.filter(date__gte=start, date__lte=end)
+            touched.update(existing.values_list('organization_id', flat=True).distinct())
+            existing.delete()
+            # Rows added by events committing meanwhile are overwritten
+            model.objects.bulk_create(
+                objects, batch_size=1000,
+                update_conflicts=True, unique_fields=unique_fields, update_fields=METRICS,
+            )
+        Organization.bump_data_version(pk__in=touched)
+
+    return {'days': (end - start).days + 1, 'projects': len(projects), 'organizations': len(organizations)}
+
+
+def bucket_start(date, bucket):
+    if bucket == 'WEEK':
+        return date - timedelta(days=date.weekday())
+    if bucket == 'MONTH':
+        return date.replace(day=1)
+    return date
+
+
+def next_bucket(date, bucket):
+    if bucket == 'WEEK':
+        return date + timedelta(days=7)
+    if bucket == 'MONTH':
+        return (date.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return date + timedelta(days=1)
+
+
+def time_series(queryset, metric, start, end, bucket='DAY'):
+    """
+    ``[(bucket_start, total)]`` of ``metric`` in the daily counters of
+    ``queryset`` from ``start`` to ``end``, with a zero for empty buckets.
+    Reads one row per day at most, however many events there were.
+    """
+    rows = queryset.filter(date__gte=start, date__lte=end).order_by()
+    if BUCKETS[bucket] is None:
+        totals = dict(rows.values_list('date', metric))
+    else:
+        totals = dict(
+            rows.annotate(bucket=BUCKETS[bucket]('date')).values('bucket')
+            .annotate(total=Sum(metric)).values_list('bucket', 'total')
+        )
+
+    points = []
+    date = bucket_start(start, bucket)
+    while date <= end:
+        points.append((date, totals.get(date, 0)))
+        date = next_bucket(date, bucket)
+    return points
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskComment
+from .events import record_event
+
+
+# Every save appends an event. Deletes of tasks and comments are recorded in
+# their model's delete(), for the same fast-delete reason as in
+# apps.organizations.signals; queryset updates call record_task_updates.
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=TaskComment)
+def record_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        record_event(instance, 'CREATED')
+    else:
+        changes = instance.changed_fields()
+        if changes:
+            record_event(instance, 'UPDATED', changes)
+    instance.remember_values()
+
+
+@receiver(post_delete, sender=Project)
+def record_project_delete(sender, instance, **kwargs):
+    record_event(instance, 'DELETED')
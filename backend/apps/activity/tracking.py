@@ -0,0 +1,30 @@
+class TrackedChangesMixin:
+    """
+    Model mixin remembering the values a row was loaded or last saved with,
+    so a save can report the fields it changed without reading the row again.
+    """
+    # Fields left out of change diffs
+    untracked_fields = ('created_at', 'updated_at')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._tracked_values = dict(zip(field_names, values))
+        return instance
+
+    def remember_values(self):
+        self._tracked_values = {
+            field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields
+        }
+
+    def changed_fields(self):
+        """``{field: [old, new]}`` for the fields changed since loading or saving"""
+        old_values = getattr(self, '_tracked_values', {})
+        changes = {}
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.name in self.untracked_fields or field.attname not in old_values:
+                continue
+            old, new = old_values[field.attname], getattr(self, field.attname)
+            if old != new:
+                changes[field.name] = [old, new]
+        return changes
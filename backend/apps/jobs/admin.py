@@ -0,0 +1,89 @@
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.html import format_html
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'name',
+        'status_badge',
+        'priority',
+        'attempts',
+        'progress',
+        'run_after',
+        'created_at',
+        'finished_at'
+    ]
+    list_filter = ['status', 'name', 'created_at']
+    search_fields = ['name', 'error']
+    readonly_fields = [
+        'attempts',
+        'locked_until',
+        'locked_by',
+        'progress',
+        'result',
+        'error',
+        'created_at',
+        'started_at',
+        'finished_at'
+    ]
+    date_hierarchy = 'created_at'
+    actions = ['retry_jobs', 'cancel_jobs']
+
+    def status_badge(self, obj):
+        colors = {
+            'PENDING': '#6c757d',
+            'RUNNING': '#007bff',
+            'COMPLETED': '#28a745',
+            'FAILED': '#dc3545'
+        }
+        return format_html(
+            '<span style="color: {}; font-weight: bold;">{}</span>',
+            colors.get(obj.status, '#6c757d'),
+            obj.get_status_display()
+        )
+    status_badge.short_description = 'Status'
+
+    @admin.action(description='Retry selected failed jobs')
+    def retry_jobs(self, request, queryset):
+        updated = queryset.filter(status='FAILED').update(
+            status='PENDING', attempts=0, run_after=timezone.now(), finished_at=None
+        )
+        self.message_user(request, f'{updated} jobs queued again.')
+
+    @admin.action(description='Cancel selected pending jobs')
+    def cancel_jobs(self, request, queryset):
+        updated = queryset.filter(status='PENDING').update(
+            status='FAILED', error='Cancelled', finished_at=timezone.now()
+        )
+        self.message_user(request, f'{updated} jobs cancelled.')
+
+
+class BackgroundDeletionAdmin(admin.ModelAdmin):
+    """
+    Delete objects by soft-deleting them and queueing ``deletion_job`` to
+    purge them, instead of collecting and deleting every related row inside
+    the admin request.
+    """
+    deletion_job = None
+    deletion_job_argument = None
+
+    def delete_model(self, request, obj):
+        obj.soft_delete()
+        self.deletion_job.enqueue(**{self.deletion_job_argument: obj.pk})
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            self.delete_model(request, obj)
+
+    def get_deleted_objects(self, objs, request):
+        # Summarise without walking the relations; related rows are removed by the job
+        objs = list(objs)
+        perms_needed = set()
+        if not self.has_delete_permission(request):
+            perms_needed.add(self.opts.verbose_name)
+        deleted_objects = [f'{self.opts.verbose_name}: {obj} (related data is removed in the background)' for obj in objs]
+        return deleted_objects, {self.opts.verbose_name_plural: len(objs)}, perms_needed, []
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs from the jobs table using a pool of worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2,
+                            help='Worker processes; 0 runs jobs in this process')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait between polls when the queue is empty')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once no runnable jobs are left')
+
+    def handle(self, *args, **options):
+        if options['processes'] < 0:
+            raise CommandError('--processes cannot be negative')
+
+        worker = Worker(
+            processes=options['processes'],
+            poll_interval=options['poll_interval'],
+            burst=options['burst'],
+            log=self.stdout.write,
+        )
+        try:
+            processed = worker.run()
+        except KeyboardInterrupt:
+            processed = worker.processed
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} jobs'))
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    args = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    priority = models.IntegerField(default=0, help_text='Higher runs first')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    progress = models.FloatField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-priority', 'run_after'],
+                name='jobs_pending_idx',
+                condition=Q(status='PENDING'),
+            ),
+            models.Index(fields=['status', 'locked_until']),
+            models.Index(fields=['name', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in ('COMPLETED', 'FAILED')
+
+    def set_progress(self, progress):
+        """Record progress (0-100) and extend the worker's lease on the job, if it still holds it"""
+        self.progress = max(0, min(100, round(progress, 1)))
+        Job.objects.filter(pk=self.pk, status='RUNNING', locked_by=self.locked_by, attempts=self.attempts).update(
+            progress=self.progress,
+            locked_until=timezone.now() + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+        )
+
+    def retry_delay(self):
+        """Exponential backoff after the current attempt"""
+        return timedelta(seconds=settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** max(self.attempts - 1, 0))
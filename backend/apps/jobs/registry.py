@@ -0,0 +1,53 @@
+from django.utils import timezone
+
+from .models import Job
+
+
+registry = {}
+
+
+class JobNotRegistered(Exception):
+    pass
+
+
+def job(name, max_attempts=3, priority=0):
+    """
+    Register a function as a background job.
+
+    The function is called as ``func(job, **args)`` with the :class:`Job`
+    row, so it can report progress. Its return value must be JSON
+    serializable and is stored as the job result. Jobs may run more than once
+    after a failure or a lost worker, so they should be idempotent.
+    """
+    def decorator(func):
+        func.job_name = name
+        func.max_attempts = max_attempts
+        func.priority = priority
+        func.enqueue = lambda **kwargs: enqueue(name, **kwargs)
+        registry[name] = func
+        return func
+    return decorator
+
+
+def get_job_function(name):
+    try:
+        return registry[name]
+    except KeyError:
+        raise JobNotRegistered(f'No job registered as "{name}"')
+
+
+def enqueue(name, priority=None, run_after=None, max_attempts=None, **args):
+    """
+    Queue ``name`` to run with ``args`` and return the Job.
+
+    Inside a transaction the job only becomes visible to workers on commit,
+    so it never runs against rows the request has not committed yet.
+    """
+    func = get_job_function(name)
+    return Job.objects.create(
+        name=name,
+        args=args,
+        priority=func.priority if priority is None else priority,
+        max_attempts=func.max_attempts if max_attempts is None else max_attempts,
+        run_after=run_after or timezone.now(),
+    )
@@ -0,0 +1,208 @@
+import logging
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_job_function
+
+
+logger = logging.getLogger('apps.jobs')
+
+
+def claim_jobs(worker_id, limit=1):
+    """
+    Lease up to ``limit`` runnable jobs for ``worker_id``.
+
+    Rows are locked with ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent
+    workers never claim the same job. Jobs whose lease expired while running
+    (a worker died) are claimed again, unless that was their last attempt:
+    those fail, so a job that kills its worker is not retried forever.
+    """
+    now = timezone.now()
+    expired = Q(status='RUNNING', locked_until__lt=now)
+    with transaction.atomic():
+        Job.objects.filter(expired, attempts__gte=F('max_attempts')).update(
+            status='FAILED',
+            error='The worker running the last attempt stopped renewing its lease.',
+            locked_until=None,
+            finished_at=now,
+        )
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status='PENDING', run_after__lte=now)
+                | (expired & Q(attempts__lt=F('max_attempts')))
+            )
+            .order_by('-priority', 'run_after', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        if ids:
+            Job.objects.filter(pk__in=ids).update(
+                status='RUNNING',
+                attempts=F('attempts') + 1,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                started_at=now,
+            )
+    return ids
+
+
+def renew_leases(worker_id, job_ids):
+    """Extend the leases of the jobs ``worker_id`` is still running"""
+    return Job.objects.filter(pk__in=job_ids, status='RUNNING', locked_by=worker_id).update(
+        locked_until=timezone.now() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+    )
+
+
+def current_claim(job):
+    """
+    The job row as long as it is still held by the claim ``job`` was loaded
+    under. Each claim increments ``attempts``, so a run whose lease expired
+    and was taken over cannot overwrite the newer run.
+    """
+    return Job.objects.filter(pk=job.pk, status='RUNNING', locked_by=job.locked_by, attempts=job.attempts)
+
+
+def execute_job(job_id):
+    """Run one claimed job and record its outcome; returns the final status"""
+    job = Job.objects.get(pk=job_id)
+    try:
+        result = get_job_function(job.name)(job, **job.args)
+    except Exception:
+        fail_job(job, traceback.format_exc())
+    else:
+        updated = current_claim(job).update(
+            status='COMPLETED',
+            progress=100,
+            result=result,
+            error='',
+            locked_until=None,
+            finished_at=timezone.now(),
+        )
+        job.status = 'COMPLETED' if updated else 'LOST'
+        if not updated:
+            logger.warning('Job %s lost its lease before finishing; its result was discarded', job)
+    return job.status
+
+
+def execute_job_in_child(job_id):
+    """Entry point in pool processes, which keep their connections between jobs"""
+    close_old_connections()
+    try:
+        return execute_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def fail_job(job, error):
+    """
+    Schedule a retry with backoff, or mark the job failed after its last
+    attempt. Nothing is recorded if the job's claim has been taken over.
+    """
+    if job.attempts < job.max_attempts:
+        updated = current_claim(job).update(
+            status='PENDING', error=error, locked_until=None,
+            run_after=timezone.now() + job.retry_delay(),
+        )
+        job.status = 'PENDING'
+        if updated:
+            logger.warning('Job %s failed (attempt %s of %s), retrying', job, job.attempts, job.max_attempts)
+    else:
+        updated = current_claim(job).update(
+            status='FAILED', error=error, locked_until=None, finished_at=timezone.now(),
+        )
+        job.status = 'FAILED'
+        if updated:
+            logger.error('Job %s failed permanently:\n%s', job, error)
+    if not updated:
+        job.status = 'LOST'
+        logger.warning('Job %s lost its lease before failing; its error was discarded:\n%s', job, error)
+
+
+class Worker:
+    """
+    Poll the jobs table and run jobs in a pool of processes.
+
+    With ``processes=0`` jobs run one at a time in the current process, which
+    is what tests and local development use; long jobs there must call
+    ``set_progress`` to keep their lease. Child processes are started with
+    the ``spawn`` method and set Django up themselves, so they never share the
+    parent's database connections. The parent renews the leases of the jobs
+    in flight every third of JOB_LEASE_SECONDS, so only a dead worker's jobs
+    are taken over.
+    """
+
+    def __init__(self, processes=2, poll_interval=1.0, burst=False, log=None):
+        self.processes = processes
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.log = log or (lambda message: None)
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.processed = 0
+
+    def run(self):
+        if self.processes == 0:
+            return self.run_inline()
+
+        executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        )
+        running = {}
+        renewed = time.monotonic()
+        try:
+            while True:
+                capacity = self.processes - len(running)
+                job_ids = claim_jobs(self.worker_id, capacity) if capacity else []
+                for job_id in job_ids:
+                    running[executor.submit(execute_job_in_child, job_id)] = job_id
+
+                if not running:
+                    if self.burst:
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+
+                done, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.finished(running.pop(future), future)
+
+                if running and time.monotonic() - renewed >= settings.JOB_LEASE_SECONDS / 3:
+                    renew_leases(self.worker_id, list(running.values()))
+                    renewed = time.monotonic()
+        finally:
+            executor.shutdown(wait=True)
+        return self.processed
+
+    def run_inline(self):
+        while True:
+            job_ids = claim_jobs(self.worker_id, 1)
+            if not job_ids:
+                if self.burst:
+                    return self.processed
+                time.sleep(self.poll_interval)
+                continue
+            self.processed += 1
+            self.log(f'Job {job_ids[0]}: {execute_job(job_ids[0])}')
+
+    def finished(self, job_id, future):
+        self.processed += 1
+        try:
+            status = future.result()
+        except Exception:
+            # The child process died; the job may not have recorded anything
+            fail_job(Job.objects.get(pk=job_id), traceback.format_exc())
+            status = 'CRASHED'
+        self.log(f'Job {job_id}: {status}')
@@ -1,13 +1,27 @@
 from django.contrib import admin
-from .models import Organization
+from apps.jobs.admin import BackgroundDeletionAdmin
+from .jobs import delete_organization
+from apps.projects.models import Project
+from .models import Organization, subquery_count
 
 
 @admin.register(Organization)
-class OrganizationAdmin(admin.ModelAdmin):
+class OrganizationAdmin(BackgroundDeletionAdmin):
     list_display = ['name', 'slug', 'contact_email', 'project_count', 'is_active', 'created_at']
     list_filter = ['is_active', 'created_at']
     search_fields = ['name', 'contact_email', 'slug']
     readonly_fields = ['slug', 'created_at', 'updated_at', 'project_count', 'active_project_count']
+    deletion_job = delete_organization
+    deletion_job_argument = 'organization_id'
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _project_count=subquery_count(Project.objects.all(), 'organization'),
+        )
+    
+    @admin.display(description='Project count', ordering='_project_count')
+    def project_count(self, obj):
+        return obj._project_count
     
     fieldsets = (
         ('Basic Information', {
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class OrganizationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.organizations'
\ No newline at end of file
+    name = 'apps.organizations'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,14 @@
+from apps.jobs.registry import job
+from apps.projects.deletion import purge_organization
+from .models import Organization
+
+
+@job('organizations.delete_organization', priority=10)
+def delete_organization(job, organization_id):
+    """Soft-delete an organization if needed, then purge it with all its data"""
+    organization = Organization.all_objects.filter(pk=organization_id).first()
+    if organization is None:
+        return {'comments': 0, 'tasks': 0, 'projects': 0, 'organizations': 0}
+    if organization.deleted_at is None:
+        organization.soft_delete()
+    return purge_organization(organization_id, progress=job.set_progress)
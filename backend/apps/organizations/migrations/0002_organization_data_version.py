@@ -0,0 +1,24 @@
+# Generated by Django 4.2.23 on 2026-10-19 08:28
+
+import apps.organizations.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='data_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='name',
+            field=models.CharField(max_length=100, unique=True, validators=[apps.organizations.models.validate_organization_name]),
+        ),
+    ]
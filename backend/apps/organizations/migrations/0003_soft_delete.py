@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0002_organization_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
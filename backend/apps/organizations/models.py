@@ -1,7 +1,10 @@
 from django.db import models
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils.text import slugify
 from django.core.validators import EmailValidator
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 
 def validate_organization_name(value):
@@ -14,6 +17,29 @@ def validate_organization_name(value):
         raise ValidationError(f'"{value}" is not allowed as an organization name.')
 
 
+class SoftDeleteManager(models.Manager):
+    """Default manager that hides soft-deleted rows; use ``all_objects`` to see them"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+def subquery_count(queryset, field):
+    """
+    Count the rows of ``queryset`` whose ``field`` points at the outer row, as
+    a correlated subquery. Unlike annotating ``Count`` over a join this needs
+    no GROUP BY on the outer query and does not fan out its rows.
+    """
+    counts = (
+        queryset.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(count=Count('*'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
 class Organization(models.Model):
     name = models.CharField(
         max_length=100, 
@@ -25,6 +51,14 @@ class Organization(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Incremented whenever the organization or any of its data changes; used
+    # for HTTP cache validation of GraphQL responses.
+    data_version = models.PositiveBigIntegerField(default=0, editable=False)
+    # Set when the organization is removed; the rows are purged by a job
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
     
     class Meta:
         db_table = 'organizations'
@@ -50,7 +84,27 @@ class Organization(models.Model):
                 slug = f"{base_slug}-{counter}"
                 counter += 1
             self.slug = slug
+        bump_version = not self._state.adding
+        if bump_version:
+            self.data_version = F('data_version') + 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'data_version'}
         super().save(*args, **kwargs)
+        if bump_version:
+            self.refresh_from_db(fields=['data_version'])
+    
+    @classmethod
+    def bump_data_version(cls, **lookup):
+        """Increment the data version of the organizations matching ``lookup``"""
+        cls.objects.filter(**lookup).update(data_version=F('data_version') + 1)
+    
+    def soft_delete(self):
+        """Hide the organization and all of its projects straight away"""
+        self.deleted_at = timezone.now()
+        self.projects.update(deleted_at=self.deleted_at)
+        Organization.all_objects.filter(pk=self.pk).update(
+            deleted_at=self.deleted_at, data_version=F('data_version') + 1
+        )
     
     def __str__(self):
         return self.name
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskComment
+from .models import Organization
+
+
+# Saves and project deletes bump the owning organization's data version here.
+# Task and comment deletes do it in their model's delete() instead, because a
+# delete receiver on those models would stop Django from fast-deleting them
+# when a project is removed. Queryset update() and bulk operations bypass both
+# and must call Organization.bump_data_version themselves.
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, **kwargs):
+    Organization.bump_data_version(pk=instance.organization_id)
+
+
+@receiver(post_save, sender=Task)
+def task_changed(sender, instance, **kwargs):
+    Organization.bump_data_version(projects=instance.project_id)
+
+
+@receiver(post_save, sender=TaskComment)
+def task_comment_changed(sender, instance, **kwargs):
+    Organization.bump_data_version(projects__tasks=instance.task_id)
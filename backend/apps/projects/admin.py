@@ -1,10 +1,16 @@
 from django.contrib import admin
+from django.db.models import ExpressionWrapper, F, FloatField
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.utils.html import format_html
+from apps.jobs.admin import BackgroundDeletionAdmin
+from apps.organizations.models import subquery_count
+from apps.tasks.models import Task
+from .jobs import delete_project
 from .models import Project
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(BackgroundDeletionAdmin):
     list_display = [
         'name', 
         'organization', 
@@ -25,7 +31,10 @@ class ProjectAdmin(admin.ModelAdmin):
         'created_at', 
         'updated_at'
     ]
+    list_select_related = ['organization']
     date_hierarchy = 'created_at'
+    deletion_job = delete_project
+    deletion_job_argument = 'project_id'
     
     fieldsets = (
         ('Basic Information', {
@@ -44,6 +53,38 @@ class ProjectAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_search_results(self, request, queryset, search_term):
+        # Autocomplete results are labelled with the organization name
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        return queryset.select_related('organization'), may_have_duplicates
+    
+    def get_queryset(self, request):
+        # Counted once per page instead of three COUNT queries per row
+        return super().get_queryset(request).annotate(
+            _task_count=subquery_count(Task.objects.all(), 'project'),
+            _completed_task_count=subquery_count(Task.objects.filter(status='DONE'), 'project'),
+        ).annotate(
+            _completion_percentage=Coalesce(
+                ExpressionWrapper(
+                    Cast('_completed_task_count', FloatField()) * 100 / NullIf(F('_task_count'), 0),
+                    output_field=FloatField()
+                ),
+                0.0
+            )
+        )
+    
+    @admin.display(description='Task count', ordering='_task_count')
+    def task_count(self, obj):
+        return obj._task_count
+    
+    @admin.display(description='Completed task count', ordering='_completed_task_count')
+    def completed_task_count(self, obj):
+        return obj._completed_task_count
+    
+    @admin.display(description='Completion percentage', ordering='_completion_percentage')
+    def completion_percentage(self, obj):
+        return round(obj._completion_percentage, 1)
+    
     def status_badge(self, obj):
         colors = {
             'ACTIVE': '#28a745',
@@ -63,4 +104,4 @@ class ProjectAdmin(admin.ModelAdmin):
         if obj.is_overdue:
             return format_html('<span style="color: red;">⚠️ Overdue</span>')
         return '✓'
-    is_overdue_display.short_description = 'Due Status'
\ No newline at end of file
+    is_overdue_display.short_description = 'Due Status'
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from apps.organizations.models import Organization
+
+
+# Materialized views created by projects.0004_dashboard_stats_views, in
+# refresh order: the organization view is built from the project view
+PROJECT_VIEW = 'project_task_stats'
+ORGANIZATION_VIEW = 'organization_dashboard_stats'
+VIEWS = [PROJECT_VIEW, ORGANIZATION_VIEW]
+
+
+def refresh_dashboard_stats():
+    """
+    Recompute the dashboard views. Concurrent refreshes keep them readable
+    while they run, at the price of diffing against the old contents.
+
+    The organizations large enough to be served from the views get their
+    data version bumped, so cached stats responses are not revalidated with
+    the numbers of the previous refresh.
+    """
+    if connection.vendor != 'postgresql':
+        return {'views': 0}
+    with connection.cursor() as cursor:
+        for view in VIEWS:
+            cursor.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {connection.ops.quote_name(view)}')
+        cursor.execute(
+            f'SELECT organization_id FROM {ORGANIZATION_VIEW} WHERE total_tasks >= %s',
+            [settings.DASHBOARD_STATS_MIN_TASKS]
+        )
+        organization_ids = [row[0] for row in cursor.fetchall()]
+    Organization.bump_data_version(pk__in=organization_ids)
+    return {'views': len(VIEWS)}
+
+
+def dashboard_stats(organization, project_id=None, max_age=None, now=None):
+    """
+    The materialized stats of ``organization``, or of one of its projects,
+    as a dict with the view's columns.
+
+    Returns None when the caller should aggregate live instead: the row is
+    missing, older than ``max_age`` seconds (DASHBOARD_STATS_MAX_AGE by
+    default, 0 to always go live), or covers fewer than
+    DASHBOARD_STATS_MIN_TASKS tasks, which are cheap enough to count.
+    """
+    if max_age is None:
+        max_age = settings.DASHBOARD_STATS_MAX_AGE
+    if now is None:
+        now = timezone.now()
+    if max_age <= 0 or connection.vendor != 'postgresql':
+        return None
+
+    if project_id:
+        sql = f'SELECT * FROM {PROJECT_VIEW} WHERE organization_id = %s AND project_id = %s'
+        params = [organization.pk, int(project_id)]
+    else:
+        sql = f'SELECT * FROM {ORGANIZATION_VIEW} WHERE organization_id = %s'
+        params = [organization.pk]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        stats = dict(zip([column[0] for column in cursor.description], row))
+
+    if stats['refreshed_at'] < now - timedelta(seconds=max_age):
+        return None
+    if stats['total_tasks'] < settings.DASHBOARD_STATS_MIN_TASKS:
+        return None
+    return stats
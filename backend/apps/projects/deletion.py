@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.activity.models import ActivityEvent, OrganizationDailyCounts, ProjectDailyCounts
+from apps.organizations.models import Organization
+from apps.tasks.models import ArchivedTask, ArchivedTaskComment, Task, TaskComment
+from .models import Project
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def delete_in_batches(sql, params, batch_size):
+    """
+    Run a ``DELETE ... WHERE id IN (... LIMIT n)`` statement until it removes
+    fewer than ``batch_size`` rows, committing after every batch so locks are
+    only ever held on one batch. Yields the number of rows each batch removed.
+    """
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [*params, batch_size])
+            deleted = cursor.rowcount
+        yield deleted
+        if deleted < batch_size:
+            return
+
+
+def purge_project(project_id, batch_size=None, progress=None):
+    """
+    Remove a project's comments, then its tasks, then the project itself in
+    bounded batches of raw SQL, without loading any rows into memory.
+
+    ``progress`` is called with the percentage done after each batch. Model
+    delete signals and overrides do not run; callers soft-delete the project
+    first so nothing is visible while the purge is in progress.
+    """
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    projects = _table(Project)
+
+    total = 1 + sum(
+        model.objects.filter(**{lookup: project_id}).count()
+        for model, lookup in (
+            (TaskComment, 'task__project_id'), (Task, 'project_id'),
+            (ArchivedTaskComment, 'task__project_id'), (ArchivedTask, 'project_id'),
+        )
+    )
+    counts = {'comments': 0, 'tasks': 0, 'projects': 0}
+    done = 0
+
+    # Hot and archived rows alike, children before parents
+    statements = []
+    for task_model, comment_model in ((Task, TaskComment), (ArchivedTask, ArchivedTaskComment)):
+        comments, tasks = _table(comment_model), _table(task_model)
+        statements += [
+            ('comments', f'''
+                DELETE FROM {comments} WHERE id IN (
+                    SELECT c.id FROM {comments} c JOIN {tasks} t ON t.id = c.task_id
+                    WHERE t.project_id = %s LIMIT %s
+                )
+            '''),
+            ('tasks', f'''
+                DELETE FROM {tasks} WHERE id IN (
+                    SELECT id FROM {tasks} WHERE project_id = %s LIMIT %s
+                )
+            '''),
+        ]
+    for key, sql in statements:
+        for deleted in delete_in_batches(sql, [project_id], batch_size):
+            counts[key] += deleted
+            done += deleted
+            if progress is not None:
+                progress(100 * done / total)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {_table(ProjectDailyCounts)} WHERE project_id = %s', [project_id])
+        cursor.execute(f'DELETE FROM {projects} WHERE id = %s', [project_id])
+        counts['projects'] = cursor.rowcount
+    if progress is not None:
+        progress(100)
+    return counts
+
+
+def purge_organization(organization_id, batch_size=None, progress=None):
+    """Purge every project of an organization, then its activity, its counters and the organization row"""
+    project_ids = list(
+        Project.all_objects.filter(organization_id=organization_id).values_list('id', flat=True)
+    )
+    counts = {'comments': 0, 'tasks': 0, 'projects': 0, 'organizations': 0}
+
+    for index, project_id in enumerate(project_ids):
+        def project_progress(percent, index=index):
+            if progress is not None:
+                progress((index + percent / 100) * 100 / (len(project_ids) + 1))
+
+        for key, value in purge_project(project_id, batch_size, project_progress).items():
+            counts[key] += value
+
+    events = _table(ActivityEvent)
+    for _ in delete_in_batches(f'''
+        DELETE FROM {events} WHERE id IN (
+            SELECT id FROM {events} WHERE organization_id = %s LIMIT %s
+        )
+    ''', [organization_id], batch_size or settings.PURGE_BATCH_SIZE):
+        pass
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {_table(OrganizationDailyCounts)} WHERE organization_id = %s', [organization_id])
+        cursor.execute(f'DELETE FROM {_table(Organization)} WHERE id = %s', [organization_id])
+        counts['organizations'] = cursor.rowcount
+    if progress is not None:
+        progress(100)
+    return counts
@@ -0,0 +1,21 @@
+from apps.jobs.registry import job
+from .dashboard import refresh_dashboard_stats as refresh
+from .deletion import purge_project
+from .models import Project
+
+
+@job('projects.delete_project', priority=10)
+def delete_project(job, project_id):
+    """Soft-delete a project if needed, then purge it with its tasks and comments"""
+    project = Project.all_objects.filter(pk=project_id).first()
+    if project is None:
+        return {'comments': 0, 'tasks': 0, 'projects': 0}
+    if project.deleted_at is None:
+        project.soft_delete()
+    return purge_project(project_id, progress=job.set_progress)
+
+
+@job('projects.refresh_dashboard_stats')
+def refresh_dashboard_stats(job):
+    """Refresh the materialized dashboard stats views"""
+    return refresh()
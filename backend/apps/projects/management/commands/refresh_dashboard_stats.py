@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.projects.dashboard import refresh_dashboard_stats
+from apps.projects.jobs import refresh_dashboard_stats as refresh_job
+
+
+class Command(BaseCommand):
+    help = ('Refresh the materialized views behind the dashboard stats. '
+            'Run it from cron more often than DASHBOARD_STATS_MAX_AGE.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queue', action='store_true',
+                            help='Enqueue a background job instead of refreshing in this process')
+
+    def handle(self, *args, **options):
+        if options['queue']:
+            queued = refresh_job.enqueue()
+            self.stdout.write(self.style.SUCCESS(f'Queued job {queued.pk}'))
+            return
+
+        counts = refresh_dashboard_stats()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {counts['views']} views"))
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.23 on 2026-10-19 08:36
+
+import apps.projects.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='due_date',
+            field=models.DateField(blank=True, null=True, validators=[apps.projects.models.validate_due_date]),
+        ),
+    ]
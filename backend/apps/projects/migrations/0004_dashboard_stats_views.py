@@ -0,0 +1,79 @@
+from django.db import migrations
+
+
+# Task counts per live project, with the project's status so the
+# organization view can be built from this one alone
+PROJECT_VIEW = '''
+    CREATE MATERIALIZED VIEW project_task_stats AS
+    SELECT
+        p.id AS project_id,
+        p.organization_id,
+        p.status,
+        COUNT(t.id) AS total_tasks,
+        COUNT(t.id) FILTER (WHERE t.status = 'TODO') AS todo_tasks,
+        COUNT(t.id) FILTER (WHERE t.status = 'IN_PROGRESS') AS in_progress_tasks,
+        COUNT(t.id) FILTER (WHERE t.status = 'DONE') AS done_tasks,
+        COUNT(t.id) FILTER (WHERE t.status = 'BLOCKED') AS blocked_tasks,
+        COUNT(t.id) FILTER (WHERE t.is_overdue) AS overdue_tasks,
+        now() AS refreshed_at
+    FROM projects p
+    LEFT JOIN tasks t ON t.project_id = p.id
+    WHERE p.deleted_at IS NULL
+    GROUP BY p.id
+'''
+
+ORGANIZATION_VIEW = '''
+    CREATE MATERIALIZED VIEW organization_dashboard_stats AS
+    SELECT
+        organization_id,
+        COUNT(*) AS total_projects,
+        COUNT(*) FILTER (WHERE status = 'ACTIVE') AS active_projects,
+        COUNT(*) FILTER (WHERE status = 'COMPLETED') AS completed_projects,
+        COUNT(*) FILTER (WHERE status = 'ON_HOLD') AS on_hold_projects,
+        COUNT(*) FILTER (WHERE status = 'CANCELLED') AS cancelled_projects,
+        SUM(total_tasks)::bigint AS total_tasks,
+        SUM(todo_tasks)::bigint AS todo_tasks,
+        SUM(in_progress_tasks)::bigint AS in_progress_tasks,
+        SUM(done_tasks)::bigint AS done_tasks,
+        SUM(blocked_tasks)::bigint AS blocked_tasks,
+        SUM(overdue_tasks)::bigint AS overdue_tasks,
+        now() AS refreshed_at
+    FROM project_task_stats
+    GROUP BY organization_id
+'''
+
+
+def create_views(apps, schema_editor):
+    """
+    The views depend on the projects and tasks columns they read; a later
+    migration changing one of those must drop and recreate them.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # REFRESH ... CONCURRENTLY needs a unique index covering every row
+    schema_editor.execute(PROJECT_VIEW)
+    schema_editor.execute('CREATE UNIQUE INDEX project_task_stats_project ON project_task_stats (project_id)')
+    schema_editor.execute('CREATE INDEX project_task_stats_org ON project_task_stats (organization_id)')
+    schema_editor.execute(ORGANIZATION_VIEW)
+    schema_editor.execute(
+        'CREATE UNIQUE INDEX organization_dashboard_stats_org ON organization_dashboard_stats (organization_id)'
+    )
+
+
+def drop_views(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP MATERIALIZED VIEW IF EXISTS organization_dashboard_stats')
+    schema_editor.execute('DROP MATERIALIZED VIEW IF EXISTS project_task_stats')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_archived_at'),
+        ('tasks', '0005_overdue_flag'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_views, drop_views),
+    ]
@@ -2,6 +2,8 @@ from django.db import models
 from django.core.validators import MinLengthValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from apps.activity.tracking import TrackedChangesMixin
+from apps.organizations.models import Organization, SoftDeleteManager
 
 
 def validate_due_date(value):
@@ -10,7 +12,7 @@ def validate_due_date(value):
         raise ValidationError('Due date cannot be in the past.')
 
 
-class Project(models.Model):
+class Project(TrackedChangesMixin, models.Model):
     STATUS_CHOICES = [
         ('ACTIVE', 'Active'),
         ('COMPLETED', 'Completed'),
@@ -18,6 +20,9 @@ class Project(models.Model):
         ('CANCELLED', 'Cancelled'),
     ]
     
+    # Closed projects whose tasks may be moved to the archive
+    ARCHIVABLE_STATUSES = ['COMPLETED', 'CANCELLED']
+    
     organization = models.ForeignKey(
         'organizations.Organization', 
         on_delete=models.CASCADE,
@@ -40,6 +45,18 @@ class Project(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set when the project is removed; the rows are purged by a job
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Set while the project's tasks live in the archive tables
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
+    
+    # Whether the task counts below also include archived tasks
+    include_archived = False
+    
+    untracked_fields = ('created_at', 'updated_at', 'deleted_at', 'archived_at')
     
     class Meta:
         db_table = 'projects'
@@ -68,17 +85,35 @@ class Project(models.Model):
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
+        if self.archived_at and self.status not in self.ARCHIVABLE_STATUSES:
+            from apps.tasks.archive import restore_project
+            restore_project(self.pk)
+            self.archived_at = None
     
     def __str__(self):
         return f"{self.organization.name} - {self.name}"
     
+    def soft_delete(self):
+        """Hide the project and its tasks straight away"""
+        from apps.activity.events import record_event
+        self.deleted_at = timezone.now()
+        Project.all_objects.filter(pk=self.pk).update(deleted_at=self.deleted_at)
+        Organization.bump_data_version(pk=self.organization_id)
+        record_event(self, 'DELETED')
+    
     @property
     def task_count(self):
-        return self.tasks.count()
+        count = self.tasks.count()
+        if self.include_archived:
+            count += self.archived_tasks.count()
+        return count
     
     @property
     def completed_task_count(self):
-        return self.tasks.filter(status='DONE').count()
+        count = self.tasks.filter(status='DONE').count()
+        if self.include_archived:
+            count += self.archived_tasks.filter(status='DONE').count()
+        return count
     
     @property
     def completion_percentage(self):
@@ -1,17 +1,155 @@
-from django.contrib import admin
+import json
+
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.core.validators import validate_email
+from django.db import connections, transaction
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.html import format_html
-from .models import Task, TaskComment
+from apps.activity.events import record_deletions, record_task_updates
+from apps.organizations.models import Organization, subquery_count
+from .models import OPEN_STATUSES, Task, TaskComment, validate_assignee_email
+
+
+def estimate_count(queryset):
+    """
+    PostgreSQL's estimate of the rows in ``queryset``, or None when there is none.
+
+    Unfiltered tables use the ``pg_class`` statistics of their partitions;
+    filtered querysets use the planner's row estimate.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT SUM(reltuples) FILTER (WHERE reltuples >= 0) '
+                'FROM pg_partition_tree(%s::regclass) tree '
+                'JOIN pg_class ON pg_class.oid = tree.relid WHERE tree.isleaf',
+                [queryset.model._meta.db_table],
+            )
+            estimate = cursor.fetchone()[0]
+        else:
+            sql, params = queryset.order_by().values('pk').query.sql_with_params()
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]['Plan']['Plan Rows']
+    return int(estimate) if estimate is not None else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the row estimate once it reaches
+    ADMIN_ESTIMATED_COUNT_THRESHOLD, skipping the exact COUNT(*) that has to
+    read the whole table. Smaller result sets are still counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+            return estimate
+        return super().count
+
+
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """
+    Related filter picking its value with the admin's autocomplete widget
+    instead of listing every related row in the sidebar. The related model's
+    admin must define ``search_fields``.
+    """
+    template = 'tasks/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.model_admin = model_admin
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def field_choices(self, field, request, model_admin):
+        return []
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        field = forms.ModelChoiceField(
+            queryset=self.field.remote_field.model._default_manager.all(),
+            required=False,
+            widget=AutocompleteSelect(self.field, self.model_admin.admin_site),
+        )
+        yield {
+            'selected': self.lookup_val is None,
+            'query_string': changelist.get_query_string(remove=[self.lookup_kwarg, self.lookup_kwarg_isnull]),
+            'display': 'All',
+            'widget': field.widget.render(self.lookup_kwarg, self.lookup_val),
+        }
+
+
+class LimitedInlineFormSet(BaseInlineFormSet):
+    """Inline formset editing only the first ``limit`` related rows"""
+    limit = None
+
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            queryset = super().get_queryset()
+            if self.limit is not None:
+                queryset = queryset[:self.limit]
+            self._queryset = queryset
+        return self._queryset
+
+
+class LargeTableAdminMixin:
+    """
+    For tables too big to count or scan on every changelist: estimated
+    counts and no "show all" total. Pair it with AutocompleteFilter for
+    related filters and autocomplete_fields for foreign keys.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @property
+    def media(self):
+        return (
+            super().media
+            + AutocompleteSelect(Task._meta.get_field('project'), self.admin_site).media
+            + forms.Media(js=['tasks/autocomplete_filter.js'])
+        )
 
 
 class TaskCommentInline(admin.TabularInline):
     model = TaskComment
+    formset = LimitedInlineFormSet
     extra = 0
+    ordering = ['-created_at']
     readonly_fields = ['created_at']
     fields = ['author_email', 'content', 'created_at']
 
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.limit = settings.ADMIN_COMMENT_INLINE_LIMIT
+        return formset
+
+
+class TaskActionForm(ActionForm):
+    status = forms.ChoiceField(
+        choices=[('', '---------')] + Task.TASK_STATUS_CHOICES,
+        required=False
+    )
+    assignee_email = forms.CharField(required=False, label='Assignee email')
+
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = [
         'title',
         'project',
@@ -23,11 +161,24 @@ class TaskAdmin(admin.ModelAdmin):
         'is_overdue_display',
         'created_at'
     ]
-    list_filter = ['status', 'priority', 'project__organization', 'project', 'due_date', 'created_at']
+    list_filter = [
+        'status',
+        'priority',
+        ('project__organization', AutocompleteFilter),
+        ('project', AutocompleteFilter),
+        'overdue',
+        'due_date',
+        'created_at'
+    ]
     search_fields = ['title', 'description', 'assignee_email', 'project__name']
-    readonly_fields = ['comment_count', 'is_overdue', 'can_start', 'is_completed', 'created_at', 'updated_at']
-    date_hierarchy = 'created_at'
+    readonly_fields = [
+        'comment_count', 'all_comments', 'is_overdue', 'can_start', 'is_completed', 'created_at', 'updated_at'
+    ]
+    list_select_related = ['project__organization']
+    autocomplete_fields = ['project']
     inlines = [TaskCommentInline]
+    action_form = TaskActionForm
+    actions = ['change_status', 'reassign']
     
     fieldsets = (
         ('Basic Information', {
@@ -41,7 +192,7 @@ class TaskAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Statistics', {
-            'fields': ('comment_count',),
+            'fields': ('comment_count', 'all_comments'),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
@@ -50,6 +201,70 @@ class TaskAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _comment_count=subquery_count(TaskComment.objects.all(), 'task'),
+        )
+    
+    @admin.display(description='Comment count', ordering='_comment_count')
+    def comment_count(self, obj):
+        return obj._comment_count
+    
+    @admin.display(description='Comments')
+    def all_comments(self, obj):
+        url = reverse('admin:tasks_taskcomment_changelist')
+        return format_html('<a href="{}?task__id__exact={}">View all {} comments</a>', url, obj.pk, obj._comment_count)
+    
+    def bump_data_versions(self, queryset):
+        Organization.bump_data_version(projects__tasks__in=queryset.values('pk'))
+    
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            self.bump_data_versions(queryset)
+            record_deletions(queryset)
+            queryset.delete()
+    
+    @admin.action(description='Change status of selected tasks')
+    def change_status(self, request, queryset):
+        status = request.POST.get('status')
+        if status not in Task.STATUS_TRANSITIONS:
+            self.message_user(request, 'Choose a status to change the selected tasks to.', messages.ERROR)
+            return
+        
+        # Only tasks allowed to move to the new status are changed
+        sources = [source for source, targets in Task.STATUS_TRANSITIONS.items() if status in targets]
+        movable = queryset.filter(status__in=sources)
+        skipped = queryset.exclude(status=status).exclude(status__in=sources).count()
+        changes = {'status': status, 'updated_at': timezone.now()}
+        if status not in OPEN_STATUSES:
+            changes['overdue'] = False
+        with transaction.atomic():
+            self.bump_data_versions(movable)
+            record_task_updates(movable, status=status)
+            updated = movable.update(**changes)
+        
+        message = f'{updated} tasks changed to {dict(Task.TASK_STATUS_CHOICES)[status]}.'
+        if skipped > 0:
+            message += f' {skipped} tasks cannot move to that status and were left unchanged.'
+        self.message_user(request, message)
+    
+    @admin.action(description='Reassign selected tasks')
+    def reassign(self, request, queryset):
+        email = request.POST.get('assignee_email', '').strip()
+        if email:
+            try:
+                validate_email(email)
+                validate_assignee_email(email)
+            except ValidationError as e:
+                self.message_user(request, ' '.join(e.messages), messages.ERROR)
+                return
+        
+        with transaction.atomic():
+            self.bump_data_versions(queryset)
+            record_task_updates(queryset, assignee_email=email)
+            updated = queryset.update(assignee_email=email, updated_at=timezone.now())
+        self.message_user(request, f'{updated} tasks assigned to {email}.' if email else f'{updated} tasks unassigned.')
+    
     def status_badge(self, obj):
         colors = {
             'TODO': '#6c757d',
@@ -88,12 +303,17 @@ class TaskAdmin(admin.ModelAdmin):
 
 
 @admin.register(TaskComment)
-class TaskCommentAdmin(admin.ModelAdmin):
+class TaskCommentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ['task', 'author_email', 'content_preview', 'created_at']
-    list_filter = ['task__project__organization', 'task__project', 'created_at']
+    list_filter = [
+        ('task__project__organization', AutocompleteFilter),
+        ('task__project', AutocompleteFilter),
+        'created_at'
+    ]
     search_fields = ['content', 'author_email', 'task__title']
     readonly_fields = ['created_at', 'updated_at']
-    date_hierarchy = 'created_at'
+    list_select_related = ['task__project']
+    autocomplete_fields = ['task']
     
     fieldsets = (
         ('Comment Information', {
@@ -105,6 +325,12 @@ class TaskCommentAdmin(admin.ModelAdmin):
         }),
     )
     
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            Organization.bump_data_version(projects__tasks__comments__in=queryset.values('pk'))
+            record_deletions(queryset)
+            queryset.delete()
+    
     def content_preview(self, obj):
         return obj.content[:50] + '...' if len(obj.content) > 50 else obj.content
     content_preview.short_description = 'Content Preview'
\ No newline at end of file
@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def create_partitions(sender, using, **kwargs):
+    from .partitions import ensure_comment_partitions
+    ensure_comment_partitions(using=using)
 
 
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.tasks'
\ No newline at end of file
+    name = 'apps.tasks'
+
+    def ready(self):
+        # Keep future comment partitions in place after every deploy
+        post_migrate.connect(create_partitions, sender=self)
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.activity.events import record_archive_events
+from apps.organizations.models import Organization
+from apps.projects.models import Project
+from .models import ArchivedTask, ArchivedTaskComment, Task, TaskComment
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _columns(model, prefix=''):
+    return ', '.join(prefix + connection.ops.quote_name(field.column) for field in model._meta.concrete_fields)
+
+
+def _move(cursor, project_id, source_task, source_comment, target_task, target_comment,
+          extra_columns='', extra_values=()):
+    """Copy a project's tasks and comments into the target tables, then delete the source rows"""
+    tasks, comments = _table(source_task), _table(source_comment)
+    cursor.execute(
+        f'INSERT INTO {_table(target_task)} ({_columns(Task)}{extra_columns}) '
+        f'SELECT {_columns(Task)}{"".join(", %s" for _ in extra_values)} FROM {tasks} WHERE project_id = %s',
+        [*extra_values, project_id],
+    )
+    moved_tasks = cursor.rowcount
+    cursor.execute(
+        f'INSERT INTO {_table(target_comment)} ({_columns(TaskComment)}{extra_columns}) '
+        f'SELECT {_columns(TaskComment, "c.")}{"".join(", %s" for _ in extra_values)} '
+        f'FROM {comments} c JOIN {tasks} t ON t.id = c.task_id WHERE t.project_id = %s',
+        [*extra_values, project_id],
+    )
+    moved_comments = cursor.rowcount
+    cursor.execute(
+        f'DELETE FROM {comments} WHERE task_id IN (SELECT id FROM {tasks} WHERE project_id = %s)',
+        [project_id],
+    )
+    cursor.execute(f'DELETE FROM {tasks} WHERE project_id = %s', [project_id])
+    return {'tasks': moved_tasks, 'comments': moved_comments}
+
+
+def archive_project(project_id):
+    """Move a closed project's tasks and comments to the archive tables"""
+    now = timezone.now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        record_archive_events(project_id, now)
+        counts = _move(
+            cursor, project_id, Task, TaskComment, ArchivedTask, ArchivedTaskComment,
+            extra_columns=', archived_at', extra_values=(now,),
+        )
+        Project.all_objects.filter(pk=project_id).update(archived_at=now)
+        Organization.bump_data_version(projects=project_id)
+    return counts
+
+
+def restore_project(project_id):
+    """Move a project's archived tasks and comments back to the hot tables"""
+    with transaction.atomic(), connection.cursor() as cursor:
+        record_archive_events(project_id, None)
+        counts = _move(cursor, project_id, ArchivedTask, ArchivedTaskComment, Task, TaskComment)
+        Project.all_objects.filter(pk=project_id).update(archived_at=None)
+        Organization.bump_data_version(projects=project_id)
+    return counts
+
+
+def archive_closed_projects(older_than=None, progress=None):
+    """
+    Archive every completed or cancelled project not updated for
+    ``older_than`` (ARCHIVE_AFTER_DAYS by default). Each project is moved in
+    its own transaction.
+    """
+    if older_than is None:
+        older_than = timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    project_ids = list(Project.objects.filter(
+        status__in=Project.ARCHIVABLE_STATUSES,
+        archived_at__isnull=True,
+        updated_at__lt=timezone.now() - older_than,
+    ).values_list('id', flat=True))
+
+    counts = {'projects': 0, 'tasks': 0, 'comments': 0}
+    for index, project_id in enumerate(project_ids, 1):
+        for key, value in archive_project(project_id).items():
+            counts[key] += value
+        counts['projects'] += 1
+        if progress is not None:
+            progress(100 * index / len(project_ids))
+    return counts
@@ -0,0 +1,76 @@
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField, Case, F, Q, Value, When
+from django.utils import timezone
+
+from apps.activity.events import record_task_updates
+from apps.organizations.models import Organization
+from .models import OPEN_STATUSES, Task
+
+
+def escalation_expressions(now):
+    """
+    SQL expressions for the priority Task.auto_assign_priority would give
+    each open task with a due date, and for its overdue flag, at ``now``.
+    Other tasks keep their priority and lose the flag.
+    """
+    today = datetime.combine(now.astimezone(dt_timezone.utc).date(), time.min, tzinfo=dt_timezone.utc)
+    scheduled = Q(status__in=OPEN_STATUSES, due_date__isnull=False)
+    priority = Case(
+        *[
+            When(scheduled & Q(due_date__lt=today + timedelta(days=days + 1)), then=Value(value))
+            for days, value in Task.PRIORITY_DUE_DAYS
+        ],
+        When(scheduled, then=Value('LOW')),
+        default=F('priority'),
+    )
+    overdue = Case(
+        When(scheduled & Q(due_date__lt=now), then=Value(True)),
+        default=Value(False),
+        output_field=BooleanField(),
+    )
+    return priority, overdue
+
+
+def escalate_tasks(batch_size=None, progress=None, now=None):
+    """
+    Recompute the priority and overdue flag of every open task with a due
+    date, across all organizations, and clear stale flags.
+
+    Tasks are walked in id order, ``batch_size`` (ESCALATION_BATCH_SIZE by
+    default) at a time; each batch is a single UPDATE touching only rows
+    whose values change. Priority changes are recorded as activity events.
+    Returns ``{'examined', 'updated'}``.
+    """
+    if batch_size is None:
+        batch_size = settings.ESCALATION_BATCH_SIZE
+    if now is None:
+        now = timezone.now()
+    priority, overdue = escalation_expressions(now)
+
+    candidates = Task.objects.filter(
+        Q(status__in=OPEN_STATUSES, due_date__isnull=False) | Q(overdue=True)
+    ).order_by('id')
+    total = candidates.count() if progress is not None else None
+
+    counts = {'examined': 0, 'updated': 0}
+    last_id = 0
+    while True:
+        ids = list(candidates.filter(id__gt=last_id).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        last_id = ids[-1]
+
+        changed = Task.objects.filter(id__in=ids).alias(
+            new_priority=priority, new_overdue=overdue
+        ).exclude(priority=F('new_priority'), overdue=F('new_overdue'))
+        with transaction.atomic():
+            Organization.bump_data_version(projects__tasks__in=changed.values('pk'))
+            record_task_updates(changed, priority=priority)
+            counts['updated'] += changed.update(priority=priority, overdue=overdue, updated_at=now)
+        counts['examined'] += len(ids)
+        if progress is not None and total:
+            progress(100 * counts['examined'] / total)
+    return counts
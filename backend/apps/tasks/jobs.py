@@ -0,0 +1,22 @@
+from apps.jobs.registry import job
+from .archive import archive_closed_projects as archive
+from .escalation import escalate_tasks
+from .partitions import ensure_comment_partitions
+
+
+@job('tasks.archive_closed_projects')
+def archive_closed_projects(job):
+    """Move the tasks of long-closed projects to the archive tables"""
+    return archive(progress=job.set_progress)
+
+
+@job('tasks.create_partitions')
+def create_partitions(job):
+    """Create the upcoming monthly task_comments partitions"""
+    return {'created': ensure_comment_partitions()}
+
+
+@job('tasks.escalate_overdue_tasks')
+def escalate_overdue_tasks(job):
+    """Recompute priorities and overdue flags of all open tasks"""
+    return escalate_tasks(progress=job.set_progress)
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.archive import archive_closed_projects
+from apps.tasks.jobs import archive_closed_projects as archive_job
+
+
+class Command(BaseCommand):
+    help = 'Move tasks and comments of long-closed projects to the archive tables. Run it from cron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                            help='Archive projects closed and untouched for this many days')
+        parser.add_argument('--queue', action='store_true',
+                            help='Enqueue a background job instead of archiving in this process')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError('--days cannot be negative')
+
+        if options['queue']:
+            queued = archive_job.enqueue()
+            self.stdout.write(self.style.SUCCESS(f'Queued job {queued.pk}'))
+            return
+
+        counts = archive_closed_projects(older_than=timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {counts['projects']} projects ({counts['tasks']} tasks, {counts['comments']} comments)"
+        ))
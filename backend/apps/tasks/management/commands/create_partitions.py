@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.partitions import ensure_comment_partitions
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly partitions of task_comments. Run it from cron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=settings.TASK_COMMENT_PARTITION_MONTHS_AHEAD,
+                            help='Create partitions up to this many months from now')
+        parser.add_argument('--database', default='default',
+                            help='Database alias to create partitions in')
+
+    def handle(self, *args, **options):
+        if options['months_ahead'] < 0:
+            raise CommandError('--months-ahead cannot be negative')
+
+        created = ensure_comment_partitions(options['months_ahead'], using=options['database'])
+        for name in created:
+            self.stdout.write(f'Created {name}')
+        self.stdout.write(self.style.SUCCESS(f'Created {len(created)} partitions'))
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.escalation import escalate_tasks
+from apps.tasks.jobs import escalate_overdue_tasks
+
+
+class Command(BaseCommand):
+    help = ('Recompute the priority and overdue flag of every open task from its due date. '
+            'Run it from cron, at least daily.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.ESCALATION_BATCH_SIZE,
+                            help='Tasks updated per statement')
+        parser.add_argument('--queue', action='store_true',
+                            help='Enqueue a background job instead of updating in this process')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        if options['queue']:
+            queued = escalate_overdue_tasks.enqueue()
+            self.stdout.write(self.style.SUCCESS(f'Queued job {queued.pk}'))
+            return
+
+        counts = escalate_tasks(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Examined {counts['examined']} open tasks, updated {counts['updated']}"
+        ))
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.23 on 2026-10-19 08:40
+
+import apps.tasks.models
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_archived_at'),
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('TODO', 'To Do'), ('IN_PROGRESS', 'In Progress'), ('DONE', 'Done'), ('BLOCKED', 'Blocked')], max_length=20)),
+                ('priority', models.CharField(choices=[('LOW', 'Low'), ('MEDIUM', 'Medium'), ('HIGH', 'High'), ('URGENT', 'Urgent')], max_length=10)),
+                ('assignee_email', models.EmailField(blank=True, max_length=254)),
+                ('due_date', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to='projects.project')),
+            ],
+            options={
+                'db_table': 'tasks_archive',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='assignee_email',
+            field=models.EmailField(blank=True, max_length=254, validators=[django.core.validators.EmailValidator(), apps.tasks.models.validate_assignee_email]),
+        ),
+        migrations.AlterField(
+            model_name='taskcomment',
+            name='author_email',
+            field=models.EmailField(max_length=254, validators=[django.core.validators.EmailValidator(), apps.tasks.models.validate_assignee_email]),
+        ),
+        migrations.CreateModel(
+            name='ArchivedTaskComment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField()),
+                ('author_email', models.EmailField(max_length=254)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='tasks.archivedtask')),
+            ],
+            options={
+                'db_table': 'task_comments_archive',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['task', 'created_at'], name='task_commen_task_id_4effa7_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['project', 'status'], name='tasks_archi_project_a82bb5_idx'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2.23 on 2026-10-19 08:42
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+
+from apps.tasks.partitions import (
+    COMMENTS_DEFAULT_PARTITION,
+    TASK_PARTITIONS,
+    add_months,
+    create_comment_partition,
+    month_start,
+    partition_table,
+    unpartition_table,
+)
+
+
+def create_task_partitions(schema_editor, old_table):
+    qn = schema_editor.quote_name
+    for remainder in range(TASK_PARTITIONS):
+        schema_editor.execute(
+            f'CREATE TABLE {qn(f"tasks_p{remainder}")} PARTITION OF {qn("tasks")} '
+            f'FOR VALUES WITH (MODULUS {TASK_PARTITIONS}, REMAINDER {remainder})'
+        )
+
+
+def create_comment_partitions(schema_editor, old_table):
+    qn = schema_editor.quote_name
+    schema_editor.execute(
+        f'CREATE TABLE {qn(COMMENTS_DEFAULT_PARTITION)} PARTITION OF {qn("task_comments")} DEFAULT'
+    )
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN(created_at) FROM {qn(old_table)}')
+        earliest = cursor.fetchone()[0]
+
+    now = month_start(timezone.now())
+    month = month_start(earliest) if earliest else now
+    last = add_months(now, settings.TASK_COMMENT_PARTITION_MONTHS_AHEAD)
+    while month <= last:
+        create_comment_partition(schema_editor.connection, month)
+        month = add_months(month, 1)
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    partition_table(
+        schema_editor, apps.get_model('tasks', 'Task'),
+        'HASH (project_id)', ['project_id'], create_task_partitions,
+    )
+    partition_table(
+        schema_editor, apps.get_model('tasks', 'TaskComment'),
+        'RANGE (created_at)', ['created_at'], create_comment_partitions,
+    )
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    unpartition_table(schema_editor, apps.get_model('tasks', 'TaskComment'))
+    unpartition_table(schema_editor, apps.get_model('tasks', 'Task'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_archive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='taskcomment',
+            name='task',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='tasks.task'),
+        ),
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.23 on 2026-10-19 08:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_archived_at'),
+        ('tasks', '0003_partitioning'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_due_dat_0359a9_idx',
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='project',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='projects.project'),
+        ),
+        migrations.AlterField(
+            model_name='taskcomment',
+            name='task',
+            field=models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='tasks.task'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', '-created_at'], include=('id', 'status', 'priority', 'due_date'), name='tasks_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'DONE'), _negated=True), fields=['project'], name='tasks_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), ('status__in', ['TODO', 'IN_PROGRESS', 'BLOCKED'])), fields=['project', 'due_date'], name='tasks_overdue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False)), fields=['due_date'], name='tasks_due_date_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.23 on 2026-10-19 09:00
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def flag_overdue_tasks(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.filter(
+        status__in=['TODO', 'IN_PROGRESS', 'BLOCKED'], due_date__lt=timezone.now()
+    ).update(overdue=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_resolver_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_overdue_idx',
+        ),
+        migrations.AddField(
+            model_name='archivedtask',
+            name='overdue',
+            field=models.BooleanField(db_column='is_overdue', default=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='overdue',
+            field=models.BooleanField(db_column='is_overdue', default=False, editable=False),
+        ),
+        migrations.RunPython(flag_overdue_tasks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('overdue', True)), fields=['project'], name='tasks_overdue_idx'),
+        ),
+    ]
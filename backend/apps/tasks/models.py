@@ -1,7 +1,10 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.core.validators import EmailValidator, MinLengthValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from apps.activity.tracking import TrackedChangesMixin
+from apps.organizations.models import Organization
 
 
 def validate_assignee_email(value):
@@ -14,7 +17,23 @@ def validate_assignee_email(value):
             raise ValidationError(f'Email domain "{domain}" is not allowed.')
 
 
-class Task(models.Model):
+# Statuses counted as open (not yet done) when flagging overdue tasks
+OPEN_STATUSES = ['TODO', 'IN_PROGRESS', 'BLOCKED']
+
+
+class TaskQuerySet(models.QuerySet):
+    def visible(self):
+        """Tasks whose project has not been deleted"""
+        return self.filter(project__deleted_at__isnull=True)
+
+
+class TaskCommentQuerySet(models.QuerySet):
+    def visible(self):
+        """Comments whose task's project has not been deleted"""
+        return self.filter(task__project__deleted_at__isnull=True)
+
+
+class Task(TrackedChangesMixin, models.Model):
     TASK_STATUS_CHOICES = [
         ('TODO', 'To Do'),
         ('IN_PROGRESS', 'In Progress'),
@@ -29,10 +48,31 @@ class Task(models.Model):
         ('URGENT', 'Urgent'),
     ]
     
+    # Numeric weights for sorting by priority
+    PRIORITY_WEIGHTS = {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3, 'URGENT': 4}
+    
+    # Priority given by auto_assign_priority to tasks due within this many
+    # days (negative: overdue); tasks due later are LOW
+    PRIORITY_DUE_DAYS = [
+        (-1, 'URGENT'),
+        (1, 'HIGH'),
+        (3, 'MEDIUM'),
+    ]
+    
+    # Statuses each status may move to
+    STATUS_TRANSITIONS = {
+        'TODO': ['IN_PROGRESS', 'BLOCKED'],
+        'IN_PROGRESS': ['DONE', 'BLOCKED', 'TODO'],
+        'BLOCKED': ['TODO'],
+        'DONE': []  # Completed tasks cannot be changed
+    }
+    
+    # Indexed by the composite indexes below, which all lead with project
     project = models.ForeignKey(
         'projects.Project',
         on_delete=models.CASCADE,
-        related_name='tasks'
+        related_name='tasks',
+        db_index=False
     )
     title = models.CharField(
         max_length=200,
@@ -54,16 +94,50 @@ class Task(models.Model):
         validators=[EmailValidator(), validate_assignee_email]
     )
     due_date = models.DateTimeField(null=True, blank=True)
+    # is_overdue as of the last save or escalate_tasks run, for indexed
+    # overdue filters and counts
+    overdue = models.BooleanField(default=False, editable=False, db_column='is_overdue')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TaskQuerySet.as_manager()
+    
+    # True for tasks rebuilt from the archive by ArchivedTask.as_task()
+    is_archived = False
+    
+    untracked_fields = ('created_at', 'updated_at', 'overdue')
+    
     class Meta:
         db_table = 'tasks'
         ordering = ['-created_at']
         indexes = [
+            # A project's tasks newest first. The task list and board find their
+            # rows through it but read more columns than it includes
+            models.Index(
+                fields=['project', '-created_at'],
+                include=['id', 'status', 'priority', 'due_date'],
+                name='tasks_project_created_idx'
+            ),
+            # Status counts per project
             models.Index(fields=['project', 'status']),
+            # Unfinished tasks of a project (Project.can_be_completed)
+            models.Index(
+                fields=['project'],
+                condition=~Q(status='DONE'),
+                name='tasks_open_idx'
+            ),
+            # Overdue counts (get_task_stats)
+            models.Index(
+                fields=['project'],
+                condition=Q(overdue=True),
+                name='tasks_overdue_idx'
+            ),
+            models.Index(
+                fields=['due_date'],
+                condition=Q(due_date__isnull=False),
+                name='tasks_due_date_idx'
+            ),
             models.Index(fields=['assignee_email']),
-            models.Index(fields=['due_date']),
             models.Index(fields=['priority', 'status']),
         ]
     
@@ -96,13 +170,29 @@ class Task(models.Model):
     
     def save(self, *args, **kwargs):
         self.full_clean()
+        self.overdue = self.is_overdue
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'overdue'}
         super().save(*args, **kwargs)
     
+    def delete(self, *args, **kwargs):
+        from apps.activity.events import record_deletions, record_event
+        project_id = self.project_id
+        with transaction.atomic():
+            record_event(self, 'DELETED')
+            # The comments go with the task without their delete() being called
+            record_deletions(self.comments.all())
+            result = super().delete(*args, **kwargs)
+        Organization.bump_data_version(projects=project_id)
+        return result
+    
     def __str__(self):
         return f"{self.project.name} - {self.title}"
     
     @property
     def comment_count(self):
+        if self.is_archived:
+            return ArchivedTaskComment.objects.filter(task_id=self.pk).count()
         return self.comments.count()
     
     @property
@@ -121,18 +211,11 @@ class Task(models.Model):
     
     def can_change_status_to(self, new_status):
         """Check if task status can be changed to the given status"""
-        valid_transitions = {
-            'TODO': ['IN_PROGRESS', 'BLOCKED'],
-            'IN_PROGRESS': ['DONE', 'BLOCKED', 'TODO'],
-            'BLOCKED': ['TODO'],
-            'DONE': []  # Completed tasks cannot be changed
-        }
-        return new_status in valid_transitions.get(self.status, [])
+        return new_status in self.STATUS_TRANSITIONS.get(self.status, [])
     
     def get_priority_weight(self):
         """Return numeric weight for priority sorting"""
-        weights = {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3, 'URGENT': 4}
-        return weights.get(self.priority, 2)
+        return self.PRIORITY_WEIGHTS.get(self.priority, 2)
     
     def auto_assign_priority(self):
         """Auto-assign priority based on due date"""
@@ -141,21 +224,22 @@ class Task(models.Model):
         
         days_until_due = (self.due_date.date() - timezone.now().date()).days
         
-        if days_until_due < 0:  # Overdue
-            self.priority = 'URGENT'
-        elif days_until_due <= 1:  # Due within 1 day
-            self.priority = 'HIGH'
-        elif days_until_due <= 3:  # Due within 3 days
-            self.priority = 'MEDIUM'
-        else:
-            self.priority = 'LOW'
+        for days, priority in self.PRIORITY_DUE_DAYS:
+            if days_until_due <= days:
+                self.priority = priority
+                return
+        self.priority = 'LOW'
 
 
-class TaskComment(models.Model):
+class TaskComment(TrackedChangesMixin, models.Model):
+    # No database constraint: a partitioned tasks table cannot be referenced.
+    # Indexed by (task, created_at) below.
     task = models.ForeignKey(
         Task,
         on_delete=models.CASCADE,
-        related_name='comments'
+        related_name='comments',
+        db_constraint=False,
+        db_index=False
     )
     content = models.TextField(validators=[MinLengthValidator(1)])
     author_email = models.EmailField(
@@ -164,6 +248,8 @@ class TaskComment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TaskCommentQuerySet.as_manager()
+    
     class Meta:
         db_table = 'task_comments'
         ordering = ['created_at']
@@ -184,5 +270,93 @@ class TaskComment(models.Model):
         self.full_clean()
         super().save(*args, **kwargs)
     
+    def delete(self, *args, **kwargs):
+        from apps.activity.events import record_event
+        task_id = self.task_id
+        with transaction.atomic():
+            record_event(self, 'DELETED')
+            result = super().delete(*args, **kwargs)
+        Organization.bump_data_version(projects__tasks=task_id)
+        return result
+    
     def __str__(self):
-        return f"Comment on {self.task.title} by {self.author_email}"
\ No newline at end of file
+        return f"Comment on {self.task.title} by {self.author_email}"
+
+
+class ArchivedTask(models.Model):
+    """
+    A task of a closed project moved out of the hot ``tasks`` table.
+
+    Columns mirror Task, keeping ids, so rows can be copied back unchanged
+    when the project is reactivated.
+    """
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='archived_tasks'
+    )
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=Task.TASK_STATUS_CHOICES)
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES)
+    assignee_email = models.EmailField(blank=True)
+    due_date = models.DateTimeField(null=True, blank=True)
+    overdue = models.BooleanField(default=False, db_column='is_overdue')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+    
+    objects = TaskQuerySet.as_manager()
+    
+    class Meta:
+        db_table = 'tasks_archive'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} (archived)"
+    
+    def as_task(self):
+        """An unsaved-looking Task with this row's values, for read-only use"""
+        task = Task(**{field.attname: getattr(self, field.attname) for field in Task._meta.concrete_fields})
+        task._state.adding = False
+        task._state.db = self._state.db
+        task.is_archived = True
+        if ArchivedTask.project.is_cached(self):
+            task.project = self.project
+        return task
+
+
+class ArchivedTaskComment(models.Model):
+    """A comment of an archived task, mirroring TaskComment"""
+    task = models.ForeignKey(
+        ArchivedTask,
+        on_delete=models.CASCADE,
+        related_name='comments'
+    )
+    content = models.TextField()
+    author_email = models.EmailField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'task_comments_archive'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['task', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Archived comment on {self.task.title} by {self.author_email}"
+    
+    def as_comment(self):
+        """An unsaved-looking TaskComment with this row's values, for read-only use"""
+        comment = TaskComment(**{
+            field.attname: getattr(self, field.attname) for field in TaskComment._meta.concrete_fields
+        })
+        comment._state.adding = False
+        comment._state.db = self._state.db
+        return comment
@@ -0,0 +1,151 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+
+# Hash partitions of ``tasks`` by project. Fixed once the table is converted.
+TASK_PARTITIONS = 8
+
+COMMENTS_TABLE = 'task_comments'
+COMMENTS_DEFAULT_PARTITION = 'task_comments_default'
+
+# Tables converted by tasks.0003_partitioning
+PARTITIONED_TABLES = {'tasks', COMMENTS_TABLE}
+
+
+def month_start(value):
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value, months):
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def comment_partition_name(start):
+    return f'{COMMENTS_TABLE}_y{start:%Y}m{start:%m}'
+
+
+def is_partitioned(connection, table):
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [table])
+        return cursor.fetchone() is not None
+
+
+def create_comment_partition(connection, start):
+    """
+    Create the month partition of ``task_comments`` beginning at ``start``.
+
+    Rows already in that range sit in the default partition; they are moved
+    into the new table before it is attached. Returns False when the
+    partition exists already.
+    """
+    name = comment_partition_name(start)
+    qn = connection.ops.quote_name
+    lower, upper = start.isoformat(), add_months(start, 1).isoformat()
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [name])
+        if cursor.fetchone()[0] is not None:
+            return False
+        cursor.execute(f'CREATE TABLE {qn(name)} (LIKE {qn(COMMENTS_TABLE)} INCLUDING DEFAULTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {qn(COMMENTS_DEFAULT_PARTITION)} '
+            f'WHERE created_at >= %s AND created_at < %s RETURNING *) '
+            f'INSERT INTO {qn(name)} SELECT * FROM moved',
+            [lower, upper],
+        )
+        cursor.execute(
+            f"ALTER TABLE {qn(COMMENTS_TABLE)} ATTACH PARTITION {qn(name)} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+    return True
+
+
+def ensure_comment_partitions(months_ahead=None, using='default'):
+    """
+    Make sure month partitions of ``task_comments`` exist from the current
+    month to ``months_ahead`` months from now. Does nothing unless the table
+    is partitioned. Returns the names of the partitions created.
+    """
+    connection = connections[using]
+    if not is_partitioned(connection, COMMENTS_TABLE):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.TASK_COMMENT_PARTITION_MONTHS_AHEAD
+
+    start = month_start(timezone.now())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(start, offset)
+        if create_comment_partition(connection, month):
+            created.append(comment_partition_name(month))
+    return created
+
+
+def _restore_constraints(schema_editor, model):
+    """Recreate the foreign keys and indexes Django keeps on ``model``'s table"""
+    for field in model._meta.local_fields:
+        if field.remote_field and field.db_constraint:
+            schema_editor.execute(schema_editor._create_fk_sql(model, field, '_fk_%(to_table)s_%(to_column)s'))
+    for sql in schema_editor._model_indexes_sql(model):
+        schema_editor.execute(sql)
+
+
+def partition_table(schema_editor, model, partition_by, key_columns, create_partitions):
+    """
+    Rebuild ``model``'s table as a partitioned table, copying its rows.
+
+    Postgres requires the partition key in the primary key, so the key
+    becomes ``(id, *key_columns)``, and ids come from a sequence because
+    partitioned tables cannot have identity columns before Postgres 17. No
+    foreign key may reference the table afterwards. ``create_partitions`` is
+    called with the schema editor and the old table name before rows are copied.
+    """
+    qn = schema_editor.quote_name
+    table = model._meta.db_table
+    old = f'{table}_unpartitioned'
+    pk = model._meta.pk.column
+    sequence = f'{table}_{pk}_seq'
+
+    schema_editor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old)}')
+    schema_editor.execute(
+        f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS) PARTITION BY {partition_by}'
+    )
+    create_partitions(schema_editor, old)
+    schema_editor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(old)}')
+    schema_editor.execute(f'DROP TABLE {qn(old)} CASCADE')
+
+    schema_editor.execute(f'CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.{qn(pk)}')
+    schema_editor.execute(
+        f'SELECT setval(%s, COALESCE(MAX({qn(pk)}), 0) + 1, false) FROM {qn(table)}', [sequence]
+    )
+    schema_editor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN {qn(pk)} SET DEFAULT nextval('{sequence}')")
+    columns = ', '.join(qn(column) for column in (pk, *key_columns))
+    schema_editor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + "_pkey")} PRIMARY KEY ({columns})')
+    _restore_constraints(schema_editor, model)
+
+
+def unpartition_table(schema_editor, model):
+    """Reverse :func:`partition_table`, back to a plain table with an identity id"""
+    qn = schema_editor.quote_name
+    table = model._meta.db_table
+    old = f'{table}_partitioned'
+    pk = model._meta.pk.column
+
+    schema_editor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old)}')
+    schema_editor.execute(f'CREATE TABLE {qn(table)} (LIKE {qn(old)})')
+    schema_editor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(old)}')
+    schema_editor.execute(f'DROP TABLE {qn(old)} CASCADE')
+
+    schema_editor.execute(f'ALTER TABLE {qn(table)} ALTER COLUMN {qn(pk)} ADD GENERATED BY DEFAULT AS IDENTITY')
+    schema_editor.execute(
+        f'SELECT setval(pg_get_serial_sequence(%s, %s), COALESCE(MAX({qn(pk)}), 0) + 1, false) FROM {qn(table)}',
+        [table, pk],
+    )
+    schema_editor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + "_pkey")} PRIMARY KEY ({qn(pk)})')
+    _restore_constraints(schema_editor, model)
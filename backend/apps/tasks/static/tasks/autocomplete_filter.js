@@ -0,0 +1,16 @@
+'use strict';
+{
+    const $ = django.jQuery;
+
+    // Reload the changelist with the value picked in an autocomplete filter
+    $(function() {
+        $('.autocomplete-filter select').on('change', function() {
+            const container = this.closest('.autocomplete-filter');
+            const params = new URLSearchParams(container.dataset.queryString);
+            if (this.value) {
+                params.set(this.name, this.value);
+            }
+            window.location.search = params.toString();
+        });
+    });
+}
@@ -0,0 +1,6 @@
+"""
+Benchmark suite for the GraphQL API.
+
+Seed a reproducible dataset with ``python manage.py seed_benchmark_data``
+and measure the hot operations with ``python manage.py run_benchmarks``.
+"""
@@ -0,0 +1,158 @@
+import random
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import DateTimeField, DurationField, ExpressionWrapper, F, Value
+from django.utils import timezone
+
+from apps.organizations.models import Organization
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskComment
+
+
+# (organizations, projects per organization, tasks per project, comments per task)
+SCALES = {
+    'tiny': (2, 2, 10, 1),
+    'small': (10, 10, 100, 2),
+    'medium': (10, 50, 200, 2),
+    'large': (10, 100, 1000, 2),
+}
+
+BENCHMARK_SLUG_PREFIX = 'bench-org-'
+
+WORDS = [
+    'api', 'backend', 'billing', 'cache', 'checkout', 'dashboard', 'deploy',
+    'design', 'docs', 'export', 'frontend', 'import', 'invoice', 'login',
+    'migration', 'mobile', 'onboarding', 'payments', 'report', 'search',
+    'security', 'settings', 'signup', 'sync', 'upload', 'webhook',
+]
+
+TASK_STATUS_WEIGHTS = [('TODO', 35), ('IN_PROGRESS', 25), ('DONE', 30), ('BLOCKED', 10)]
+PROJECT_STATUS_WEIGHTS = [('ACTIVE', 60), ('COMPLETED', 20), ('ON_HOLD', 10), ('CANCELLED', 10)]
+PRIORITIES = ['LOW', 'MEDIUM', 'HIGH', 'URGENT']
+
+
+def get_scale(name, **overrides):
+    """Return the dataset dimensions for a named scale, with optional overrides"""
+    organizations, projects, tasks, comments = SCALES[name]
+    scale = {
+        'organizations': organizations,
+        'projects_per_organization': projects,
+        'tasks_per_project': tasks,
+        'comments_per_task': comments,
+    }
+    scale.update({key: value for key, value in overrides.items() if value is not None})
+    return scale
+
+
+def _weighted_choice(rng, weighted):
+    choices, weights = zip(*weighted)
+    return rng.choices(choices, weights=weights)[0]
+
+
+def _sentence(rng, length):
+    return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+
+def clear_dataset():
+    """Delete every organization created by the benchmark seeder"""
+    organization_ids = Organization.all_objects.filter(
+        slug__startswith=BENCHMARK_SLUG_PREFIX
+    ).values_list('id', flat=True)
+    TaskComment.objects.filter(task__project__organization_id__in=organization_ids)._raw_delete('default')
+    Task.objects.filter(project__organization_id__in=organization_ids)._raw_delete('default')
+    Project.all_objects.filter(organization_id__in=organization_ids)._raw_delete('default')
+    Organization.all_objects.filter(id__in=organization_ids)._raw_delete('default')
+
+
+def seed_dataset(scale, seed=42, batch_size=5000, log=None):
+    """
+    Build benchmark tenants with bulk_create.
+
+    The same scale and seed always produce the same rows (relative to the time
+    of seeding), so timings taken on different commits run against identical data.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    users = [f'user{index:03d}@bench.example.com' for index in range(50)]
+    totals = {'organizations': 0, 'projects': 0, 'tasks': 0, 'comments': 0}
+
+    organizations = Organization.objects.bulk_create([
+        Organization(
+            name=f'Benchmark Org {index:03d}',
+            slug=f'{BENCHMARK_SLUG_PREFIX}{index:03d}',
+            contact_email=f'owner{index:03d}@bench.example.com',
+        )
+        for index in range(scale['organizations'])
+    ])
+    totals['organizations'] = len(organizations)
+
+    for organization in organizations:
+        projects = Project.objects.bulk_create([
+            Project(
+                organization=organization,
+                name=f'{rng.choice(WORDS).title()} {index:04d}',
+                description=_sentence(rng, 12),
+                status=_weighted_choice(rng, PROJECT_STATUS_WEIGHTS),
+                due_date=(now + timedelta(days=rng.randint(-30, 180))).date(),
+            )
+            for index in range(scale['projects_per_organization'])
+        ])
+        totals['projects'] += len(projects)
+
+        for project in projects:
+            with transaction.atomic():
+                tasks = Task.objects.bulk_create([
+                    Task(
+                        project=project,
+                        title=f'{_sentence(rng, 3).capitalize()} {index}',
+                        description=_sentence(rng, 20),
+                        status=_weighted_choice(rng, TASK_STATUS_WEIGHTS),
+                        priority=rng.choice(PRIORITIES),
+                        assignee_email=rng.choice(users) if rng.random() < 0.8 else '',
+                        due_date=(
+                            now + timedelta(hours=rng.randint(-24 * 30, 24 * 90))
+                            if rng.random() < 0.7 else None
+                        ),
+                    )
+                    for index in range(scale['tasks_per_project'])
+                ], batch_size=batch_size)
+
+                comments = [
+                    TaskComment(
+                        task=task,
+                        content=_sentence(rng, 15),
+                        author_email=rng.choice(users),
+                    )
+                    for task in tasks
+                    for _ in range(rng.randint(0, 2 * scale['comments_per_task']))
+                ]
+                TaskComment.objects.bulk_create(comments, batch_size=batch_size)
+
+            totals['tasks'] += len(tasks)
+            totals['comments'] += len(comments)
+
+        if log:
+            log(f'{organization.slug}: {totals["tasks"]} tasks, {totals["comments"]} comments so far')
+
+    _spread_timestamps(organizations)
+    return totals
+
+
+def _spread_timestamps(organizations):
+    """
+    Spread created_at over the past year.
+
+    bulk_create always stamps auto_now_add fields with the current time, so the
+    spread is derived from primary keys to stay deterministic.
+    """
+    offset = ExpressionWrapper(
+        Value(timedelta(minutes=1)) * (F('id') * 7919 % (365 * 24 * 60)),
+        output_field=DurationField(),
+    )
+    Task.objects.filter(project__organization__in=organizations).update(
+        created_at=ExpressionWrapper(F('created_at') - offset, output_field=DateTimeField())
+    )
+    TaskComment.objects.filter(task__project__organization__in=organizations).update(
+        created_at=ExpressionWrapper(F('created_at') - offset, output_field=DateTimeField())
+    )
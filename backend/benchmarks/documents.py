@@ -0,0 +1,55 @@
+import re
+from pathlib import Path
+
+from django.conf import settings
+from graphql import OperationDefinitionNode, parse, validate
+
+from graphql_api.schema import schema
+
+
+FRONTEND_GRAPHQL_DIR = Path(settings.BASE_DIR).parent / 'frontend' / 'src' / 'graphql'
+FRONTEND_DOCUMENT_FILES = ['queries.ts', 'mutations.ts']
+
+GQL_TEMPLATE = re.compile(r'export\s+const\s+(\w+)\s*=\s*gql`(.*?)`', re.DOTALL)
+
+
+class FrontendDocument:
+    """A GraphQL document lifted from a ``gql`` template literal in the frontend"""
+
+    def __init__(self, constant, source, path):
+        self.constant = constant
+        self.source = source
+        self.path = path
+
+        self.document = parse(source)
+        operation = next(
+            definition for definition in self.document.definitions
+            if isinstance(definition, OperationDefinitionNode)
+        )
+        self.operation_name = operation.name.value if operation.name else constant
+        self.operation_type = operation.operation.value
+        self.variables = [
+            definition.variable.name.value for definition in operation.variable_definitions
+        ]
+        self.errors = [error.message for error in validate(schema.graphql_schema, self.document)]
+
+    @property
+    def is_mutation(self):
+        return self.operation_type == 'mutation'
+
+    @property
+    def is_valid(self):
+        return not self.errors
+
+    def __repr__(self):
+        return f'<FrontendDocument {self.operation_name}>'
+
+
+def extract_documents(directory=FRONTEND_GRAPHQL_DIR, filenames=FRONTEND_DOCUMENT_FILES):
+    """Return every gql document declared in the frontend's query and mutation modules"""
+    documents = []
+    for filename in filenames:
+        path = Path(directory) / filename
+        for constant, source in GQL_TEMPLATE.findall(path.read_text()):
+            documents.append(FrontendDocument(constant, source, path))
+    return documents
@@ -0,0 +1,325 @@
+import json
+import re
+from pathlib import Path
+
+from django.apps import apps
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection, models, transaction
+from django.db.migrations.writer import MigrationWriter
+from django.test import RequestFactory
+from graphene_django.settings import graphene_settings
+from graphene_django.views import instantiate_middleware
+
+from graphql_api.schema import schema
+from graphql_api.slow_queries import ResolverTracker
+
+
+# Scans over fewer rows than this are not worth an index
+DEFAULT_MIN_ROWS = 1000
+# Estimated and actual row counts further apart than this factor are reported
+DEFAULT_ESTIMATE_FACTOR = 10
+
+PREDICATE = re.compile(
+    r'\(*(?:\w+\.)?(?P<column>[a-z_][a-z0-9_]*)\)?(?:::[a-z ]+)?\s+'
+    r'(?P<operator>= ANY|=|<=|>=|<|>|IS NOT NULL|IS NULL)',
+    re.IGNORECASE,
+)
+EQUALITY_OPERATORS = {'=', '= ANY', 'IS NULL'}
+RANGE_OPERATORS = {'<', '>', '<=', '>='}
+
+
+class QueryCapture:
+    """Record each SQL statement with the resolver that issued it"""
+
+    def __init__(self, tracker=None):
+        self.tracker = tracker
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many:
+            self.queries.append({
+                'resolver': self.tracker.current if self.tracker else None,
+                'sql': sql,
+                'params': list(params) if params is not None else None,
+            })
+        return execute(sql, params, many, context)
+
+
+def is_select(sql):
+    return sql.lstrip().upper().startswith(('SELECT', 'WITH'))
+
+
+def to_generic_sql(sql):
+    """Replace %s placeholders with $n for EXPLAIN (GENERIC_PLAN)"""
+    count = 0
+
+    def number(match):
+        nonlocal count
+        count += 1
+        return f'${count}'
+    return re.sub(r'%s', number, sql)
+
+
+def explain(sql, params, analyze=True):
+    """
+    Return the JSON plan of a SELECT statement.
+
+    With ``analyze`` the statement runs under EXPLAIN (ANALYZE, BUFFERS) in a
+    transaction that is rolled back. Without parameters, for example from a
+    redacted query log, a generic plan is produced instead; that needs
+    PostgreSQL 16 and reports no actual row counts.
+    """
+    if params is None:
+        if connection.pg_version < 160000:
+            return None
+        statement, params, analyze = 'EXPLAIN (FORMAT JSON, GENERIC_PLAN) ' + to_generic_sql(sql), None, False
+    elif analyze:
+        statement = 'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + sql
+    else:
+        statement = 'EXPLAIN (FORMAT JSON) ' + sql
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(statement, params)
+            result = cursor.fetchone()[0]
+        transaction.set_rollback(True)
+    return json.loads(result) if isinstance(result, str) else result
+
+
+def normalize(condition):
+    """Strip literal values from a plan condition so reports diff cleanly"""
+    if condition is None:
+        return None
+    return re.sub(r"'(?:[^']|'')*'", "'?'", condition)
+
+
+def walk(node, parent=None):
+    yield node, parent
+    for child in node.get('Plans', ()):
+        yield from walk(child, node)
+
+
+class PlanAnalyzer:
+    """Turn JSON plans into findings and index proposals"""
+
+    def __init__(self, min_rows=DEFAULT_MIN_ROWS, estimate_factor=DEFAULT_ESTIMATE_FACTOR):
+        self.min_rows = min_rows
+        self.estimate_factor = estimate_factor
+        self.models = {model._meta.db_table: model for model in apps.get_models()}
+        with connection.cursor() as cursor:
+            cursor.execute('''
+                SELECT child.relname, parent.relname FROM pg_inherits
+                JOIN pg_class child ON child.oid = inhrelid
+                JOIN pg_class parent ON parent.oid = inhparent
+                WHERE child.relkind IN ('r', 'p')
+            ''')
+            self.partition_parents = dict(cursor.fetchall())
+
+    def table(self, relation):
+        while relation in self.partition_parents:
+            relation = self.partition_parents[relation]
+        return relation
+
+    def findings(self, plan):
+        root = plan[0]['Plan']
+        analyzed = 'Actual Rows' in root
+        found, seq_scans = [], {}
+        for node, parent in walk(root):
+            loops = node.get('Actual Loops', 1) or 1
+            if node['Node Type'] == 'Seq Scan':
+                if analyzed:
+                    scanned = (node['Actual Rows'] + node.get('Rows Removed by Filter', 0)) * loops
+                else:
+                    scanned = node['Plan Rows']
+                sort_key = None
+                if parent is not None and parent['Node Type'] in ('Sort', 'Incremental Sort'):
+                    sort_key = parent['Sort Key']
+                # Scans of the partitions of one table are reported together
+                key = (self.table(node['Relation Name']), normalize(node.get('Filter')), tuple(sort_key or ()))
+                seq_scans[key] = seq_scans.get(key, 0) + scanned
+
+            if node.get('Sort Space Type') == 'Disk':
+                found.append({
+                    'type': 'sort_spill',
+                    'sort_key': node.get('Sort Key'),
+                    'space_kb': node.get('Sort Space Used'),
+                })
+
+            if analyzed and 'Actual Rows' in node:
+                estimated, actual = node['Plan Rows'], node['Actual Rows']
+                factor = max(estimated, actual) / max(min(estimated, actual), 1)
+                if factor >= self.estimate_factor and max(estimated, actual) >= self.min_rows:
+                    found.append({
+                        'type': 'row_estimate',
+                        'node': node['Node Type'],
+                        'relation': self.table(node['Relation Name']) if 'Relation Name' in node else None,
+                        'estimated_rows': estimated,
+                        'actual_rows': actual,
+                        'factor': round(factor, 1),
+                    })
+
+        scans = []
+        for (relation, condition, sort_key), scanned in sorted(seq_scans.items(), key=str):
+            if scanned < self.min_rows:
+                continue
+            finding = {'type': 'seq_scan', 'relation': relation, 'filter': condition, 'rows_scanned': scanned}
+            if sort_key:
+                finding['sort_key'] = list(sort_key)
+            scans.append(finding)
+        return scans + found
+
+    def propose_index(self, finding):
+        """An index for a sequential scan's filter and sort, or None"""
+        model = self.models.get(finding['relation'])
+        if model is None or not finding.get('filter'):
+            return None
+        fields_by_column = {field.column: field.name for field in model._meta.concrete_fields}
+
+        equality, ranges = [], []
+        for match in PREDICATE.finditer(finding['filter']):
+            name = fields_by_column.get(match['column'])
+            if name is None:
+                continue
+            operator = match['operator'].upper()
+            if operator in EQUALITY_OPERATORS and name not in equality:
+                equality.append(name)
+            elif operator in RANGE_OPERATORS and name not in ranges:
+                ranges.append(name)
+        fields = equality + [name for name in ranges[:1] if name not in equality]
+
+        for key in finding.get('sort_key') or ():
+            column, _, direction = key.split('.')[-1].partition(' ')
+            name = fields_by_column.get(column.strip('()"'))
+            if name is not None and name not in fields:
+                fields.append(f'-{name}' if direction.upper().startswith('DESC') else name)
+        if not fields or self.is_covered(model, fields):
+            return None
+
+        index = models.Index(fields=fields, name='')
+        index.set_name_with_model(model)
+        return model, index
+
+    @staticmethod
+    def is_covered(model, fields):
+        existing = [list(index.fields) for index in model._meta.indexes if index.condition is None]
+        existing += [[field.name] for field in model._meta.concrete_fields if field.db_index or field.unique]
+        return any(index[:len(fields)] == fields for index in existing)
+
+
+def render_meta_indexes(proposals):
+    """
+    The ``Meta.indexes`` entries to add for the proposed indexes, as
+    ``{model_label: [source]}``. The indexes belong on the models so that
+    ``makemigrations`` writes the AddIndex migrations and keeps them.
+    """
+    entries = {}
+    for model, index in sorted(proposals, key=lambda proposal: proposal[1].name):
+        source, _ = MigrationWriter.serialize(index)
+        entries.setdefault(model._meta.label, []).append(source)
+    return entries
+
+
+def read_query_log(path):
+    """Read captured queries from a JSON-lines log of ``{"sql", "params", "resolver"}`` entries"""
+    queries = []
+    for line in Path(path).read_text().splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        entry = json.loads(line)
+        queries.append({
+            'resolver': entry.get('resolver'),
+            'operation': entry.get('operation'),
+            'sql': entry['sql'],
+            'params': entry.get('params'),
+        })
+    return queries
+
+
+def capture_operation(operation, fixture):
+    """Execute a benchmark operation and return the queries each resolver issued"""
+    tracker = ResolverTracker()
+    capture = QueryCapture(tracker)
+    request = RequestFactory().post('/graphql/')
+    request.user = AnonymousUser()
+    middleware = [*instantiate_middleware(graphene_settings.MIDDLEWARE), tracker]
+
+    with transaction.atomic(), connection.execute_wrapper(capture):
+        result = schema.execute(
+            operation.query,
+            variables=operation.variables(fixture),
+            context_value=request,
+            middleware=middleware,
+        )
+        transaction.set_rollback(True)
+    if result.errors:
+        raise ValueError(f'{operation.name} failed: {result.errors}')
+    return [dict(query, operation=operation.name) for query in capture.queries]
+
+
+class ExplainRunner:
+    """
+    Explain captured queries, grouped by operation, resolver and SQL text.
+
+    Repeated statements (N+1 patterns) are explained once with the first
+    parameters seen and reported with their call count.
+    """
+
+    def __init__(self, min_rows=DEFAULT_MIN_ROWS, estimate_factor=DEFAULT_ESTIMATE_FACTOR, timing=True):
+        self.analyzer = PlanAnalyzer(min_rows, estimate_factor)
+        self.timing = timing
+
+    def group(self, queries):
+        groups = {}
+        for query in queries:
+            if not is_select(query['sql']):
+                continue
+            key = (query.get('operation') or '', query.get('resolver') or '', query['sql'])
+            if key in groups:
+                groups[key]['calls'] += 1
+            else:
+                groups[key] = dict(query, calls=1)
+        return [groups[key] for key in sorted(groups)]
+
+    def run(self, queries):
+        report, proposals = [], {}
+        for query in self.group(queries):
+            plan = explain(query['sql'], query['params'])
+            entry = {
+                'operation': query.get('operation'),
+                'resolver': query.get('resolver'),
+                'sql': query['sql'],
+                'calls': query['calls'],
+            }
+            if plan is None:
+                entry['skipped'] = 'no parameters and PostgreSQL older than 16'
+                report.append(entry)
+                continue
+
+            entry['findings'] = self.analyzer.findings(plan)
+            entry['plan'] = plan[0]['Plan']['Node Type']
+            if self.timing and 'Execution Time' in plan[0]:
+                entry['execution_ms'] = plan[0]['Execution Time']
+            for finding in entry['findings']:
+                if finding['type'] != 'seq_scan':
+                    continue
+                proposal = self.analyzer.propose_index(finding)
+                if proposal is not None:
+                    model, index = proposal
+                    finding['proposed_index'] = {
+                        'model': model._meta.label,
+                        'fields': list(index.fields),
+                        'name': index.name,
+                    }
+                    proposals[index.name] = proposal
+            report.append(entry)
+
+        return {
+            'queries': report,
+            'proposed_indexes': sorted(
+                ({'model': model._meta.label, 'fields': list(index.fields), 'name': index.name}
+                 for model, index in proposals.values()),
+                key=lambda proposal: proposal['name'],
+            ),
+            'meta_indexes': render_meta_indexes(proposals.values()),
+        }
@@ -0,0 +1,431 @@
+"""
+Load generator replaying the frontend's GraphQL operations over HTTP.
+
+Each virtual user holds one keep-alive connection and issues requests back to
+back, picking reads and writes according to the configured mix.
+"""
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+from .runner import percentile
+
+
+READ_WEIGHTS = {
+    'GetOrganizations': 1,
+    'GetOrganization': 2,
+    'GetProjects': 4,
+    'GetProject': 3,
+    'GetTasks': 6,
+    'GetTask': 3,
+    'GetTaskComments': 3,
+    'GetOrganizationStats': 2,
+    'GetProjectStats': 1,
+    'GetTaskStats': 1,
+}
+
+WRITE_WEIGHTS = {
+    'CreateTask': 2,
+    'UpdateTask': 4,
+    'CreateTaskComment': 3,
+    'UpdateTaskComment': 1,
+}
+
+
+def _counter_suffix(state):
+    state['sequence'] += 1
+    return f'{state["worker"]}-{state["sequence"]}'
+
+
+VARIABLE_BUILDERS = {
+    'GetOrganizations': lambda fixture, rng, state: {},
+    'GetOrganization': lambda fixture, rng, state: {'slug': fixture['organization_slug']},
+    'GetProjects': lambda fixture, rng, state: {'organizationSlug': fixture['organization_slug']},
+    'GetProject': lambda fixture, rng, state: {'id': rng.choice(fixture['project_ids'])},
+    'GetTasks': lambda fixture, rng, state: {'projectId': rng.choice(fixture['project_ids'])},
+    'GetTask': lambda fixture, rng, state: {'id': rng.choice(fixture['task_ids'])},
+    'GetTaskComments': lambda fixture, rng, state: {'taskId': rng.choice(fixture['task_ids'])},
+    'GetOrganizationStats': lambda fixture, rng, state: {'organizationSlug': fixture['organization_slug']},
+    'GetProjectStats': lambda fixture, rng, state: {
+        'organizationSlug': fixture['organization_slug'],
+        'projectId': rng.choice(fixture['project_ids']),
+    },
+    'GetTaskStats': lambda fixture, rng, state: {
+        'organizationSlug': fixture['organization_slug'],
+        'projectId': rng.choice(fixture['project_ids']),
+    },
+    'CreateTask': lambda fixture, rng, state: {'input': {
+        'projectId': rng.choice(fixture['writable_project_ids']),
+        'title': f'Load test task {_counter_suffix(state)}',
+        'description': 'Created by the load harness',
+    }},
+    'UpdateTask': lambda fixture, rng, state: {
+        'id': rng.choice(fixture['writable_task_ids']),
+        'input': {'description': f'Updated by the load harness {_counter_suffix(state)}'},
+    },
+    'CreateTaskComment': lambda fixture, rng, state: {'input': {
+        'taskId': rng.choice(fixture['task_ids']),
+        'content': f'Load test comment {_counter_suffix(state)}',
+        'authorEmail': 'load@example.com',
+    }},
+    'UpdateTaskComment': lambda fixture, rng, state: {
+        'id': rng.choice(fixture['comment_ids']),
+        'content': f'Edited by the load harness {_counter_suffix(state)}',
+    },
+}
+
+FIXTURE_REQUIREMENTS = {
+    'CreateTask': 'writable_project_ids',
+    'UpdateTask': 'writable_task_ids',
+    'UpdateTaskComment': 'comment_ids',
+}
+
+
+class LoadError(Exception):
+    pass
+
+
+class HTTPConnection:
+    """Minimal HTTP/1.1 client on asyncio streams that keeps its socket open between requests"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.connects = 0
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.connects += 1
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.writer = None
+
+    async def request(self, method, path, body=b'', headers=None):
+        for attempt in range(2):
+            if self.writer is None:
+                await self.connect()
+            try:
+                return await self._request(method, path, body, headers or {})
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server dropped an idle keep-alive connection; retry once.
+                await self.close()
+                if attempt:
+                    raise
+
+    async def _request(self, method, path, body, headers):
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}',
+                 f'Content-Length: {len(body)}', 'Connection: keep-alive']
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readuntil(b'\r\n')
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            content = await self._read_chunked()
+        elif 'content-length' in response_headers:
+            content = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            content = await self.reader.read()
+            await self.close()
+
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, response_headers, content
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            if size == 0:
+                await self.reader.readuntil(b'\r\n')
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+
+class GraphQLClient:
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.path = parts.path or '/'
+        self.connection = HTTPConnection(parts.hostname, parts.port or 80)
+
+    async def execute(self, query, variables=None, operation_name=None):
+        body = json.dumps({
+            'query': query,
+            'variables': variables or {},
+            'operationName': operation_name,
+        }).encode()
+        status, _, content = await self.connection.request(
+            'POST', self.path, body,
+            {'Content-Type': 'application/json', 'Accept': 'application/json'},
+        )
+        return status, json.loads(content) if content else {}
+
+    async def close(self):
+        await self.connection.close()
+
+
+def response_failed(status, payload):
+    if status != 200 or payload.get('errors'):
+        return True
+    # Mutations report failures in-band through their ``success`` field.
+    return any(
+        isinstance(value, dict) and value.get('success') is False
+        for value in (payload.get('data') or {}).values()
+    )
+
+
+async def discover_fixture(url, organization_slug=None, max_projects=5):
+    """Collect ids the operations can target by querying the server itself"""
+    client = GraphQLClient(url)
+    try:
+        _, payload = await client.execute('{ organizations { slug projectCount } }')
+        organizations = payload.get('data', {}).get('organizations') or []
+        if organization_slug is None and organizations:
+            organization_slug = max(organizations, key=lambda org: org['projectCount'])['slug']
+        if organization_slug is None:
+            raise LoadError('The server has no organizations to load test.')
+
+        _, payload = await client.execute(
+            'query($slug: String) { projects(organizationSlug: $slug) { id canAddTasks } }',
+            {'slug': organization_slug},
+        )
+        projects = payload['data']['projects']
+        writable_projects = [project['id'] for project in projects if project['canAddTasks']]
+        if not projects:
+            raise LoadError(f'Organization "{organization_slug}" has no projects.')
+
+        task_ids, writable_task_ids, comment_ids = [], [], []
+        for project_id in (writable_projects or [p['id'] for p in projects])[:max_projects]:
+            _, payload = await client.execute(
+                'query($id: ID) { tasks(projectId: $id) { id status dueDate } }',
+                {'id': project_id},
+            )
+            for task in payload['data']['tasks']:
+                task_ids.append(task['id'])
+                if project_id in writable_projects and (
+                    task['status'] == 'DONE' or task['dueDate'] is None
+                    or task['dueDate'] > time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())
+                ):
+                    writable_task_ids.append(task['id'])
+
+        for task_id in task_ids[:20]:
+            _, payload = await client.execute(
+                'query($id: ID!) { taskComments(taskId: $id) { comments { id } } }', {'id': task_id}
+            )
+            comment_ids.extend(comment['id'] for comment in payload['data']['taskComments']['comments'])
+    finally:
+        await client.close()
+
+    if not task_ids:
+        raise LoadError(f'Organization "{organization_slug}" has no tasks.')
+
+    return {
+        'organization_slug': organization_slug,
+        'project_ids': [project['id'] for project in projects],
+        'writable_project_ids': writable_projects,
+        'task_ids': task_ids,
+        'writable_task_ids': writable_task_ids,
+        'comment_ids': comment_ids,
+    }
+
+
+class LoadHarness:
+    """
+    Drive a mix of frontend documents against a running server.
+
+    ``write_ratio`` is the share of requests drawn from mutations; within reads
+    and writes, operations are picked according to their weights. The run stops
+    after ``duration`` seconds or ``total_requests`` requests, whichever is set.
+    """
+
+    def __init__(self, url, documents, fixture, concurrency=10, write_ratio=0.1,
+                 duration=None, total_requests=None, seed=42, weights=None):
+        if duration is None and total_requests is None:
+            raise ValueError('Either duration or total_requests is required')
+
+        self.url = url
+        self.fixture = fixture
+        self.concurrency = concurrency
+        self.write_ratio = write_ratio
+        self.duration = duration
+        self.total_requests = total_requests
+        self.seed = seed
+        self.skipped = {}
+
+        weights = dict(READ_WEIGHTS, **WRITE_WEIGHTS, **(weights or {}))
+        self.reads, self.writes = [], []
+        for document in documents:
+            reason = self._skip_reason(document, weights)
+            if reason:
+                self.skipped[document.operation_name] = reason
+                continue
+            pool = self.writes if document.is_mutation else self.reads
+            pool.append((document, weights[document.operation_name]))
+
+        if not self.reads and not self.writes:
+            raise LoadError('No runnable operations after filtering the frontend documents')
+
+    def _skip_reason(self, document, weights):
+        if not document.is_valid:
+            return f'invalid against the schema: {document.errors[0]}'
+        if document.operation_name not in VARIABLE_BUILDERS:
+            return 'no variable builder (destructive or unsupported)'
+        if not weights.get(document.operation_name):
+            return 'weight is zero'
+        requirement = FIXTURE_REQUIREMENTS.get(document.operation_name)
+        if requirement and not self.fixture.get(requirement):
+            return f'no {requirement.replace("_", " ")} available'
+        return None
+
+    def _choose(self, rng):
+        pool = self.writes if self.writes and (not self.reads or rng.random() < self.write_ratio) else self.reads
+        documents, weights = zip(*pool)
+        return rng.choices(documents, weights=weights)[0]
+
+    async def _worker(self, index, samples, deadline, budget):
+        rng = random.Random(self.seed + index)
+        state = {'worker': index, 'sequence': 0}
+        client = GraphQLClient(self.url)
+        try:
+            while True:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                if budget is not None:
+                    if budget['remaining'] <= 0:
+                        break
+                    budget['remaining'] -= 1
+
+                document = self._choose(rng)
+                variables = VARIABLE_BUILDERS[document.operation_name](self.fixture, rng, state)
+                started = time.perf_counter()
+                status, payload = await client.execute(document.source, variables, document.operation_name)
+                elapsed = (time.perf_counter() - started) * 1000
+                samples.append((document.operation_name, elapsed, response_failed(status, payload)))
+            return client.connection.connects
+        finally:
+            await client.close()
+
+    async def run(self):
+        samples = []
+        started = time.perf_counter()
+        deadline = started + self.duration if self.duration is not None else None
+        budget = {'remaining': self.total_requests} if self.total_requests is not None else None
+        connects = await asyncio.gather(*(
+            self._worker(index, samples, deadline, budget) for index in range(self.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+        return self.report(samples, elapsed, sum(connects))
+
+    def report(self, samples, elapsed, connects):
+        operations = {}
+        for name in sorted({sample[0] for sample in samples}):
+            latencies = [latency for op, latency, _ in samples if op == name]
+            operations[name] = {
+                'requests': len(latencies),
+                'errors': sum(1 for op, _, failed in samples if op == name and failed),
+                'throughput_rps': round(len(latencies) / elapsed, 2),
+                'p50_ms': round(percentile(latencies, 50), 3),
+                'p95_ms': round(percentile(latencies, 95), 3),
+                'p99_ms': round(percentile(latencies, 99), 3),
+                'mean_ms': round(sum(latencies) / len(latencies), 3),
+                'max_ms': round(max(latencies), 3),
+            }
+
+        latencies = [sample[1] for sample in samples]
+        return {
+            'meta': {
+                'url': self.url,
+                'concurrency': self.concurrency,
+                'write_ratio': self.write_ratio,
+                'duration_s': self.duration,
+                'total_requests': self.total_requests,
+                'seed': self.seed,
+                'organization_slug': self.fixture['organization_slug'],
+                'skipped': self.skipped,
+            },
+            'totals': {
+                'requests': len(samples),
+                'errors': sum(1 for sample in samples if sample[2]),
+                'elapsed_s': round(elapsed, 3),
+                'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0,
+                'connections': connects,
+                'p50_ms': round(percentile(latencies, 50), 3) if latencies else None,
+                'p95_ms': round(percentile(latencies, 95), 3) if latencies else None,
+                'p99_ms': round(percentile(latencies, 99), 3) if latencies else None,
+            },
+            'operations': operations,
+        }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """Run ``manage.py runserver`` in a subprocess for the duration of a load test"""
+
+    def __init__(self, port=None, extra_args=None, startup_timeout=30):
+        self.port = port or _free_port()
+        self.extra_args = extra_args or []
+        self.startup_timeout = startup_timeout
+        self.process = None
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.port}/graphql/'
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, 'manage.py', 'runserver', '--noreload',
+             *self.extra_args, f'127.0.0.1:{self.port}'],
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise LoadError('The development server exited during startup')
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=0.5).close()
+                return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise LoadError(f'The development server did not start within {self.startup_timeout}s')
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
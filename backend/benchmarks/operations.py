@@ -0,0 +1,267 @@
+from django.db.models import Count
+
+from apps.organizations.models import Organization
+from apps.tasks.models import Task
+
+
+PROJECTS_QUERY = '''
+query GetProjects($organizationSlug: String, $status: String, $search: String) {
+  projects(organizationSlug: $organizationSlug, status: $status, search: $search) {
+    id
+    name
+    description
+    status
+    dueDate
+    taskCount
+    completedTaskCount
+    completionPercentage
+    isOverdue
+    canBeCompleted
+    canAddTasks
+    statusColor
+    createdAt
+    updatedAt
+    organization { id name slug }
+  }
+}
+'''
+
+TASKS_QUERY = '''
+query GetTasks(
+  $organizationSlug: String
+  $projectId: ID
+  $status: String
+  $priority: String
+  $assigneeEmail: String
+  $search: String
+) {
+  tasks(
+    organizationSlug: $organizationSlug
+    projectId: $projectId
+    status: $status
+    priority: $priority
+    assigneeEmail: $assigneeEmail
+    search: $search
+  ) {
+    id
+    title
+    description
+    status
+    priority
+    assigneeEmail
+    dueDate
+    commentCount
+    isOverdue
+    canStart
+    isCompleted
+    priorityWeight
+    createdAt
+    updatedAt
+    project { id name organization { id name slug } }
+  }
+}
+'''
+
+ORGANIZATION_STATS_QUERY = '''
+query GetOrganizationStats($organizationSlug: String!) {
+  organizationStats(organizationSlug: $organizationSlug) {
+    projectStats {
+      totalProjects
+      activeProjects
+      completedProjects
+      onHoldProjects
+      cancelledProjects
+      completionRate
+    }
+    taskStats {
+      totalTasks
+      todoTasks
+      inProgressTasks
+      doneTasks
+      blockedTasks
+      overdueTasks
+      completionRate
+    }
+    recentActivityCount
+    activeUsersCount
+  }
+}
+'''
+
+TASK_WITH_COMMENTS_QUERY = '''
+query GetTaskWithComments($id: ID!) {
+  task(id: $id) {
+    id
+    title
+    description
+    status
+    priority
+    assigneeEmail
+    dueDate
+    commentCount
+    isOverdue
+    canStart
+    isCompleted
+    priorityWeight
+    createdAt
+    updatedAt
+    project { id name organization { id name slug } }
+  }
+  taskComments(taskId: $id) {
+    totalCount
+    hasMore
+    endCursor
+    comments {
+      id
+      content
+      authorEmail
+      createdAt
+      updatedAt
+    }
+  }
+}
+'''
+
+CREATE_TASK_MUTATION = '''
+mutation CreateTask($input: TaskInput!) {
+  createTask(input: $input) {
+    task { id title status priority project { id name } }
+    success
+    errors
+  }
+}
+'''
+
+UPDATE_TASK_MUTATION = '''
+mutation UpdateTask($id: ID!, $input: TaskUpdateInput!) {
+  updateTask(id: $id, input: $input) {
+    task { id title description status priority updatedAt }
+    success
+    errors
+  }
+}
+'''
+
+
+class BenchmarkOperation:
+    """A named GraphQL document plus a function building its variables from a fixture"""
+
+    def __init__(self, name, query, variables, mutation=False):
+        self.name = name
+        self.query = query
+        self.variables = variables
+        self.mutation = mutation
+
+    def __repr__(self):
+        return f'<BenchmarkOperation {self.name}>'
+
+
+OPERATIONS = [
+    BenchmarkOperation(
+        'projects',
+        PROJECTS_QUERY,
+        lambda fixture: {'organizationSlug': fixture['organization_slug']},
+    ),
+    BenchmarkOperation(
+        'tasks_by_project',
+        TASKS_QUERY,
+        lambda fixture: {'projectId': fixture['project_id']},
+    ),
+    BenchmarkOperation(
+        'tasks_filtered',
+        TASKS_QUERY,
+        lambda fixture: {
+            'organizationSlug': fixture['organization_slug'],
+            'status': 'TODO',
+            'priority': 'HIGH',
+        },
+    ),
+    BenchmarkOperation(
+        'tasks_search',
+        TASKS_QUERY,
+        lambda fixture: {
+            'organizationSlug': fixture['organization_slug'],
+            'search': fixture['search'],
+        },
+    ),
+    BenchmarkOperation(
+        'organization_stats',
+        ORGANIZATION_STATS_QUERY,
+        lambda fixture: {'organizationSlug': fixture['organization_slug']},
+    ),
+    BenchmarkOperation(
+        'task_with_comments',
+        TASK_WITH_COMMENTS_QUERY,
+        lambda fixture: {'id': fixture['task_id']},
+    ),
+    BenchmarkOperation(
+        'create_task',
+        CREATE_TASK_MUTATION,
+        lambda fixture: {'input': {
+            'projectId': fixture['active_project_id'],
+            'title': 'Benchmark task',
+            'description': 'Created by the benchmark suite',
+            'priority': 'HIGH',
+        }},
+        mutation=True,
+    ),
+    BenchmarkOperation(
+        'update_task',
+        UPDATE_TASK_MUTATION,
+        lambda fixture: {'id': fixture['open_task_id'], 'input': {
+            'title': 'Benchmark task (updated)',
+            'description': 'Updated by the benchmark suite',
+        }},
+        mutation=True,
+    ),
+]
+
+
+def get_operations(names=None):
+    """Return the benchmark operations, optionally restricted to the given names"""
+    if not names:
+        return list(OPERATIONS)
+    known = {operation.name: operation for operation in OPERATIONS}
+    unknown = set(names) - set(known)
+    if unknown:
+        raise ValueError(f'Unknown benchmark operations: {", ".join(sorted(unknown))}')
+    return [known[name] for name in names]
+
+
+def load_fixture(organization_slug=None):
+    """
+    Pick the rows the operations run against.
+
+    Defaults to the first benchmark organization and, within it, the project
+    and task with the most children so that the measured work is representative.
+    """
+    organizations = Organization.objects.filter(is_active=True)
+    if organization_slug:
+        organization = organizations.get(slug=organization_slug)
+    else:
+        organization = organizations.order_by('slug').first()
+    if organization is None:
+        raise ValueError('No organization to benchmark; seed a dataset first.')
+
+    projects = organization.projects.annotate(num_tasks=Count('tasks')).order_by('-num_tasks', 'id')
+    project = projects.first()
+    active_project = projects.filter(status__in=['ACTIVE', 'ON_HOLD']).first()
+    tasks = Task.objects.filter(project__organization=organization)
+    task = tasks.annotate(num_comments=Count('comments')).order_by('-num_comments', 'id').first()
+    open_task = tasks.filter(
+        status__in=['TODO', 'IN_PROGRESS'],
+        project__status__in=['ACTIVE', 'ON_HOLD'],
+        due_date__isnull=True,
+    ).order_by('id').first()
+
+    if project is None or task is None:
+        raise ValueError(f'Organization "{organization.slug}" has no tasks to benchmark.')
+
+    return {
+        'organization_slug': organization.slug,
+        'project_id': str(project.id),
+        'active_project_id': str(active_project.id if active_project else project.id),
+        'task_id': str(task.id),
+        'open_task_id': str(open_task.id if open_task else task.id),
+        'search': 'payments',
+    }
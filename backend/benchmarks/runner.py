@@ -0,0 +1,184 @@
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchmarkRunner:
+    """
+    Run GraphQL operations through the full Django request stack and collect
+    latency percentiles, query counts, peak memory and response sizes.
+
+    Mutations run inside a transaction that is rolled back after every
+    iteration so repeated runs leave the dataset untouched.
+    """
+
+    def __init__(self, fixture, iterations=20, warmup=3, path='/graphql/'):
+        self.fixture = fixture
+        self.iterations = iterations
+        self.warmup = warmup
+        self.path = path
+        self.client = Client(HTTP_HOST='localhost')
+
+    def execute(self, operation):
+        body = json.dumps({
+            'query': operation.query,
+            'variables': operation.variables(self.fixture),
+        })
+        if operation.mutation:
+            with transaction.atomic():
+                response = self._post(body)
+                transaction.set_rollback(True)
+        else:
+            response = self._post(body)
+
+        payload = json.loads(response.content)
+        if response.status_code != 200 or payload.get('errors'):
+            raise BenchmarkError(f'{operation.name} failed: {payload.get("errors") or response.status_code}')
+        return response
+
+    def _post(self, body):
+        return self.client.post(self.path, data=body, content_type='application/json')
+
+    def measure(self, operation):
+        for _ in range(self.warmup):
+            self.execute(operation)
+
+        timings = []
+        for _ in range(self.iterations):
+            started = time.perf_counter()
+            response = self.execute(operation)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        with CaptureQueriesContext(connection) as captured:
+            self.execute(operation)
+        # Read the count now: the next request resets connection.queries.
+        queries = len(captured.captured_queries)
+
+        tracemalloc.start()
+        try:
+            self.execute(operation)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'iterations': self.iterations,
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'mean_ms': round(sum(timings) / len(timings), 3),
+            'min_ms': round(min(timings), 3),
+            'max_ms': round(max(timings), 3),
+            'queries': queries,
+            'peak_memory_kb': round(peak / 1024, 1),
+            'response_bytes': len(response.content),
+        }
+
+    def run(self, operations, dataset=None, log=None):
+        results = {}
+        for operation in operations:
+            results[operation.name] = self.measure(operation)
+            if log:
+                log(format_result(operation.name, results[operation.name]))
+
+        return {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'git_commit': git_commit(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'iterations': self.iterations,
+                'warmup': self.warmup,
+                'fixture': self.fixture,
+                'dataset': dataset,
+            },
+            'operations': results,
+        }
+
+
+def format_result(name, result):
+    return (
+        f'{name:<22} p50={result["p50_ms"]:>9.2f}ms p95={result["p95_ms"]:>9.2f}ms '
+        f'p99={result["p99_ms"]:>9.2f}ms queries={result["queries"]:>4} '
+        f'peak={result["peak_memory_kb"]:>9.1f}KiB'
+    )
+
+
+def save_report(report, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True))
+    return path
+
+
+def load_report(path):
+    return json.loads(Path(path).read_text())
+
+
+def compare_reports(baseline, current, threshold=10.0):
+    """
+    Diff two benchmark reports.
+
+    An operation regresses when its p95 latency grows by more than
+    ``threshold`` percent or when it issues more queries than the baseline.
+    """
+    comparison = {}
+    for name, result in current['operations'].items():
+        base = baseline['operations'].get(name)
+        if base is None:
+            continue
+
+        def change(key):
+            if not base[key]:
+                return None
+            return round((result[key] - base[key]) / base[key] * 100, 1)
+
+        regressions = []
+        if change('p95_ms') is not None and change('p95_ms') > threshold:
+            regressions.append('p95_ms')
+        if result['queries'] > base['queries']:
+            regressions.append('queries')
+
+        comparison[name] = {
+            'p50_change_pct': change('p50_ms'),
+            'p95_change_pct': change('p95_ms'),
+            'queries': [base['queries'], result['queries']],
+            'peak_memory_change_pct': change('peak_memory_kb'),
+            'regressions': regressions,
+        }
+    return comparison
@@ -0,0 +1,16 @@
+from django.db.backends.postgresql import base, features
+
+
+class DatabaseFeatures(features.DatabaseFeatures):
+    def allows_group_by_selected_pks_on_model(self, model):
+        # Partitioned tables have the partition key in their primary key, so
+        # Postgres does not treat the other columns as dependent on id alone
+        from apps.tasks.partitions import PARTITIONED_TABLES
+        if model._meta.db_table in PARTITIONED_TABLES:
+            return False
+        return super().allows_group_by_selected_pks_on_model(model)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """The stock PostgreSQL backend, aware of the partitioned task tables"""
+    features_class = DatabaseFeatures
@@ -48,6 +48,9 @@ INSTALLED_APPS = [
     'apps.organizations',
     'apps.projects',
     'apps.tasks',
+    'apps.jobs',
+    'apps.activity',
+    'graphql_api',
 ]
 
 MIDDLEWARE = [
@@ -87,7 +90,7 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'config.postgresql',
         'NAME': config('DB_NAME', default='project_management_db'),
         'USER': config('DB_USER', default='postgres'),
         'PASSWORD': config('DB_PASSWORD', default='postgres_dev_password'),
@@ -161,4 +164,101 @@ GRAPHENE = {
     'MIDDLEWARE': [
         'graphql_api.middleware.OrganizationMiddleware',
     ],
-}
\ No newline at end of file
+}
+
+# Parsed and validated GraphQL documents kept in memory per process
+GRAPHQL_DOCUMENT_CACHE_SIZE = config('GRAPHQL_DOCUMENT_CACHE_SIZE', default=256, cast=int)
+
+# Automatic persisted queries; strict mode only runs pre-registered operations
+GRAPHQL_PERSISTED_QUERY_CACHE_SIZE = config('GRAPHQL_PERSISTED_QUERY_CACHE_SIZE', default=1000, cast=int)
+GRAPHQL_PERSISTED_QUERIES_STRICT = config('GRAPHQL_PERSISTED_QUERIES_STRICT', default=False, cast=bool)
+# Longest query text registered automatically; longer ones still run
+GRAPHQL_PERSISTED_QUERY_MAX_LENGTH = config('GRAPHQL_PERSISTED_QUERY_MAX_LENGTH', default=20000, cast=int)
+
+# Static query cost analysis; operations above either ceiling are rejected.
+# A non-zero budget also limits the total cost each client may spend per minute.
+GRAPHQL_MAX_QUERY_COST = config('GRAPHQL_MAX_QUERY_COST', default=5000, cast=int)
+GRAPHQL_MAX_QUERY_DEPTH = config('GRAPHQL_MAX_QUERY_DEPTH', default=8, cast=int)
+GRAPHQL_QUERY_COST_BUDGET = config('GRAPHQL_QUERY_COST_BUDGET', default=0, cast=int)
+
+# Compress GraphQL responses of at least this many bytes with brotli or gzip
+GRAPHQL_COMPRESS_RESPONSES = config('GRAPHQL_COMPRESS_RESPONSES', default=True, cast=bool)
+GRAPHQL_COMPRESSION_MIN_SIZE = config('GRAPHQL_COMPRESSION_MIN_SIZE', default=1024, cast=int)
+
+# Items per part when a list is delivered incrementally with @stream
+GRAPHQL_STREAM_BATCH_SIZE = config('GRAPHQL_STREAM_BATCH_SIZE', default=50, cast=int)
+
+# Background jobs: a worker's lease on a job before another worker may take it
+# over, and the base delay of the exponential backoff between attempts
+JOB_LEASE_SECONDS = config('JOB_LEASE_SECONDS', default=300, cast=int)
+JOB_RETRY_BACKOFF_SECONDS = config('JOB_RETRY_BACKOFF_SECONDS', default=30, cast=int)
+
+# Rows removed per statement when projects and organizations are purged
+PURGE_BATCH_SIZE = config('PURGE_BATCH_SIZE', default=1000, cast=int)
+
+# Closed projects untouched for this many days have their tasks archived
+ARCHIVE_AFTER_DAYS = config('ARCHIVE_AFTER_DAYS', default=30, cast=int)
+
+# Open tasks updated per statement by escalate_tasks
+ESCALATION_BATCH_SIZE = config('ESCALATION_BATCH_SIZE', default=1000, cast=int)
+
+# Days before today whose daily counters reconcile_rollups recomputes
+ROLLUP_RECONCILE_DAYS = config('ROLLUP_RECONCILE_DAYS', default=2, cast=int)
+
+# Dashboard stats are read from materialized views, refreshed by
+# refresh_dashboard_stats, while the views are at most this many seconds old
+# and the organization or project has at least DASHBOARD_STATS_MIN_TASKS
+# tasks; otherwise they are aggregated live
+DASHBOARD_STATS_MAX_AGE = config('DASHBOARD_STATS_MAX_AGE', default=900, cast=int)
+DASHBOARD_STATS_MIN_TASKS = config('DASHBOARD_STATS_MIN_TASKS', default=10000, cast=int)
+
+# Monthly task_comments partitions are kept this many months ahead
+TASK_COMMENT_PARTITION_MONTHS_AHEAD = config('TASK_COMMENT_PARTITION_MONTHS_AHEAD', default=3, cast=int)
+
+# Slow-query log: statements run by GraphQL requests that take at least this
+# many milliseconds are appended to a rotating JSON-lines file and kept in a
+# ring buffer shown at /admin/slow-queries/. A negative threshold turns it off.
+GRAPHQL_SLOW_QUERY_MS = config('GRAPHQL_SLOW_QUERY_MS', default=100, cast=int)
+GRAPHQL_SLOW_QUERY_REDACT_PARAMS = config('GRAPHQL_SLOW_QUERY_REDACT_PARAMS', default=True, cast=bool)
+GRAPHQL_SLOW_QUERY_BUFFER_SIZE = config('GRAPHQL_SLOW_QUERY_BUFFER_SIZE', default=200, cast=int)
+GRAPHQL_SLOW_QUERY_LOG_FILE = config('GRAPHQL_SLOW_QUERY_LOG_FILE', default=str(BASE_DIR / 'slow_queries.jsonl'))
+
+# Request profiling: staff send an X-GraphQL-Profile header (optionally
+# "sampling" or "deterministic"), and this fraction of all requests is profiled
+# with GRAPHQL_PROFILER. The newest GRAPHQL_PROFILE_KEEP profiles are kept.
+GRAPHQL_PROFILER = config('GRAPHQL_PROFILER', default='sampling')
+GRAPHQL_PROFILE_SAMPLE_RATE = config('GRAPHQL_PROFILE_SAMPLE_RATE', default=0.0, cast=float)
+GRAPHQL_PROFILE_INTERVAL_MS = config('GRAPHQL_PROFILE_INTERVAL_MS', default=5, cast=int)
+GRAPHQL_PROFILE_KEEP = config('GRAPHQL_PROFILE_KEEP', default=500, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': GRAPHQL_SLOW_QUERY_LOG_FILE,
+            'maxBytes': config('GRAPHQL_SLOW_QUERY_LOG_MAX_BYTES', default=10 * 1024 * 1024, cast=int),
+            'backupCount': 5,
+            'delay': True,
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'graphql_api.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
+# Admin changelists of tasks and comments trust PostgreSQL's row estimate
+# instead of running an exact COUNT(*) once it reaches this many rows
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000, cast=int)
+
+# Newest comments editable inline on a task's admin page
+ADMIN_COMMENT_INLINE_LIMIT = config('ADMIN_COMMENT_INLINE_LIMIT', default=20, cast=int)
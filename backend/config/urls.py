@@ -1,11 +1,13 @@
 from django.contrib import admin
 from django.urls import path
 from django.views.decorators.csrf import csrf_exempt
-from graphene_django.views import GraphQLView
 from django.conf import settings
 from django.conf.urls.static import static
+from graphql_api.admin import slow_queries_view
+from graphql_api.views import GraphQLView
 
 urlpatterns = [
+    path('admin/slow-queries/', slow_queries_view, name='slow_queries'),
     path('admin/', admin.site.urls),
     path('graphql/', csrf_exempt(GraphQLView.as_view(graphiql=True))),
 ]
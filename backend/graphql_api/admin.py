@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html
+from .models import PersistedQuery, RequestProfile
+from .slow_queries import recent_slow_queries
+
+
+@admin.register(PersistedQuery)
+class PersistedQueryAdmin(admin.ModelAdmin):
+    list_display = ['operation_name', 'sha256_hash', 'is_allowlisted', 'created_at']
+    list_filter = ['is_allowlisted']
+    search_fields = ['operation_name', 'sha256_hash']
+    readonly_fields = ['sha256_hash', 'query', 'created_at']
+    actions = ['allowlist_selected']
+
+    def allowlist_selected(self, request, queryset):
+        updated = queryset.update(is_allowlisted=True)
+        self.message_user(request, f'{updated} persisted queries allowlisted.')
+    allowlist_selected.short_description = 'Allow selected operations in strict mode'
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ['operation_name', 'organization_slug', 'profiler', 'trigger',
+                    'duration_ms', 'samples', 'created_at', 'download_link']
+    list_filter = ['profiler', 'trigger', 'created_at']
+    search_fields = ['operation_name', 'organization_slug']
+    exclude = ['data']
+    readonly_fields = ['operation_name', 'organization_slug', 'profiler', 'trigger',
+                       'duration_ms', 'samples', 'created_at', 'download_link']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('data')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='graphql_api_requestprofile_download',
+            ),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        content_type = 'text/plain' if profile.profiler == 'sampling' else 'application/octet-stream'
+        response = HttpResponse(bytes(profile.data), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{profile.filename}"'
+        return response
+
+    @admin.display(description='Profile')
+    def download_link(self, obj):
+        url = reverse('admin:graphql_api_requestprofile_download', args=[obj.pk])
+        return format_html('<a href="{}">Download</a>', url)
+
+
+@staff_member_required
+def slow_queries_view(request):
+    """The slow statements kept in this process's ring buffer, newest first"""
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Slow queries',
+        'entries': list(reversed(recent_slow_queries())),
+        'threshold_ms': settings.GRAPHQL_SLOW_QUERY_MS,
+        'log_file': settings.GRAPHQL_SLOW_QUERY_LOG_FILE,
+    }
+    return TemplateResponse(request, 'graphql_api/slow_queries.html', context)
@@ -0,0 +1,276 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLList,
+    GraphQLNonNull,
+    InlineFragmentNode,
+    IntValueNode,
+    VariableNode,
+    get_named_type,
+    is_leaf_type,
+)
+from graphql.error import GraphQLError
+
+
+logger = logging.getLogger('graphql_api.cost')
+
+PAGINATION_ARGUMENTS = ('first', 'last', 'limit')
+
+# Scalars are free and object fields cost 1 unless listed here. Computed
+# fields that run their own queries per row carry a surcharge.
+DEFAULT_OBJECT_COST = 1
+FIELD_COSTS = {
+    'OrganizationType.projectCount': 2,
+    'OrganizationType.activeProjectCount': 2,
+    'OrganizationType.projectCompletionRate': 3,
+    'OrganizationType.canBeDeleted': 2,
+    'ProjectType.taskCount': 2,
+    'ProjectType.completedTaskCount': 2,
+    'ProjectType.completionPercentage': 3,
+    'ProjectType.canBeCompleted': 2,
+    'TaskType.commentCount': 2,
+    'TaskType.comments': 3,
+    'Query.organizationStats': 50,
+    'Query.projectStats': 10,
+    'Query.taskStats': 15,
+}
+
+# Assumed list lengths when a list field is not paginated, and smaller ones
+# when a narrowing argument is present. UNBOUNDED lists read a whole table
+# unless narrowed; their rows cost at least 1 each, scalars included.
+DEFAULT_LIST_SIZE = 20
+UNBOUNDED = None
+UNBOUNDED_LIST_SIZE = 1000000
+LIST_SIZES = {
+    'Query.organizations': 20,
+    'Query.projects': 100,
+    'Query.tasks': UNBOUNDED,
+    'TaskBoardType.columns': 4,
+    'TimeSeriesType.points': 366,
+    # Paginated lists, whose page size is capped at pagination.MAX_PAGE_SIZE
+    'TaskBoardColumnType.tasks': 100,
+    'TaskCommentConnectionType.comments': 100,
+    'ActivityFeedType.events': 100,
+    'ChangeSetType.projects': 100,
+    'ChangeSetType.tasks': 100,
+    'ChangeSetType.comments': 100,
+    'ChangeSetType.deleted': 100,
+}
+NARROWED_LIST_SIZES = {
+    'Query.tasks': {'organizationSlug': 1000, 'projectId': 200},
+}
+
+
+class CostReport:
+    def __init__(self, cost, depth, max_cost, max_depth):
+        self.cost = cost
+        self.depth = depth
+        self.max_cost = max_cost
+        self.max_depth = max_depth
+
+    @property
+    def exceeded(self):
+        return (
+            (self.max_cost is not None and self.cost > self.max_cost)
+            or (self.max_depth is not None and self.depth > self.max_depth)
+        )
+
+    def as_extension(self):
+        return {
+            'requested': self.cost,
+            'maximum': self.max_cost,
+            'depth': self.depth,
+            'maximumDepth': self.max_depth,
+        }
+
+
+class CostAnalyzer:
+    """
+    Estimate the work an operation will do before it runs.
+
+    Each field costs its configured weight; a list multiplies the cost of its
+    selections by ``first``/``last``/``limit`` when given, or by the assumed
+    size for that field. An unbounded list, one not narrowed by an argument,
+    is costed as a whole table of at least 1 per row. Fragments are expanded
+    and ``@skip``/``@include`` are honoured, so the estimate follows what
+    would actually execute.
+    """
+
+    def __init__(self, schema, document, variables=None, max_cost=None, max_depth=None):
+        self.schema = schema
+        self.variables = variables or {}
+        self.max_cost = max_cost
+        self.max_depth = max_depth
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+
+    def analyze(self, operation):
+        root_type = self.schema.get_root_type(operation.operation)
+        cost, depth = self._selection_set(root_type, operation.selection_set, set())
+        return CostReport(cost, depth, self.max_cost, self.max_depth)
+
+    def _selection_set(self, parent_type, selection_set, visited_fragments):
+        cost, depth = 0, 0
+        for selection in selection_set.selections:
+            if not self._should_include(selection):
+                continue
+
+            if isinstance(selection, FieldNode):
+                field_cost, field_depth = self._field(parent_type, selection, visited_fragments)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = (
+                    self.schema.get_type(selection.type_condition.name.value)
+                    if selection.type_condition else parent_type
+                )
+                field_cost, field_depth = self._selection_set(
+                    fragment_type, selection.selection_set, visited_fragments
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.fragments.get(name)
+                if fragment is None or name in visited_fragments:
+                    continue
+                field_cost, field_depth = self._selection_set(
+                    self.schema.get_type(fragment.type_condition.name.value),
+                    fragment.selection_set,
+                    visited_fragments | {name},
+                )
+            else:
+                continue
+
+            cost += field_cost
+            depth = max(depth, field_depth)
+        return cost, depth
+
+    def _field(self, parent_type, node, visited_fragments):
+        name = node.name.value
+        if name.startswith('__'):
+            return 0, 0
+
+        field = getattr(parent_type, 'fields', {}).get(name)
+        if field is None:
+            return 0, 1
+
+        coordinate = f'{parent_type.name}.{name}'
+        named_type = get_named_type(field.type)
+        weight = FIELD_COSTS.get(coordinate, 0 if is_leaf_type(named_type) else DEFAULT_OBJECT_COST)
+        if node.selection_set is None:
+            return weight, 1
+
+        child_cost, child_depth = self._selection_set(named_type, node.selection_set, visited_fragments)
+        if not self._is_list(field.type):
+            return weight + child_cost, child_depth + 1
+        size = self._list_size(coordinate, node)
+        if size is UNBOUNDED:
+            return weight + UNBOUNDED_LIST_SIZE * max(child_cost, 1), child_depth + 1
+        return weight + size * child_cost, child_depth + 1
+
+    @staticmethod
+    def _is_list(field_type):
+        while isinstance(field_type, GraphQLNonNull):
+            field_type = field_type.of_type
+        return isinstance(field_type, GraphQLList)
+
+    def _list_size(self, coordinate, node):
+        arguments = {argument.name.value: argument.value for argument in node.arguments}
+        for name in PAGINATION_ARGUMENTS:
+            value = self._argument_value(arguments.get(name))
+            if isinstance(value, int):
+                return max(value, 0)
+
+        size = LIST_SIZES.get(coordinate, DEFAULT_LIST_SIZE)
+        for name, narrowed in NARROWED_LIST_SIZES.get(coordinate, {}).items():
+            if self._argument_value(arguments.get(name)) is not None:
+                size = narrowed if size is UNBOUNDED else min(size, narrowed)
+        return size
+
+    def _argument_value(self, value):
+        if isinstance(value, VariableNode):
+            return self.variables.get(value.name.value)
+        if isinstance(value, IntValueNode):
+            return int(value.value)
+        if value is not None:
+            return getattr(value, 'value', True)
+        return None
+
+    def _should_include(self, node):
+        for directive in node.directives or ():
+            if directive.name.value not in ('skip', 'include'):
+                continue
+            argument = next((a for a in directive.arguments if a.name.value == 'if'), None)
+            condition = self._argument_value(argument.value) if argument else None
+            if directive.name.value == 'skip' and condition is True:
+                return False
+            if directive.name.value == 'include' and condition is False:
+                return False
+        return True
+
+
+def analyze_operation_cost(schema, document, operation, variables=None):
+    """Cost and depth of ``operation`` checked against the configured ceilings"""
+    return CostAnalyzer(
+        schema, document, variables,
+        max_cost=getattr(settings, 'GRAPHQL_MAX_QUERY_COST', None),
+        max_depth=getattr(settings, 'GRAPHQL_MAX_QUERY_DEPTH', None),
+    ).analyze(operation)
+
+
+def cost_error(report):
+    if report.max_depth is not None and report.depth > report.max_depth:
+        message = f'Query depth {report.depth} exceeds the maximum of {report.max_depth}.'
+        code = 'QUERY_TOO_DEEP'
+    else:
+        message = (
+            f'Query cost {report.cost} exceeds the maximum of {report.max_cost}. '
+            'Add filters or pagination arguments to request less data.'
+        )
+        code = 'COST_LIMIT_EXCEEDED'
+    return GraphQLError(message, extensions={'code': code, 'cost': report.as_extension()})
+
+
+def get_client_key(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{request.META.get("REMOTE_ADDR", "")}'
+
+
+def charge_budget(client_key, cost, budget_per_minute):
+    """
+    Count ``cost`` against the client's budget for the current minute.
+
+    Returns False once the budget is spent. Uses the default cache, so with a
+    per-process cache backend the budget applies per worker.
+    """
+    if not budget_per_minute:
+        return True
+    key = f'graphql-cost-budget:{client_key}'
+    cache.add(key, 0, timeout=60)
+    try:
+        spent = cache.incr(key, cost)
+    except ValueError:
+        cache.set(key, cost, timeout=60)
+        spent = cost
+    return spent <= budget_per_minute
+
+
+def budget_error(budget_per_minute):
+    return GraphQLError(
+        f'Query cost budget of {budget_per_minute} per minute exhausted; retry later.',
+        extensions={'code': 'COST_BUDGET_EXCEEDED'},
+    )
+
+
+def log_cost(operation_name, report):
+    logger.info(
+        'graphql operation=%s cost=%s depth=%s',
+        operation_name or '<anonymous>', report.cost, report.depth,
+    )
@@ -0,0 +1,151 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+from graphql import (
+    FieldNode,
+    OperationDefinitionNode,
+    get_operation_ast,
+    parse,
+    validate,
+)
+from graphql.error import GraphQLError
+
+
+INTROSPECTION_FIELDS = {'__schema', '__type', '__typename'}
+
+
+def query_hash(query):
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+class LRUCache:
+    """A thread-safe, size-bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CachedDocument:
+    """The outcome of parsing and validating one query string"""
+
+    def __init__(self, document=None, errors=None):
+        self.document = document
+        self.errors = errors or []
+
+    def get_operation(self, operation_name):
+        if self.document is None:
+            return None
+        return get_operation_ast(self.document, operation_name)
+
+    def is_introspection(self, operation_name):
+        """True when every root field of the selected operation is an introspection field"""
+        operation = self.get_operation(operation_name)
+        if not isinstance(operation, OperationDefinitionNode) or operation.variable_definitions:
+            return False
+        return all(
+            isinstance(selection, FieldNode) and selection.name.value in INTROSPECTION_FIELDS
+            for selection in operation.selection_set.selections
+        )
+
+
+class DocumentCache:
+    """
+    Parsed and validated documents keyed by the sha256 of the query text.
+
+    Invalid documents are cached along with their errors so repeated bad
+    requests are rejected without re-parsing. Introspection results are kept
+    in a second cache since they only depend on the schema.
+    """
+
+    def __init__(self, schema, validation_rules=None, maxsize=256, max_errors=None):
+        self.schema = schema
+        self.validation_rules = validation_rules
+        self.max_errors = max_errors
+        self.documents = LRUCache(maxsize)
+        self.introspection = LRUCache(maxsize=16)
+
+    def get(self, query):
+        key = query_hash(query)
+        cached = self.documents.get(key)
+        if cached is None:
+            cached = self._build(query)
+            self.documents.set(key, cached)
+        return cached
+
+    def _build(self, query):
+        try:
+            document = parse(query)
+        except GraphQLError as e:
+            return CachedDocument(errors=[e])
+
+        errors = validate(self.schema, document, self.validation_rules, self.max_errors)
+        if errors:
+            return CachedDocument(errors=errors)
+        return CachedDocument(document)
+
+    def get_introspection_result(self, query, operation_name, execute):
+        """Run ``execute`` once per query text and operation, then serve the stored result"""
+        key = (query_hash(query), operation_name)
+        result = self.introspection.get(key)
+        if result is None:
+            result = execute()
+            if not result.errors:
+                self.introspection.set(key, result)
+        return result
+
+
+_caches = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def get_document_cache(schema, validation_rules=None, maxsize=256, max_errors=None):
+    """
+    Return the document cache for a schema build.
+
+    Caches are held per GraphQLSchema instance so that rebuilding the schema
+    (for example in tests) never serves documents validated against an old one.
+    """
+    with _caches_lock:
+        caches = _caches.setdefault(schema, {})
+        key = tuple(validation_rules) if validation_rules else None
+        if key not in caches:
+            caches[key] = DocumentCache(schema, validation_rules, maxsize, max_errors)
+        return caches[key]
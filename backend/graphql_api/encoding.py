@@ -0,0 +1,88 @@
+import gzip
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Suffixes added to an ETag for each compressed representation
+ETAG_SUFFIXES = {'br': '-br', 'gzip': '-gzip'}
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def dumps(data, pretty=False):
+    """
+    Serialize a GraphQL response body to UTF-8 JSON bytes.
+
+    Uses orjson when it is installed, which also writes datetimes, dates and
+    UUIDs natively; other values such as Decimal go through Django's encoder.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS if pretty else 0
+        return orjson.dumps(data, default=_django_encoder.default, option=option)
+
+    if pretty:
+        return json.dumps(
+            data, cls=DjangoJSONEncoder, sort_keys=True, indent=2, separators=(',', ': '),
+            ensure_ascii=False,
+        ).encode('utf-8')
+    return json.dumps(
+        data, cls=DjangoJSONEncoder, separators=(',', ':'), ensure_ascii=False
+    ).encode('utf-8')
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick the preferred supported encoding from an Accept-Encoding header"""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    candidates = [
+        coding for coding in available_encodings()
+        if accepted.get(coding, accepted.get('*', 0)) > 0
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda coding: accepted.get(coding, accepted.get('*', 0)))
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=GZIP_LEVEL)
+
+
+def strip_etag_suffix(etag):
+    for suffix in ETAG_SUFFIXES.values():
+        if etag.endswith(suffix + '"'):
+            return etag[:-len(suffix) - 1] + '"'
+    return etag
+
+
+def add_etag_suffix(etag, encoding):
+    return etag[:-1] + ETAG_SUFFIXES[encoding] + '"'
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from graphql import (
+    FieldNode,
+    TypeInfo,
+    TypeInfoVisitor,
+    VariableNode,
+    Visitor,
+    get_named_type,
+    is_composite_type,
+    visit,
+)
+
+from apps.organizations.models import Organization
+from .encoding import strip_etag_suffix
+
+
+# Cache hints by type or by field coordinate, in seconds. Fields without a
+# hint inherit from the type they return; root and object fields with no hint
+# at all are uncacheable, so the operation falls back to revalidation.
+CACHE_HINTS = {
+    'OrganizationType': 300,
+    'OrganizationType.projectCount': 0,
+    'OrganizationType.activeProjectCount': 0,
+    'OrganizationType.projectCompletionRate': 0,
+    'OrganizationType.canBeDeleted': 0,
+}
+
+# Fields whose data is not covered by organization data versions; operations
+# selecting them are never given an ETag.
+UNVERSIONED_FIELDS = {
+    'Query.job',
+}
+
+# Fields computed against the clock. Responses that include them get an ETag
+# that also changes every TIME_BUCKET seconds.
+TIME_DEPENDENT_FIELDS = {
+    'TaskType.isOverdue',
+    'ProjectType.isOverdue',
+    'TaskStatsType.overdueTasks',
+    'OrganizationStatsType.recentActivityCount',
+}
+TIME_BUCKET = 60
+
+# Root fields whose results belong to the organization named by an argument
+SCOPED_ROOT_ARGUMENTS = {
+    'organization': 'slug',
+    'projects': 'organizationSlug',
+    'tasks': 'organizationSlug',
+    'organizationStats': 'organizationSlug',
+    'projectStats': 'organizationSlug',
+    'taskStats': 'organizationSlug',
+    'activityFeed': 'organizationSlug',
+    'changesSince': 'organizationSlug',
+    'timeSeries': 'organizationSlug',
+}
+
+
+class CachePolicy:
+    """The combined cache hints of an operation"""
+
+    def __init__(self, max_age=0, time_dependent=False, versioned=True):
+        self.max_age = max_age
+        self.time_dependent = time_dependent
+        self.versioned = versioned
+
+    @property
+    def header(self):
+        if self.max_age > 0:
+            return f'private, max-age={self.max_age}'
+        return 'private, no-cache'
+
+
+class CacheHintVisitor(Visitor):
+    def __init__(self, type_info, root_type):
+        super().__init__()
+        self.type_info = type_info
+        self.root_type = root_type
+        self.max_age = None
+        self.time_dependent = False
+        self.versioned = True
+
+    def enter_field(self, node, *args):
+        parent_type = self.type_info.get_parent_type()
+        field = self.type_info.get_field_def()
+        if parent_type is None or field is None or node.name.value.startswith('__'):
+            return
+        coordinate = f'{parent_type.name}.{node.name.value}'
+        self.time_dependent = self.time_dependent or coordinate in TIME_DEPENDENT_FIELDS
+        self.versioned = self.versioned and coordinate not in UNVERSIONED_FIELDS
+
+        named_type = get_named_type(field.type)
+        if coordinate in CACHE_HINTS:
+            hint = CACHE_HINTS[coordinate]
+        elif is_composite_type(named_type) or parent_type is self.root_type:
+            hint = CACHE_HINTS.get(named_type.name, 0)
+        else:
+            return
+        self.max_age = hint if self.max_age is None else min(self.max_age, hint)
+
+
+def get_cache_policy(schema, document, operation):
+    """Combine the cache hints of every field ``operation`` can select"""
+    type_info = TypeInfo(schema)
+    visitor = CacheHintVisitor(type_info, schema.get_root_type(operation.operation))
+    visit(document, TypeInfoVisitor(type_info, visitor))
+    return CachePolicy(visitor.max_age or 0, visitor.time_dependent, visitor.versioned)
+
+
+def get_organization_scope(operation, variables):
+    """
+    Slugs of the organizations an operation reads, or None when any root
+    field can reach data outside a single named organization.
+    """
+    slugs = set()
+    for selection in operation.selection_set.selections:
+        if not isinstance(selection, FieldNode):
+            return None
+        if selection.name.value == '__typename':
+            continue
+        argument_name = SCOPED_ROOT_ARGUMENTS.get(selection.name.value)
+        argument = next(
+            (a for a in selection.arguments if a.name.value == argument_name), None
+        )
+        if argument is None:
+            return None
+        if isinstance(argument.value, VariableNode):
+            slug = (variables or {}).get(argument.value.name.value)
+        else:
+            slug = getattr(argument.value, 'value', None)
+        if not isinstance(slug, str):
+            return None
+        slugs.add(slug)
+    return slugs
+
+
+def get_data_versions(slugs=None):
+    """
+    Data versions of the given organizations, or of all of them.
+
+    Deleted organizations simply drop out of the list, which also changes it.
+    """
+    queryset = Organization.objects.order_by('id')
+    if slugs is not None:
+        queryset = queryset.filter(slug__in=slugs)
+    return list(queryset.values_list('id', 'data_version'))
+
+
+def compute_etag(query, operation_name, variables, data_versions, policy):
+    payload = json.dumps(
+        [query, operation_name, variables or {}, data_versions],
+        sort_keys=True, cls=DjangoJSONEncoder,
+    )
+    if policy.time_dependent:
+        payload += f'|{int(time.time() // TIME_BUCKET)}'
+    return '"{}"'.format(hashlib.sha256(payload.encode('utf-8')).hexdigest())
+
+
+def etag_matches(request, etag):
+    """
+    Return the If-None-Match entry that matches ``etag``, or None.
+
+    Entries may carry the suffix of a compressed representation of the same
+    response, in which case the client's tag is returned as sent.
+    """
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if header.strip() == '*':
+        return etag
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate and strip_etag_suffix(candidate) == etag:
+            return candidate
+    return None
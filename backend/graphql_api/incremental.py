@@ -0,0 +1,387 @@
+from copy import copy
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from graphql import (
+    DirectiveLocation,
+    DocumentNode,
+    ExecutionContext,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLArgument,
+    GraphQLBoolean,
+    GraphQLDirective,
+    GraphQLError,
+    GraphQLInt,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLString,
+    InlineFragmentNode,
+    SelectionSetNode,
+    get_named_type,
+    is_abstract_type,
+)
+from graphql.execution.collect_fields import collect_fields
+from graphql.execution.values import get_directive_values
+from graphql.pyutils import Path
+
+from .encoding import dumps
+
+
+GraphQLDeferDirective = GraphQLDirective(
+    name='defer',
+    description='Deliver this fragment in a later part of an incremental response.',
+    locations=[DirectiveLocation.FRAGMENT_SPREAD, DirectiveLocation.INLINE_FRAGMENT],
+    args={
+        'if': GraphQLArgument(GraphQLNonNull(GraphQLBoolean), default_value=True),
+        'label': GraphQLArgument(GraphQLString),
+    },
+)
+
+GraphQLStreamDirective = GraphQLDirective(
+    name='stream',
+    description='Deliver the first initialCount items now and the rest in later parts.',
+    locations=[DirectiveLocation.FIELD],
+    args={
+        'if': GraphQLArgument(GraphQLNonNull(GraphQLBoolean), default_value=True),
+        'label': GraphQLArgument(GraphQLString),
+        'initialCount': GraphQLArgument(GraphQLNonNull(GraphQLInt), default_value=0),
+    },
+)
+
+INCREMENTAL_DIRECTIVES = ('defer', 'stream')
+
+BOUNDARY = '-'
+CONTENT_TYPE = f'multipart/mixed; boundary="{BOUNDARY}"; deferSpec=20220824'
+PART_HEADER = f'\r\n--{BOUNDARY}\r\nContent-Type: application/json; charset=utf-8\r\n\r\n'.encode()
+CLOSING_DELIMITER = f'\r\n--{BOUNDARY}--\r\n'.encode()
+
+
+def accepts_multipart(request):
+    return 'multipart/mixed' in request.META.get('HTTP_ACCEPT', '')
+
+
+def response_key(field):
+    return field.alias.value if field.alias else field.name.value
+
+
+def replace(node, **changes):
+    node = copy(node)
+    for name, value in changes.items():
+        setattr(node, name, value)
+    return node
+
+
+def without_incremental_directives(node):
+    return tuple(d for d in node.directives or () if d.name.value not in INCREMENTAL_DIRECTIVES)
+
+
+def is_list_type(field_type):
+    while isinstance(field_type, GraphQLNonNull):
+        field_type = field_type.of_type
+    return isinstance(field_type, GraphQLList)
+
+
+class Deferred:
+    def __init__(self, label, path, fragment, parent_type):
+        self.label = label
+        self.path = path
+        self.fragment = fragment
+        self.parent_type = parent_type
+
+    @property
+    def keys(self):
+        return tuple(response_key(field) for field in self.path)
+
+
+class Stream:
+    def __init__(self, label, path, initial_count):
+        self.label = label
+        self.path = path
+        self.initial_count = initial_count
+
+    @property
+    def keys(self):
+        return tuple(response_key(field) for field in self.path)
+
+
+class IncrementalPlan:
+    """
+    Split an operation into an initial part and the parts delivered later.
+
+    graphql-core 3.2 cannot execute ``@defer``/``@stream`` itself, so active
+    deferred fragments are pruned from the initial document and each one is
+    later executed on the objects the initial execution resolved for its
+    parent field. Streamed lists are resolved whole by the initial execution
+    and sent in slices. Named fragments are inlined first so paths are
+    unambiguous.
+
+    Only the outermost directive on a path is honoured; ``@defer`` or
+    ``@stream`` nested inside a deferred fragment, a streamed field or a list
+    under a streamed field is delivered with its parent, which the incremental
+    delivery spec allows, and so is ``@defer`` under a field of interface or
+    union type. ``@stream`` is only honoured on lists that are not themselves
+    inside a list.
+    """
+
+    def __init__(self, schema, document, operation, variables=None):
+        self.schema = schema
+        self.operation = operation
+        self.variables = variables or {}
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+        self.deferred = []
+        self.streams = []
+
+        selection_set = self._selection_set(
+            operation.selection_set, schema.get_root_type(operation.operation), (), False, False, False
+        )
+        self.initial_document = self.build_document(selection_set.selections)
+
+    def __bool__(self):
+        return bool(self.deferred or self.streams)
+
+    def build_document(self, selections):
+        operation = replace(self.operation, selection_set=SelectionSetNode(selections=tuple(selections)))
+        return DocumentNode(definitions=(operation,))
+
+    def _directive(self, directive, node):
+        values = get_directive_values(directive, node, self.variables)
+        if values is None or not values['if']:
+            return None
+        return values
+
+    def _selection_set(self, selection_set, parent_type, path, in_list, inline_only, abstract):
+        selections = []
+        for selection in selection_set.selections:
+            if isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments[selection.name.value]
+                selection = InlineFragmentNode(
+                    type_condition=fragment.type_condition,
+                    directives=selection.directives,
+                    selection_set=fragment.selection_set,
+                )
+
+            if isinstance(selection, InlineFragmentNode):
+                fragment_type = (
+                    self.schema.get_type(selection.type_condition.name.value)
+                    if selection.type_condition else parent_type
+                )
+                defer = None if inline_only or abstract else self._directive(GraphQLDeferDirective, selection)
+                fragment = replace(
+                    selection,
+                    directives=without_incremental_directives(selection),
+                    selection_set=self._selection_set(
+                        selection.selection_set, fragment_type, path, in_list,
+                        inline_only or defer is not None, abstract,
+                    ),
+                )
+                if defer is not None:
+                    self.deferred.append(Deferred(defer.get('label'), path, fragment, parent_type))
+                else:
+                    selections.append(fragment)
+                continue
+
+            field_def = getattr(parent_type, 'fields', {}).get(selection.name.value)
+            if selection.selection_set is None or field_def is None:
+                selections.append(replace(selection, directives=without_incremental_directives(selection)))
+                continue
+
+            is_list = is_list_type(field_def.type)
+            stream = None
+            if is_list and not in_list and not inline_only:
+                stream = self._directive(GraphQLStreamDirective, selection)
+
+            field = replace(selection, directives=without_incremental_directives(selection))
+            field_type = get_named_type(field_def.type)
+            field.selection_set = self._selection_set(
+                selection.selection_set, field_type, path + (field,),
+                in_list or is_list, inline_only or stream is not None, is_abstract_type(field_type),
+            )
+            if stream is not None:
+                self.streams.append(Stream(stream.get('label'), path + (field,), max(stream['initialCount'], 0)))
+            selections.append(field)
+        return SelectionSetNode(selections=tuple(selections))
+
+
+class ParentCapture:
+    """
+    Keep the objects resolved for the parent fields of deferred fragments,
+    so each fragment runs on them later instead of resolving the path that
+    leads to it again. Lists are materialized here so they are read once.
+    """
+
+    def __init__(self, paths):
+        self.paths = set(paths)
+        self.resolved = {}
+
+    def resolve(self, next, root, info, **args):
+        result = next(root, info, **args)
+        path = tuple(info.path.as_list())
+        if result is None or tuple(key for key in path if isinstance(key, str)) not in self.paths:
+            return result
+        if is_list_type(info.return_type):
+            result = list(result)
+        self.resolved[path] = result
+        return result
+
+    def parents(self, keys):
+        """``(path, object)`` for every object resolved at ``keys``, expanding lists"""
+        for path, value in self.resolved.items():
+            if tuple(key for key in path if isinstance(key, str)) == keys:
+                yield from expand(path, value)
+
+
+class DeferredExecutionContext(ExecutionContext):
+    """
+    Execute an operation whose selection set is a deferred fragment on each
+    of ``parents``, ``(path, object)`` pairs of type ``parent_type``, or on
+    the root value when ``parents`` is None. The data is a dict of the
+    fragment's result for each path.
+    """
+
+    parent_type = None
+    parents = None
+
+    @classmethod
+    def on(cls, parent_type, parents):
+        return type(cls.__name__, (cls,), {'parent_type': parent_type, 'parents': parents})
+
+    def execute_operation(self, operation, root_value):
+        fields = collect_fields(
+            self.schema, self.fragments, self.variable_values, self.parent_type, operation.selection_set
+        )
+        data = {}
+        for path, source in [((), root_value)] if self.parents is None else self.parents:
+            graphql_path = None
+            for key in path:
+                graphql_path = Path(graphql_path, key, None)
+            try:
+                data[path] = self.execute_fields(self.parent_type, source, graphql_path, fields)
+            except GraphQLError as error:
+                # A non-null field failed, which only nulls this object's part
+                self.errors.append(error)
+                data[path] = None
+        return data
+
+
+def expand(path, value):
+    if isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from expand(path + (index,), item)
+    elif value is not None:
+        yield path, value
+
+
+def get_path(data, keys, path=()):
+    """Yield ``(path, value)`` for every value at ``keys``, expanding lists"""
+    if isinstance(data, list):
+        for index, item in enumerate(data):
+            yield from get_path(item, keys, path + (index,))
+        return
+    if not keys:
+        if data is not None:
+            yield path, data
+        return
+    if isinstance(data, dict):
+        yield from get_path(data.get(keys[0]), keys[1:], path + (keys[0],))
+
+
+def split_list(data, keys, count):
+    """
+    Cut the list at ``keys`` after ``count`` items and return the rest, or
+    None when there is no list; no field along the way may be a list.
+    """
+    parent = next(get_path(data, keys[:-1]), (None, None))[1]
+    value = parent.get(keys[-1]) if isinstance(parent, dict) else None
+    if not isinstance(value, list):
+        return None
+    parent[keys[-1]] = value[:count]
+    return value[count:]
+
+
+class IncrementalExecution:
+    """Execute an :class:`IncrementalPlan` and stream it as multipart/mixed"""
+
+    def __init__(self, view, request, plan, variables, operation_name):
+        self.view = view
+        self.request = request
+        self.plan = plan
+        self.variables = variables
+        self.operation_name = operation_name
+        self.batch_size = max(getattr(settings, 'GRAPHQL_STREAM_BATCH_SIZE', 50), 1)
+        self.capture = ParentCapture(deferred.keys for deferred in plan.deferred if deferred.path)
+        self.streamed = []
+
+    def execute(self, document, extra_middleware=None, execution_context_class=None):
+        operation = document.definitions[0]
+        return self.view.execute_document(
+            self.request, document, operation, self.variables, self.operation_name,
+            extra_middleware=extra_middleware, execution_context_class=execution_context_class,
+        )
+
+    def execute_initial(self):
+        """
+        Run the initial document, keeping the parents of deferred fragments
+        and the streamed items past ``initialCount``. Streamed lists are read
+        in this one execution, so later parts are consistent with it and cost
+        no further queries.
+        """
+        result = self.execute(self.plan.initial_document, [self.capture])
+        for stream in self.plan.streams:
+            rest = split_list(result.data, stream.keys, stream.initial_count)
+            if rest:
+                self.streamed.append((stream, rest))
+        return result
+
+    def format_errors(self, result):
+        return [self.view.format_error(e) for e in result.errors or ()]
+
+    def subsequent_payloads(self):
+        for deferred in self.plan.deferred:
+            parents = list(self.capture.parents(deferred.keys)) if deferred.path else None
+            if parents == []:
+                continue
+            result = self.execute(
+                self.plan.build_document((deferred.fragment,)),
+                execution_context_class=DeferredExecutionContext.on(deferred.parent_type, parents),
+            )
+            errors = self.format_errors(result)
+            for path in [()] if parents is None else [path for path, _ in parents]:
+                payload = {'data': (result.data or {}).get(path), 'path': list(path)}
+                if deferred.label:
+                    payload['label'] = deferred.label
+                if errors:
+                    payload['errors'] = errors
+                    errors = None
+                yield payload
+
+        for stream, rest in self.streamed:
+            for start in range(0, len(rest), self.batch_size):
+                payload = {
+                    'items': rest[start:start + self.batch_size],
+                    'path': [*stream.keys, stream.initial_count + start],
+                }
+                if stream.label:
+                    payload['label'] = stream.label
+                yield payload
+
+    def stream(self, initial_content):
+        yield PART_HEADER + initial_content
+        for payload in self.subsequent_payloads():
+            yield PART_HEADER + dumps({'incremental': [payload], 'hasNext': True})
+        yield PART_HEADER + dumps({'hasNext': False}) + CLOSING_DELIMITER
+
+    def response(self, initial_content):
+        response = StreamingHttpResponse(self.stream(initial_content), content_type=CONTENT_TYPE)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+def plan_incremental_delivery(schema, document, operation, variables):
+    """Return the plan for an operation using ``@defer``/``@stream``, or None"""
+    plan = IncrementalPlan(schema, document, operation, variables)
+    return plan if plan else None
@@ -0,0 +1,76 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.organizations.models import Organization
+from benchmarks.explain import (
+    DEFAULT_ESTIMATE_FACTOR,
+    DEFAULT_MIN_ROWS,
+    ExplainRunner,
+    capture_operation,
+    read_query_log,
+)
+from benchmarks.operations import get_operations, load_fixture
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the benchmark operations, or a captured query log, under EXPLAIN (ANALYZE, BUFFERS) '
+        'and report sequential scans, sort spills and row-estimate errors per resolver'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organization', help='Organization slug to run against')
+        parser.add_argument('--operation', action='append', dest='operations',
+                            help='Only explain the named benchmark operation (repeatable)')
+        parser.add_argument('--log', help='Explain the queries in this JSON-lines query log instead')
+        parser.add_argument('--min-rows', type=int, default=DEFAULT_MIN_ROWS,
+                            help='Ignore sequential scans over fewer rows')
+        parser.add_argument('--estimate-factor', type=float, default=DEFAULT_ESTIMATE_FACTOR,
+                            help='Report row estimates off by at least this factor')
+        parser.add_argument('--no-timing', action='store_true',
+                            help='Leave execution times out so reports diff cleanly')
+        parser.add_argument('--output', help='Write the JSON report to this path instead of stdout')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('explain_operations needs PostgreSQL')
+
+        if options['log']:
+            queries = read_query_log(options['log'])
+        else:
+            try:
+                operations = get_operations(options['operations'])
+                fixture = load_fixture(options['organization'])
+                queries = [query for operation in operations for query in capture_operation(operation, fixture)]
+            except (ValueError, Organization.DoesNotExist) as e:
+                raise CommandError(str(e))
+
+        runner = ExplainRunner(options['min_rows'], options['estimate_factor'], timing=not options['no_timing'])
+        report = runner.run(queries)
+        output = json.dumps(report, indent=2, sort_keys=True, default=str)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(f'Report written to {options["output"]}')
+        else:
+            self.stdout.write(output)
+
+        # Migrations written without the model change would be undone by the
+        # next makemigrations, so only the Meta.indexes entries are printed
+        if report['meta_indexes']:
+            self.stderr.write(
+                "Add the proposed indexes to the models' Meta.indexes, then run makemigrations:"
+            )
+            for label, entries in report['meta_indexes'].items():
+                self.stderr.write(f'  {label}:')
+                for entry in entries:
+                    self.stderr.write(f'    {entry},')
+
+        findings = sum(len(query.get('findings', ())) for query in report['queries'])
+        self.stderr.write(
+            f'{len(report["queries"])} statements explained, {findings} findings, '
+            f'{len(report["proposed_indexes"])} proposed indexes'
+        )
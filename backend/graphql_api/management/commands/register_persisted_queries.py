@@ -0,0 +1,85 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from graphql import FieldNode, NameNode, OperationDefinitionNode, SelectionSetNode, Visitor, print_ast, visit
+
+from benchmarks.documents import extract_documents
+from graphql_api.persisted_queries import store
+
+
+TYPENAME_FIELD = FieldNode(name=NameNode(value='__typename'), directives=(), arguments=())
+
+
+class AddTypename(Visitor):
+    """Mirror Apollo Client's addTypenameToDocument so hashes match what the browser sends"""
+
+    def enter_selection_set(self, node, key, parent, path, ancestors):
+        if isinstance(parent, OperationDefinitionNode):
+            return None
+        if any(
+            isinstance(selection, FieldNode) and selection.name.value.startswith('__')
+            for selection in node.selections
+        ):
+            return None
+        if isinstance(parent, FieldNode) and any(d.name.value == 'export' for d in parent.directives or ()):
+            return None
+        return SelectionSetNode(selections=(*node.selections, TYPENAME_FIELD))
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-register persisted queries from an Apollo persisted query manifest, or from the '
+        "frontend's gql documents. Registered operations are allowlisted for strict mode."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--manifest',
+            help='Path to a manifest produced by @apollo/generate-persisted-query-manifest'
+        )
+        parser.add_argument(
+            '--no-typename', action='store_true',
+            help='Hash frontend documents as written instead of with __typename added'
+        )
+        parser.add_argument(
+            '--no-allowlist', action='store_true',
+            help='Register without allowing the operations in strict mode'
+        )
+
+    def handle(self, *args, **options):
+        if options['manifest']:
+            operations = self.read_manifest(options['manifest'])
+        else:
+            operations = self.read_frontend(add_typename=not options['no_typename'])
+
+        created_count = 0
+        for name, query in operations:
+            persisted, created = store.register(query, name, allowlisted=not options['no_allowlist'])
+            created_count += created
+            self.stdout.write(f'{persisted.sha256_hash}  {name}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Registered {len(operations)} operations ({created_count} new)'
+        ))
+
+    def read_manifest(self, path):
+        try:
+            with open(path) as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read manifest: {e}')
+        if manifest.get('format') != 'apollo-persisted-query-manifest':
+            raise CommandError('Not an Apollo persisted query manifest')
+        return [(operation['name'], operation['body']) for operation in manifest['operations']]
+
+    def read_frontend(self, add_typename=True):
+        operations = []
+        for document in extract_documents():
+            if not document.is_valid:
+                self.stdout.write(self.style.WARNING(
+                    f'Skipping {document.operation_name}: {document.errors[0]}'
+                ))
+                continue
+            ast = visit(document.document, AddTypename()) if add_typename else document.document
+            operations.append((document.operation_name, print_ast(ast)))
+        return operations
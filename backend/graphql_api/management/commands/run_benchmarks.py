@@ -0,0 +1,67 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.organizations.models import Organization
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskComment
+from benchmarks.operations import get_operations, load_fixture
+from benchmarks.runner import (
+    BenchmarkError,
+    BenchmarkRunner,
+    compare_reports,
+    load_report,
+    save_report,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the hot GraphQL operations and optionally diff against a saved baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organization', help='Organization slug to run against')
+        parser.add_argument('--operation', action='append', dest='operations',
+                            help='Only run the named operation (repeatable)')
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--output', help='Write the JSON report to this path')
+        parser.add_argument('--compare', help='Baseline JSON report to diff against')
+        parser.add_argument('--threshold', type=float, default=10.0,
+                            help='Allowed p95 growth in percent before flagging a regression')
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        try:
+            operations = get_operations(options['operations'])
+            fixture = load_fixture(options['organization'])
+        except (ValueError, Organization.DoesNotExist) as e:
+            raise CommandError(str(e))
+
+        dataset = {
+            'organizations': Organization.objects.count(),
+            'projects': Project.objects.count(),
+            'tasks': Task.objects.count(),
+            'comments': TaskComment.objects.count(),
+        }
+        self.stdout.write(f'Dataset: {dataset}')
+
+        runner = BenchmarkRunner(fixture, iterations=options['iterations'], warmup=options['warmup'])
+        try:
+            report = runner.run(operations, dataset=dataset, log=self.stdout.write)
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            path = save_report(report, options['output'])
+            self.stdout.write(f'Report written to {path}')
+
+        if options['compare']:
+            comparison = compare_reports(load_report(options['compare']), report, options['threshold'])
+            self.stdout.write(json.dumps(comparison, indent=2))
+            regressed = [name for name, diff in comparison.items() if diff['regressions']]
+            if regressed:
+                self.stdout.write(self.style.WARNING(f'Regressions: {", ".join(regressed)}'))
+                if options['fail_on_regression']:
+                    raise CommandError('Benchmark regressions detected')
+            else:
+                self.stdout.write(self.style.SUCCESS('No regressions'))
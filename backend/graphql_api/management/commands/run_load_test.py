@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.documents import extract_documents
+from benchmarks.load import LoadError, LoadHarness, LocalServer, discover_fixture
+from benchmarks.runner import save_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the frontend's GraphQL operations against a server with a configurable "
+        'read/write mix and concurrency. Mutations write real rows to the target database.'
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--url', help='GraphQL endpoint of an already running server')
+        target.add_argument('--start-server', action='store_true',
+                            help='Start manage.py runserver on a free port for the run')
+        parser.add_argument('--server-arg', action='append', dest='server_args', default=[],
+                            help='Extra argument for runserver, e.g. --server-arg=--nothreading')
+        parser.add_argument('--organization', help='Organization slug to target')
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--write-ratio', type=float, default=0.1)
+        parser.add_argument('--duration', type=float, help='Run for this many seconds')
+        parser.add_argument('--requests', type=int, help='Stop after this many requests')
+        parser.add_argument('--weight', action='append', default=[],
+                            help='Override an operation weight, e.g. --weight GetTasks=10')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report to this path')
+
+    def handle(self, *args, **options):
+        if not 0 <= options['write_ratio'] <= 1:
+            raise CommandError('--write-ratio must be between 0 and 1')
+        if options['duration'] is None and options['requests'] is None:
+            options['duration'] = 30
+
+        weights = {}
+        for item in options['weight']:
+            name, _, value = item.partition('=')
+            try:
+                weights[name] = float(value)
+            except ValueError:
+                raise CommandError(f'Invalid weight "{item}"')
+
+        documents = extract_documents()
+        try:
+            if options['start_server']:
+                with LocalServer(extra_args=options['server_args']) as server:
+                    report = self.run(server.url, documents, weights, options)
+            else:
+                report = self.run(options['url'], documents, weights, options)
+        except (LoadError, OSError) as e:
+            raise CommandError(str(e))
+
+        for name, reason in report['meta']['skipped'].items():
+            self.stdout.write(self.style.WARNING(f'Skipped {name}: {reason}'))
+        for name, result in report['operations'].items():
+            self.stdout.write(
+                f'{name:<22} n={result["requests"]:>6} err={result["errors"]:>4} '
+                f'{result["throughput_rps"]:>8.1f}/s p50={result["p50_ms"]:>8.2f}ms '
+                f'p95={result["p95_ms"]:>8.2f}ms p99={result["p99_ms"]:>8.2f}ms'
+            )
+        self.stdout.write(self.style.SUCCESS(json.dumps(report['totals'])))
+
+        if options['output']:
+            self.stdout.write(f'Report written to {save_report(report, options["output"])}')
+
+    def run(self, url, documents, weights, options):
+        fixture = asyncio.run(discover_fixture(url, options['organization']))
+        harness = LoadHarness(
+            url,
+            documents,
+            fixture,
+            concurrency=options['concurrency'],
+            write_ratio=options['write_ratio'],
+            duration=options['duration'],
+            total_requests=options['requests'],
+            seed=options['seed'],
+            weights=weights,
+        )
+        self.stdout.write(
+            f'Running {len(harness.reads)} read and {len(harness.writes)} write operations '
+            f'against {url} with {options["concurrency"]} connections'
+        )
+        return asyncio.run(harness.run())
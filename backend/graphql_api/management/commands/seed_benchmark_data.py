@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks.datasets import SCALES, clear_dataset, get_scale, seed_dataset
+
+
+class Command(BaseCommand):
+    help = 'Seed reproducible benchmark tenants at a given scale using bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+        parser.add_argument('--organizations', type=int)
+        parser.add_argument('--projects-per-organization', type=int)
+        parser.add_argument('--tasks-per-project', type=int)
+        parser.add_argument('--comments-per-task', type=int)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Remove previously seeded benchmark organizations first'
+        )
+
+    def handle(self, *args, **options):
+        scale = get_scale(
+            options['scale'],
+            organizations=options['organizations'],
+            projects_per_organization=options['projects_per_organization'],
+            tasks_per_project=options['tasks_per_project'],
+            comments_per_task=options['comments_per_task'],
+        )
+
+        if options['clear']:
+            clear_dataset()
+            self.stdout.write('Removed existing benchmark data')
+
+        self.stdout.write(f'Seeding {scale}')
+        totals = seed_dataset(
+            scale,
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            'Created {organizations} organizations, {projects} projects, '
+            '{tasks} tasks and {comments} comments'.format(**totals)
+        ))
@@ -114,7 +114,8 @@ class PermissionMiddleware:
     def _check_query_permissions(self, field_name, request, args):
         protected_queries = [
             'organization', 'organizations', 'projects', 'tasks', 
-            'task_comments', 'organization_stats', 'project_stats', 'task_stats'
+            'task_comments', 'organization_stats', 'project_stats', 'task_stats',
+            'activity_feed', 'changes_since', 'time_series'
         ]
         
         if field_name in protected_queries:
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-19 08:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersistedQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256_hash', models.CharField(max_length=64, unique=True)),
+                ('query', models.TextField()),
+                ('operation_name', models.CharField(blank=True, max_length=200)),
+                ('is_allowlisted', models.BooleanField(default=False, help_text='Pre-registered operations are the only ones allowed in strict mode.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'graphql_persisted_queries',
+                'ordering': ['operation_name', 'sha256_hash'],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.23 on 2026-10-19 08:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graphql_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('operation_name', models.CharField(blank=True, max_length=200)),
+                ('organization_slug', models.SlugField(blank=True, max_length=100)),
+                ('profiler', models.CharField(choices=[('sampling', 'Sampling (collapsed stacks)'), ('deterministic', 'Deterministic (pstats)')], max_length=20)),
+                ('trigger', models.CharField(choices=[('header', 'Staff header'), ('sampled', 'Sampling rate')], max_length=10)),
+                ('duration_ms', models.FloatField()),
+                ('samples', models.PositiveIntegerField(blank=True, null=True)),
+                ('data', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'graphql_request_profiles',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['operation_name', '-created_at'], name='graphql_req_operati_d196a2_idx'), models.Index(fields=['organization_slug', '-created_at'], name='graphql_req_organiz_4b07d6_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.db import models
+
+from .profiling import PROFILERS
+
+
+class PersistedQuery(models.Model):
+    """Query text stored under the sha256 hash clients send instead of the full document"""
+
+    sha256_hash = models.CharField(max_length=64, unique=True)
+    query = models.TextField()
+    operation_name = models.CharField(max_length=200, blank=True)
+    is_allowlisted = models.BooleanField(
+        default=False,
+        help_text='Pre-registered operations are the only ones allowed in strict mode.'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'graphql_persisted_queries'
+        ordering = ['operation_name', 'sha256_hash']
+
+    def __str__(self):
+        return self.operation_name or self.sha256_hash
+
+
+class RequestProfile(models.Model):
+    """A profile of one GraphQL request, downloadable from the admin"""
+
+    PROFILER_CHOICES = [
+        ('sampling', 'Sampling (collapsed stacks)'),
+        ('deterministic', 'Deterministic (pstats)'),
+    ]
+    TRIGGER_CHOICES = [
+        ('header', 'Staff header'),
+        ('sampled', 'Sampling rate'),
+    ]
+
+    operation_name = models.CharField(max_length=200, blank=True)
+    organization_slug = models.SlugField(max_length=100, blank=True)
+    profiler = models.CharField(max_length=20, choices=PROFILER_CHOICES)
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES)
+    duration_ms = models.FloatField()
+    samples = models.PositiveIntegerField(null=True, blank=True)
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'graphql_request_profiles'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['operation_name', '-created_at']),
+            models.Index(fields=['organization_slug', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.operation_name or "<anonymous>"} ({self.created_at:%Y-%m-%d %H:%M:%S})'
+
+    @property
+    def filename(self):
+        extension = PROFILERS[self.profiler].extension
+        return f'{self.operation_name or "anonymous"}-{self.pk}.{extension}'
+
+    @classmethod
+    def record(cls, **fields):
+        """Store a profile, keeping only the newest GRAPHQL_PROFILE_KEEP"""
+        profile = cls.objects.create(**fields)
+        keep = getattr(settings, 'GRAPHQL_PROFILE_KEEP', 500)
+        stale = cls.objects.order_by('-created_at', '-id').values_list('id', flat=True)[keep:]
+        cls.objects.filter(id__in=list(stale)).delete()
+        return profile
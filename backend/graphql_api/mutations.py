@@ -4,7 +4,8 @@ from django.core.exceptions import ValidationError
 from apps.organizations.models import Organization
 from apps.projects.models import Project
 from apps.tasks.models import Task, TaskComment
-from .types import OrganizationType, ProjectType, TaskType, TaskCommentType
+from apps.projects.jobs import delete_project
+from .types import OrganizationType, ProjectType, TaskType, TaskCommentType, JobType
 
 
 class ProjectInput(graphene.InputObjectType):
@@ -155,15 +156,19 @@ class DeleteProject(graphene.Mutation):
     
     success = graphene.Boolean()
     errors = graphene.List(graphene.String)
+    job = graphene.Field(JobType)
     
     def mutate(self, info, id):
         try:
             project = Project.objects.get(id=id)
-            project.delete()
+            
+            # Hidden right away; its tasks and comments are purged by a worker
+            project.soft_delete()
             
             return DeleteProject(
                 success=True,
-                errors=[]
+                errors=[],
+                job=delete_project.enqueue(project_id=project.id)
             )
             
         except Project.DoesNotExist:
@@ -240,7 +245,7 @@ class UpdateTask(graphene.Mutation):
     
     def mutate(self, info, id, input):
         try:
-            task = Task.objects.get(id=id)
+            task = Task.objects.visible().get(id=id)
             
             if hasattr(input, 'title') and input.title is not None:
                 task.title = input.title
@@ -293,7 +298,7 @@ class DeleteTask(graphene.Mutation):
     
     def mutate(self, info, id):
         try:
-            task = Task.objects.get(id=id)
+            task = Task.objects.visible().get(id=id)
             task.delete()
             
             return DeleteTask(
@@ -323,7 +328,7 @@ class CreateTaskComment(graphene.Mutation):
     
     def mutate(self, info, input):
         try:
-            task = Task.objects.get(id=input.task_id)
+            task = Task.objects.visible().get(id=input.task_id)
             
             comment = TaskComment(
                 task=task,
@@ -371,7 +376,7 @@ class UpdateTaskComment(graphene.Mutation):
     
     def mutate(self, info, id, content):
         try:
-            comment = TaskComment.objects.get(id=id)
+            comment = TaskComment.objects.visible().get(id=id)
             comment.content = content
             
             comment.full_clean()
@@ -412,7 +417,7 @@ class DeleteTaskComment(graphene.Mutation):
     
     def mutate(self, info, id):
         try:
-            comment = TaskComment.objects.get(id=id)
+            comment = TaskComment.objects.visible().get(id=id)
             comment.delete()
             
             return DeleteTaskComment(
@@ -0,0 +1,97 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.functional import cached_property
+from graphql.error import GraphQLError
+
+
+# Upper bound on the page sizes clients can ask for
+MAX_PAGE_SIZE = 100
+
+
+def page_size(first):
+    """``first`` clamped to 1..MAX_PAGE_SIZE"""
+    return max(1, min(first, MAX_PAGE_SIZE))
+
+
+def encode_cursor(values):
+    """
+    Opaque cursor for a row's values of the ordering columns. Datetimes keep
+    their microseconds, which DjangoJSONEncoder would drop.
+    """
+    payload = json.dumps(list(values), default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor, length):
+    """Values encoded by ``encode_cursor``; ``length`` is how many to expect"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != length:
+        raise GraphQLError('Invalid cursor', extensions={'code': 'INVALID_CURSOR'})
+    return values
+
+
+def keyset_filter(ordering, values):
+    """
+    Rows after the one whose ordering columns hold ``values``.
+
+    ``ordering`` is a list of ``(lookup, descending)`` pairs, ending with a
+    unique column so the order is total. The redundant bound on the first
+    column lets PostgreSQL range-scan indexes and prune partitions.
+    """
+    after = Q()
+    for index in reversed(range(len(ordering))):
+        lookup, descending = ordering[index]
+        beyond = Q(**{f'{lookup}__{"lt" if descending else "gt"}': values[index]})
+        if index < len(ordering) - 1:
+            beyond |= Q(**{lookup: values[index]}) & after
+        after = beyond
+    lookup, descending = ordering[0]
+    return Q(**{f'{lookup}__{"lte" if descending else "gte"}': values[0]}) & after
+
+
+class KeysetPage:
+    """
+    Up to ``first`` rows of ``queryset`` after the ``after`` cursor, in
+    ``ordering`` (see ``keyset_filter``). Nothing is queried until the rows or
+    ``total_count`` are read, and each is queried at most once.
+    """
+
+    def __init__(self, queryset, ordering, first, after=None, wrap=None):
+        self.queryset = queryset
+        self.ordering = ordering
+        self.first = first
+        self.after = decode_cursor(after, len(ordering)) if after else None
+        self.wrap = wrap
+
+    @cached_property
+    def total_count(self):
+        return self.queryset.count()
+
+    @cached_property
+    def _rows(self):
+        queryset = self.queryset
+        if self.after is not None:
+            queryset = queryset.filter(keyset_filter(self.ordering, self.after))
+        order_by = [f'-{lookup}' if descending else lookup for lookup, descending in self.ordering]
+        return list(queryset.order_by(*order_by)[:self.first + 1])
+
+    @property
+    def items(self):
+        rows = self._rows[:self.first]
+        return [self.wrap(row) for row in rows] if self.wrap else rows
+
+    @property
+    def has_more(self):
+        return len(self._rows) > self.first
+
+    @property
+    def end_cursor(self):
+        rows = self._rows[:self.first]
+        if not rows:
+            return None
+        return encode_cursor(getattr(rows[-1], lookup) for lookup, _ in self.ordering)
@@ -0,0 +1,147 @@
+import json
+
+from django.conf import settings
+from django.db import IntegrityError
+
+from .document_cache import LRUCache, query_hash
+from .models import PersistedQuery
+
+
+class PersistedQueryError(Exception):
+    """An automatic persisted query failure reported to the client as a GraphQL error"""
+
+    def __init__(self, message, code, status_code=200):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.status_code = status_code
+
+    @property
+    def formatted(self):
+        return {'message': self.message, 'extensions': {'code': self.code}}
+
+
+class PersistedQueryStore:
+    """
+    Persisted query texts in the database, fronted by a per-process LRU.
+
+    Entries map a sha256 hash to ``(query, is_allowlisted)``.
+    """
+
+    def __init__(self, maxsize=1000):
+        self.memory = LRUCache(maxsize)
+
+    def get(self, sha256_hash):
+        entry = self.memory.get(sha256_hash)
+        if entry is None:
+            row = PersistedQuery.objects.filter(sha256_hash=sha256_hash).values_list(
+                'query', 'is_allowlisted'
+            ).first()
+            if row is None:
+                return None
+            entry = tuple(row)
+            self.memory.set(sha256_hash, entry)
+        return entry
+
+    def register(self, query, operation_name='', allowlisted=False):
+        sha256_hash = query_hash(query)
+        try:
+            persisted, created = PersistedQuery.objects.get_or_create(
+                sha256_hash=sha256_hash,
+                defaults={
+                    'query': query,
+                    'operation_name': operation_name or '',
+                    'is_allowlisted': allowlisted,
+                },
+            )
+        except IntegrityError:
+            persisted, created = PersistedQuery.objects.get(sha256_hash=sha256_hash), False
+
+        if allowlisted and not persisted.is_allowlisted:
+            PersistedQuery.objects.filter(pk=persisted.pk).update(is_allowlisted=True)
+            persisted.is_allowlisted = True
+
+        self.memory.set(sha256_hash, (persisted.query, persisted.is_allowlisted))
+        return persisted, created
+
+
+store = PersistedQueryStore(getattr(settings, 'GRAPHQL_PERSISTED_QUERY_CACHE_SIZE', 1000))
+
+
+def get_persisted_query_extension(request, data):
+    """Return the ``persistedQuery`` extension of a GET or POST request, if any"""
+    extensions = request.GET.get('extensions') or data.get('extensions')
+    if not extensions:
+        return None
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            raise PersistedQueryError('Extensions are invalid JSON.', 'BAD_REQUEST', 400)
+    if not isinstance(extensions, dict):
+        return None
+    return extensions.get('persistedQuery')
+
+
+def resolve_persisted_query(request, data, strict=False):
+    """
+    Apply the Apollo automatic persisted query protocol to request ``data``.
+
+    A hash-only request is answered from the store or rejected with
+    ``PERSISTED_QUERY_NOT_FOUND`` so the client retries with the full text.
+    In strict mode only allowlisted operations run and nothing is registered
+    automatically.
+
+    Returns the request data with ``query`` filled in, and whether the query
+    text is new and short enough to be registered once it has parsed and
+    validated (see ``register_persisted_query``).
+    """
+    extension = get_persisted_query_extension(request, data)
+    query = request.GET.get('query') or data.get('query')
+
+    if extension is None:
+        if strict and query:
+            entry = store.get(query_hash(query))
+            if entry is None or not entry[1]:
+                raise PersistedQueryError(
+                    'Only pre-registered operations are allowed.', 'PERSISTED_QUERY_NOT_ALLOWED', 400
+                )
+        return data, False
+
+    if extension.get('version') != 1:
+        raise PersistedQueryError('Unsupported persisted query version.', 'PERSISTED_QUERY_NOT_SUPPORTED', 400)
+
+    sha256_hash = extension.get('sha256Hash')
+    if not isinstance(sha256_hash, str):
+        raise PersistedQueryError('Persisted query hash is missing.', 'BAD_REQUEST', 400)
+
+    if query:
+        if query_hash(query) != sha256_hash:
+            raise PersistedQueryError('provided sha does not match query', 'BAD_REQUEST', 400)
+        if strict:
+            entry = store.get(sha256_hash)
+            if entry is None or not entry[1]:
+                raise PersistedQueryError(
+                    'Only pre-registered operations are allowed.', 'PERSISTED_QUERY_NOT_ALLOWED', 400
+                )
+            return data, False
+        register = (
+            len(query) <= settings.GRAPHQL_PERSISTED_QUERY_MAX_LENGTH and store.get(sha256_hash) is None
+        )
+        return data, register
+
+    entry = store.get(sha256_hash)
+    if entry is None or (strict and not entry[1]):
+        raise PersistedQueryError('PersistedQueryNotFound', 'PERSISTED_QUERY_NOT_FOUND')
+
+    resolved = dict(data.items())
+    resolved['query'] = entry[0]
+    return resolved, False
+
+
+def register_persisted_query(query, operation_name=None):
+    """
+    Store the text of an automatic persisted query. Only call it for queries
+    that parsed and validated, so clients cannot fill the table with junk.
+    """
+    return store.register(query, operation_name)
@@ -0,0 +1,143 @@
+import cProfile
+import marshal
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+
+PROFILE_HEADER = 'HTTP_X_GRAPHQL_PROFILE'
+
+SAMPLING = 'sampling'
+DETERMINISTIC = 'deterministic'
+
+
+class SamplingProfiler:
+    """
+    Sample the calling thread's stack from a background thread.
+
+    Output is in the collapsed-stack format flamegraph.pl and speedscope read:
+    one ``outer;inner;leaf count`` line per distinct stack.
+    """
+    format = SAMPLING
+    extension = 'folded'
+
+    def __init__(self, interval_ms=None):
+        if interval_ms is None:
+            interval_ms = getattr(settings, 'GRAPHQL_PROFILE_INTERVAL_MS', 5)
+        self.interval = interval_ms / 1000
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        target = threading.get_ident()
+        self._thread = threading.Thread(target=self._sample, args=(target,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _sample(self, target):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                return
+            self.stacks[self.collapse(frame)] += 1
+
+    @staticmethod
+    def collapse(frame):
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            labels.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(labels))
+
+    @property
+    def samples(self):
+        return sum(self.stacks.values())
+
+    def output(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in sorted(self.stacks.items())).encode()
+
+
+class DeterministicProfiler:
+    """cProfile around the request; output is a pstats file"""
+    format = DETERMINISTIC
+    extension = 'prof'
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.samples = None
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def output(self):
+        # The same bytes pstats.Stats.dump_stats writes
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+
+PROFILERS = {SAMPLING: SamplingProfiler, DETERMINISTIC: DeterministicProfiler}
+
+
+def profiling_trigger(request):
+    """
+    Decide whether to profile ``request``. Returns ``(trigger, format)`` or None.
+
+    Staff users ask for a profile with an ``X-GraphQL-Profile`` header, whose
+    value may name the profiler; otherwise a ``GRAPHQL_PROFILE_SAMPLE_RATE``
+    fraction of requests is profiled with the default one.
+    """
+    default = getattr(settings, 'GRAPHQL_PROFILER', SAMPLING)
+    requested = request.META.get(PROFILE_HEADER, '').strip().lower()
+    user = getattr(request, 'user', None)
+    if requested and user is not None and user.is_staff:
+        return 'header', requested if requested in PROFILERS else default
+
+    rate = getattr(settings, 'GRAPHQL_PROFILE_SAMPLE_RATE', 0.0)
+    if rate > 0 and random.random() < rate:
+        return 'sampled', default
+    return None
+
+
+class RequestProfiling:
+    """Run a profiler for the duration of a ``with`` block and time it"""
+
+    def __init__(self, format):
+        self.profiler = PROFILERS[format]()
+        self.duration_ms = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self.profiler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.stop()
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        return False
+
+    def save(self, request, trigger):
+        from .models import RequestProfile
+
+        organization = getattr(request, 'organization', None)
+        return RequestProfile.record(
+            operation_name=getattr(request, 'graphql_operation_name', None) or '',
+            organization_slug=organization.slug if organization is not None else '',
+            profiler=self.profiler.format,
+            trigger=trigger,
+            duration_ms=round(self.duration_ms, 3),
+            samples=self.profiler.samples,
+            data=self.profiler.output(),
+        )
@@ -1,21 +1,228 @@
+from collections import defaultdict
+
 import graphene
 from graphene_django import DjangoObjectType
-from django.db.models import Q, Count, Case, When, IntegerField
-from apps.organizations.models import Organization
+from graphql.error import GraphQLError
+from django.db.models import Q, F, Count, Case, When, Value, IntegerField, Window
+from django.db.models.functions import RowNumber
+from apps.activity.events import changed_objects, recent_activity_count
+from apps.activity.models import OrganizationDailyCounts, ProjectDailyCounts
+from apps.activity.rollups import bucket_start, next_bucket, time_series
+from apps.jobs.models import Job
+from apps.organizations.models import Organization, subquery_count
+from apps.projects.dashboard import dashboard_stats
 from apps.projects.models import Project
-from apps.tasks.models import Task, TaskComment
+from apps.tasks.models import ArchivedTask, Task, TaskComment
 from .types import (
     OrganizationType, 
     ProjectType, 
     TaskType, 
-    TaskCommentType,
     ProjectStatsType,
     TaskStatsType,
-    OrganizationStatsType
+    OrganizationStatsType,
+    JobType,
+    TaskBoardType,
+    TaskBoardColumnType,
+    TaskCommentConnectionType,
+    ActivityFeedType,
+    ChangeSetType,
+    TombstoneType,
+    TimeSeriesMetricEnum,
+    TimeSeriesBucketEnum,
+    TimeSeriesPointType,
+    TimeSeriesType,
+    comment_page
 )
+from .pagination import KeysetPage, decode_cursor, encode_cursor, page_size
+
+
+def filter_tasks(queryset, organization_slug=None, project_id=None, status=None,
+                 priority=None, assignee_email=None, search=None):
+    """Apply the Query.tasks filters to a Task or ArchivedTask queryset"""
+    if organization_slug:
+        queryset = queryset.filter(project__organization__slug=organization_slug)
+    
+    if project_id:
+        queryset = queryset.filter(project_id=project_id)
+    
+    if status:
+        queryset = queryset.filter(status=status)
+    
+    if priority:
+        queryset = queryset.filter(priority=priority)
+    
+    if assignee_email:
+        queryset = queryset.filter(assignee_email__icontains=assignee_email)
+    
+    if search:
+        queryset = queryset.filter(
+            Q(title__icontains=search) | Q(description__icontains=search)
+        )
+    
+    return queryset.order_by('-created_at')
+
+
+def with_comment_counts(queryset):
+    """Annotate the comment count TaskType.commentCount reads instead of counting per task"""
+    return queryset.annotate(_comment_count=subquery_count(TaskComment.objects.all(), 'task'))
+
+
+def board_ordering(priority_order=False):
+    """Order of a board column's tasks as (lookup, descending) pairs"""
+    ordering = [('created_at', True), ('id', True)]
+    if priority_order:
+        ordering.insert(0, ('board_weight', True))
+    return ordering
+
+
+def board_tasks(project, priority_order=False):
+    queryset = with_comment_counts(Task.objects.filter(project=project).select_related('project__organization'))
+    if priority_order:
+        queryset = queryset.annotate(board_weight=Case(
+            *[When(priority=priority, then=Value(weight)) for priority, weight in Task.PRIORITY_WEIGHTS.items()],
+            default=Value(2),
+            output_field=IntegerField()
+        ))
+    return queryset
+
+
+def board_column(status, tasks, total_count, has_more, ordering):
+    end_cursor = None
+    if tasks:
+        end_cursor = encode_cursor(getattr(tasks[-1], lookup) for lookup, _ in ordering)
+    return TaskBoardColumnType(
+        status=status,
+        label=dict(Task.TASK_STATUS_CHOICES)[status],
+        total_count=total_count,
+        tasks=tasks,
+        end_cursor=end_cursor,
+        has_more=has_more
+    )
+
+
+def get_task_board(project, per_column, priority_order=False):
+    """
+    The first ``per_column`` tasks and the task count of every status column.
+
+    All columns come from one query: ROW_NUMBER() and COUNT(*) windows
+    partitioned by status, filtered down to the rows each column shows.
+    """
+    ordering = board_ordering(priority_order)
+    order_by = [F(lookup).desc() if descending else F(lookup).asc() for lookup, descending in ordering]
+    tasks = board_tasks(project, priority_order).annotate(
+        board_position=Window(RowNumber(), partition_by=F('status'), order_by=order_by),
+        board_total=Window(Count('id'), partition_by=F('status'))
+    ).filter(board_position__lte=per_column).order_by('status', 'board_position')
+    
+    columns = defaultdict(list)
+    for task in tasks:
+        columns[task.status].append(task)
+    
+    board = []
+    for status, _ in Task.TASK_STATUS_CHOICES:
+        column_tasks = columns[status]
+        total_count = column_tasks[0].board_total if column_tasks else 0
+        board.append(board_column(status, column_tasks, total_count, total_count > len(column_tasks), ordering))
+    return TaskBoardType(columns=board)
+
+
+def get_task_board_column(project, status, first, after=None, priority_order=False):
+    """The next ``first`` tasks of one board column, after the ``after`` cursor"""
+    ordering = board_ordering(priority_order)
+    page = KeysetPage(board_tasks(project, priority_order).filter(status=status), ordering, first, after)
+    return board_column(status, page.items, page.total_count, page.has_more, ordering)
 
 
-def get_project_stats(organization, project_id=None):
+def get_changes_since(organization, cursor, first):
+    """
+    The projects, tasks and comments of ``organization`` changed after
+    ``cursor``, read back from their tables, and tombstones for the ones
+    that are gone or hidden. A project's tombstone also stands for its
+    tasks and comments, which are hidden without events of their own.
+    """
+    after_id = decode_cursor(cursor, 1)[0] if cursor else None
+    changed, project_ids, next_id, has_more = changed_objects(organization, after_id, first)
+    
+    projects = list(Project.objects.select_related('organization').filter(
+        organization=organization, id__in=changed['PROJECT']
+    ))
+    # Filtering on the projects too prunes the task partitions
+    tasks = list(with_comment_counts(Task.objects.visible().select_related('project__organization')).filter(
+        project__organization=organization, project_id__in=project_ids, id__in=changed['TASK']
+    ))
+    comments = list(TaskComment.objects.visible().select_related('task').filter(
+        task__project__organization=organization, id__in=changed['COMMENT']
+    ))
+    
+    found = {
+        'PROJECT': {project.pk for project in projects},
+        'TASK': {task.pk for task in tasks},
+        'COMMENT': {comment.pk for comment in comments},
+    }
+    deleted = [
+        TombstoneType(object_type=object_type, id=object_id)
+        for object_type, ids in changed.items()
+        for object_id in sorted(ids - found[object_type])
+    ]
+    return ChangeSetType(
+        projects=projects,
+        tasks=tasks,
+        comments=comments,
+        deleted=deleted,
+        cursor=encode_cursor([next_id]),
+        has_more=has_more
+    )
+
+
+# Most points a timeSeries query returns: a year of days
+MAX_TIME_SERIES_POINTS = 366
+
+
+def get_time_series(organization, metric, start, end, bucket, project_id=None):
+    """``metric`` of the daily counters of ``organization``, or of one of its projects"""
+    if end < start:
+        raise GraphQLError('"to" is before "from"', extensions={'code': 'INVALID_RANGE'})
+    date = bucket_start(start, bucket)
+    for _ in range(MAX_TIME_SERIES_POINTS):
+        date = next_bucket(date, bucket)
+    if date <= end:
+        raise GraphQLError(
+            f'Ranges are limited to {MAX_TIME_SERIES_POINTS} buckets; use larger buckets',
+            extensions={'code': 'INVALID_RANGE'}
+        )
+    
+    if project_id:
+        queryset = ProjectDailyCounts.objects.filter(organization=organization, project_id=project_id)
+    else:
+        queryset = OrganizationDailyCounts.objects.filter(organization=organization)
+    return TimeSeriesType(
+        metric=metric,
+        bucket=bucket,
+        points=[
+            TimeSeriesPointType(date=date, value=value)
+            for date, value in time_series(queryset, metric, start, end, bucket)
+        ]
+    )
+
+
+def completion_rate(completed, total):
+    return round((completed / total) * 100, 1) if total > 0 else 0
+
+
+def get_project_stats(organization, project_id=None, max_age=None):
+    # A single project is always cheap to look up
+    view = dashboard_stats(organization, max_age=max_age) if not project_id else None
+    if view is not None:
+        return ProjectStatsType(
+            total_projects=view['total_projects'],
+            active_projects=view['active_projects'],
+            completed_projects=view['completed_projects'],
+            on_hold_projects=view['on_hold_projects'],
+            cancelled_projects=view['cancelled_projects'],
+            completion_rate=completion_rate(view['completed_projects'], view['total_projects']),
+            as_of=view['refreshed_at']
+        )
+    
     queryset = organization.projects.all()
     if project_id:
         queryset = queryset.filter(id=project_id)
@@ -28,22 +235,31 @@ def get_project_stats(organization, project_id=None):
         cancelled=Count(Case(When(status='CANCELLED', then=1), output_field=IntegerField()))
     )
     
-    completion_rate = 0
-    if stats['total'] > 0:
-        completion_rate = round((stats['completed'] / stats['total']) * 100, 1)
-    
     return ProjectStatsType(
         total_projects=stats['total'],
         active_projects=stats['active'],
         completed_projects=stats['completed'],
         on_hold_projects=stats['on_hold'],
         cancelled_projects=stats['cancelled'],
-        completion_rate=completion_rate
+        completion_rate=completion_rate(stats['completed'], stats['total'])
     )
 
 
-def get_task_stats(organization, project_id=None):
-    queryset = Task.objects.filter(project__organization=organization)
+def get_task_stats(organization, project_id=None, max_age=None):
+    view = dashboard_stats(organization, project_id, max_age)
+    if view is not None:
+        return TaskStatsType(
+            total_tasks=view['total_tasks'],
+            todo_tasks=view['todo_tasks'],
+            in_progress_tasks=view['in_progress_tasks'],
+            done_tasks=view['done_tasks'],
+            blocked_tasks=view['blocked_tasks'],
+            overdue_tasks=view['overdue_tasks'],
+            completion_rate=completion_rate(view['done_tasks'], view['total_tasks']),
+            as_of=view['refreshed_at']
+        )
+    
+    queryset = Task.objects.visible().filter(project__organization=organization)
     if project_id:
         queryset = queryset.filter(project_id=project_id)
     
@@ -55,15 +271,7 @@ def get_task_stats(organization, project_id=None):
         blocked=Count(Case(When(status='BLOCKED', then=1), output_field=IntegerField()))
     )
     
-    from django.utils import timezone
-    overdue_count = queryset.filter(
-        due_date__lt=timezone.now(),
-        status__in=['TODO', 'IN_PROGRESS', 'BLOCKED']
-    ).count()
-    
-    completion_rate = 0
-    if stats['total'] > 0:
-        completion_rate = round((stats['done'] / stats['total']) * 100, 1)
+    overdue_count = queryset.filter(overdue=True).count()
     
     return TaskStatsType(
         total_tasks=stats['total'],
@@ -72,36 +280,17 @@ def get_task_stats(organization, project_id=None):
         done_tasks=stats['done'],
         blocked_tasks=stats['blocked'],
         overdue_tasks=overdue_count,
-        completion_rate=completion_rate
+        completion_rate=completion_rate(stats['done'], stats['total'])
     )
 
 
-def get_recent_activity_count(organization):
-    from django.utils import timezone
-    from datetime import timedelta
-    
-    week_ago = timezone.now() - timedelta(days=7)
-    
-    recent_tasks = Task.objects.filter(
-        project__organization=organization,
-        created_at__gte=week_ago
-    ).count()
-    
-    recent_comments = TaskComment.objects.filter(
-        task__project__organization=organization,
-        created_at__gte=week_ago
-    ).count()
-    
-    return recent_tasks + recent_comments
-
-
 def get_active_users_count(organization):
-    assignees = set(Task.objects.filter(
+    assignees = set(Task.objects.visible().filter(
         project__organization=organization,
         assignee_email__isnull=False
     ).exclude(assignee_email='').values_list('assignee_email', flat=True))
     
-    commenters = set(TaskComment.objects.filter(
+    commenters = set(TaskComment.objects.visible().filter(
         task__project__organization=organization
     ).values_list('author_email', flat=True))
     
@@ -113,7 +302,11 @@ class Query(graphene.ObjectType):
     organization = graphene.Field(OrganizationType, slug=graphene.String(required=True))
     organizations = graphene.List(OrganizationType)
     
-    project = graphene.Field(ProjectType, id=graphene.ID(required=True))
+    project = graphene.Field(
+        ProjectType,
+        id=graphene.ID(required=True),
+        include_archived=graphene.Boolean(default_value=False)
+    )
     projects = graphene.List(
         ProjectType,
         organization_slug=graphene.String(),
@@ -129,29 +322,77 @@ class Query(graphene.ObjectType):
         status=graphene.String(),
         priority=graphene.String(),
         assignee_email=graphene.String(),
-        search=graphene.String()
+        search=graphene.String(),
+        include_archived=graphene.Boolean(default_value=False)
+    )
+    
+    task_board = graphene.Field(
+        TaskBoardType,
+        project_id=graphene.ID(required=True),
+        per_column=graphene.Int(default_value=20),
+        priority_order=graphene.Boolean(default_value=False)
+    )
+    task_board_column = graphene.Field(
+        TaskBoardColumnType,
+        project_id=graphene.ID(required=True),
+        status=graphene.String(required=True),
+        first=graphene.Int(default_value=20),
+        after=graphene.String(),
+        priority_order=graphene.Boolean(default_value=False)
     )
     
-    task_comments = graphene.List(
-        TaskCommentType,
-        task_id=graphene.ID(required=True)
+    task_comments = graphene.Field(
+        TaskCommentConnectionType,
+        task_id=graphene.ID(required=True),
+        first=graphene.Int(default_value=20),
+        after=graphene.String()
     )
     
+    # maxAge: oldest materialized stats accepted, in seconds; 0 aggregates live
     organization_stats = graphene.Field(
         OrganizationStatsType,
-        organization_slug=graphene.String(required=True)
+        organization_slug=graphene.String(required=True),
+        max_age=graphene.Int()
     )
     project_stats = graphene.Field(
         ProjectStatsType,
         organization_slug=graphene.String(required=True),
-        project_id=graphene.ID()
+        project_id=graphene.ID(),
+        max_age=graphene.Int()
     )
     task_stats = graphene.Field(
         TaskStatsType,
         organization_slug=graphene.String(required=True),
+        project_id=graphene.ID(),
+        max_age=graphene.Int()
+    )
+    
+    time_series = graphene.Field(
+        TimeSeriesType,
+        organization_slug=graphene.String(required=True),
+        metric=TimeSeriesMetricEnum(required=True),
+        start=graphene.Date(required=True, name='from'),
+        end=graphene.Date(required=True, name='to'),
+        bucket=TimeSeriesBucketEnum(default_value=TimeSeriesBucketEnum.DAY),
         project_id=graphene.ID()
     )
     
+    activity_feed = graphene.Field(
+        ActivityFeedType,
+        organization_slug=graphene.String(required=True),
+        first=graphene.Int(default_value=20),
+        after=graphene.String()
+    )
+    
+    changes_since = graphene.Field(
+        ChangeSetType,
+        organization_slug=graphene.String(required=True),
+        cursor=graphene.String(),
+        first=graphene.Int(default_value=100)
+    )
+    
+    job = graphene.Field(JobType, id=graphene.ID(required=True))
+    
     def resolve_organization(self, info, slug):
         try:
             return Organization.objects.get(slug=slug, is_active=True)
@@ -161,9 +402,10 @@ class Query(graphene.ObjectType):
     def resolve_organizations(self, info, **kwargs):
         return Organization.objects.filter(is_active=True)
     
-    def resolve_project(self, info, id):
+    def resolve_project(self, info, id, include_archived=False):
         try:
             project = Project.objects.select_related('organization').get(id=id)
+            project.include_archived = include_archived
             return project
         except Project.DoesNotExist:
             return None
@@ -186,68 +428,101 @@ class Query(graphene.ObjectType):
     
     def resolve_task(self, info, id):
         try:
-            task = Task.objects.select_related('project__organization').prefetch_related('comments').get(id=id)
+            task = Task.objects.visible().select_related('project__organization').get(id=id)
             return task
         except Task.DoesNotExist:
             return None
     
     def resolve_tasks(self, info, organization_slug=None, project_id=None, status=None, 
-                     priority=None, assignee_email=None, search=None, **kwargs):
-        queryset = Task.objects.select_related('project__organization').prefetch_related('comments')
-        
-        if organization_slug:
-            queryset = queryset.filter(project__organization__slug=organization_slug)
-        
-        if project_id:
-            queryset = queryset.filter(project_id=project_id)
-        
-        if status:
-            queryset = queryset.filter(status=status)
-        
-        if priority:
-            queryset = queryset.filter(priority=priority)
+                     priority=None, assignee_email=None, search=None, include_archived=False, **kwargs):
+        filters = dict(
+            organization_slug=organization_slug, project_id=project_id, status=status,
+            priority=priority, assignee_email=assignee_email, search=search
+        )
+        queryset = filter_tasks(
+            with_comment_counts(Task.objects.visible().select_related('project__organization')),
+            **filters
+        )
+        if not include_archived:
+            return queryset
         
-        if assignee_email:
-            queryset = queryset.filter(assignee_email__icontains=assignee_email)
+        archived = filter_tasks(ArchivedTask.objects.visible().select_related('project__organization'), **filters)
+        tasks = list(queryset) + [task.as_task() for task in archived]
+        return sorted(tasks, key=lambda task: task.created_at, reverse=True)
+    
+    def resolve_task_board(self, info, project_id, per_column=20, priority_order=False):
+        project = Project.objects.filter(id=project_id).first()
+        if project is None:
+            return None
+        per_column = page_size(per_column)
+        return get_task_board(project, per_column, priority_order)
+    
+    def resolve_task_board_column(self, info, project_id, status, first=20, after=None, priority_order=False):
+        project = Project.objects.filter(id=project_id).first()
+        if project is None or status not in dict(Task.TASK_STATUS_CHOICES):
+            return None
+        first = page_size(first)
+        return get_task_board_column(project, status, first, after, priority_order)
+    
+    def resolve_task_comments(self, info, task_id, first=20, after=None):
+        queryset = TaskComment.objects.visible().filter(task_id=task_id).select_related('task')
+        return comment_page(queryset, first, after)
+    
+    def resolve_activity_feed(self, info, organization_slug, first=20, after=None):
+        try:
+            org = Organization.objects.get(slug=organization_slug, is_active=True)
+        except Organization.DoesNotExist:
+            return None
         
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(description__icontains=search)
-            )
+        return KeysetPage(org.activity_events.all(), [('id', True)], page_size(first), after)
+    
+    def resolve_changes_since(self, info, organization_slug, cursor=None, first=100):
+        try:
+            org = Organization.objects.get(slug=organization_slug, is_active=True)
+        except Organization.DoesNotExist:
+            return None
         
-        return queryset.order_by('-created_at')
+        return get_changes_since(org, cursor, page_size(first))
     
-    def resolve_task_comments(self, info, task_id, **kwargs):
-        return TaskComment.objects.filter(task_id=task_id).order_by('created_at')
+    def resolve_job(self, info, id):
+        return Job.objects.filter(id=id).first()
     
-    def resolve_organization_stats(self, info, organization_slug):
+    def resolve_organization_stats(self, info, organization_slug, max_age=None):
         try:
             org = Organization.objects.get(slug=organization_slug, is_active=True)
         except Organization.DoesNotExist:
             return None
         
-        project_stats = get_project_stats(org)
-        task_stats = get_task_stats(org)
+        project_stats = get_project_stats(org, max_age=max_age)
+        task_stats = get_task_stats(org, max_age=max_age)
         
         return OrganizationStatsType(
             project_stats=project_stats,
             task_stats=task_stats,
-            recent_activity_count=get_recent_activity_count(org),
+            recent_activity_count=recent_activity_count(org),
             active_users_count=get_active_users_count(org)
         )
     
-    def resolve_project_stats(self, info, organization_slug, project_id=None):
+    def resolve_project_stats(self, info, organization_slug, project_id=None, max_age=None):
+        try:
+            org = Organization.objects.get(slug=organization_slug, is_active=True)
+        except Organization.DoesNotExist:
+            return None
+        
+        return get_project_stats(org, project_id, max_age)
+    
+    def resolve_time_series(self, info, organization_slug, metric, start, end, bucket, project_id=None):
         try:
             org = Organization.objects.get(slug=organization_slug, is_active=True)
         except Organization.DoesNotExist:
             return None
         
-        return get_project_stats(org, project_id)
+        return get_time_series(org, metric.value, start, end, bucket.value, project_id)
     
-    def resolve_task_stats(self, info, organization_slug, project_id=None):
+    def resolve_task_stats(self, info, organization_slug, project_id=None, max_age=None):
         try:
             org = Organization.objects.get(slug=organization_slug, is_active=True)
         except Organization.DoesNotExist:
             return None
         
-        return get_task_stats(org, project_id)
\ No newline at end of file
+        return get_task_stats(org, project_id, max_age)
\ No newline at end of file
@@ -1,9 +1,12 @@
 import graphene
+from graphql import specified_directives
+from .incremental import GraphQLDeferDirective, GraphQLStreamDirective
 from .queries import Query
 from .mutations import Mutation
 
 
 schema = graphene.Schema(
     query=Query,
-    mutation=Mutation
+    mutation=Mutation,
+    directives=(*specified_directives, GraphQLDeferDirective, GraphQLStreamDirective)
 )
\ No newline at end of file
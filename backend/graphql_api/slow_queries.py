@@ -0,0 +1,105 @@
+import json
+import logging
+import time
+from collections import deque
+
+from django.conf import settings
+from django.utils import timezone
+
+
+logger = logging.getLogger('graphql_api.slow_queries')
+
+_recent = None
+
+
+def recent_slow_queries():
+    """
+    The ring buffer of the latest slow statements in this process, newest
+    last. Sized by ``GRAPHQL_SLOW_QUERY_BUFFER_SIZE``.
+    """
+    global _recent
+    size = getattr(settings, 'GRAPHQL_SLOW_QUERY_BUFFER_SIZE', 200)
+    if _recent is None or _recent.maxlen != size:
+        _recent = deque(_recent or (), maxlen=size)
+    return _recent
+
+
+class ResolverTracker:
+    """
+    Graphene middleware remembering which field resolver ran last.
+
+    Execution is depth-first, so a query belongs to the field whose resolver
+    started most recently, including querysets evaluated after it returned.
+    ``root_field`` is the top-level field that resolver sits under.
+    """
+
+    def __init__(self):
+        self.current = None
+        self.root_field = None
+
+    def resolve(self, next, root, info, **args):
+        self.current = f'{info.parent_type.name}.{info.field_name}'
+        if info.path.prev is None:
+            self.root_field = info.field_name
+        return next(root, info, **args)
+
+
+class SlowQueryRecorder:
+    """
+    Database execute wrapper timing every statement of a GraphQL request.
+
+    Statements taking at least ``threshold_ms`` are written to the
+    ``graphql_api.slow_queries`` logger as one JSON object per line, in the
+    format ``explain_operations --log`` reads, and kept in the ring buffer
+    shown in the admin.
+    """
+
+    def __init__(self, request, operation_name, tracker, organization_scope=None,
+                 threshold_ms=None, redact_params=None):
+        self.request = request
+        self.operation_name = operation_name
+        self.tracker = tracker
+        self.organization_scope = organization_scope
+        if threshold_ms is None:
+            threshold_ms = getattr(settings, 'GRAPHQL_SLOW_QUERY_MS', 100)
+        if redact_params is None:
+            redact_params = getattr(settings, 'GRAPHQL_SLOW_QUERY_REDACT_PARAMS', True)
+        self.threshold_ms = threshold_ms
+        self.redact_params = redact_params
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.record(sql, params, many, duration_ms)
+
+    def organization(self):
+        organization = getattr(self.request, 'organization', None)
+        if organization is not None:
+            return organization.slug
+        # Statements issued before OrganizationMiddleware looked the slug up
+        if self.organization_scope and len(self.organization_scope) == 1:
+            return next(iter(self.organization_scope))
+        return None
+
+    def record(self, sql, params, many, duration_ms):
+        if self.redact_params or many or params is None:
+            params = None
+        else:
+            params = list(params)
+        entry = {
+            'timestamp': timezone.now().isoformat(),
+            'duration_ms': round(duration_ms, 3),
+            'operation': self.operation_name,
+            'root_field': self.tracker.root_field,
+            'resolver': self.tracker.current,
+            'organization': self.organization(),
+            'sql': sql,
+            'params': params,
+        }
+        recent_slow_queries().append(entry)
+        logger.warning('%s', json.dumps(entry, default=str))
+        return entry
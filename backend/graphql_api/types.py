@@ -1,8 +1,20 @@
 import graphene
 from graphene_django import DjangoObjectType
+from apps.activity.models import ActivityEvent
+from apps.jobs.models import Job
 from apps.organizations.models import Organization
 from apps.projects.models import Project
-from apps.tasks.models import Task, TaskComment
+from apps.tasks.models import ArchivedTaskComment, Task, TaskComment
+from .pagination import KeysetPage, page_size
+
+
+# Comments are listed oldest first
+COMMENT_ORDERING = [('created_at', False), ('id', False)]
+
+
+def comment_page(queryset, first, after=None, wrap=None):
+    """A page of ``first`` comments from ``queryset`` after the ``after`` cursor"""
+    return KeysetPage(queryset, COMMENT_ORDERING, page_size(first), after, wrap)
 
 
 class OrganizationType(DjangoObjectType):
@@ -60,6 +72,7 @@ class ProjectType(DjangoObjectType):
             'description', 
             'status',
             'due_date',
+            'archived_at',
             'created_at',
             'updated_at'
         )
@@ -91,10 +104,16 @@ class TaskType(DjangoObjectType):
     
     # Custom fields
     comment_count = graphene.Int()
+    comments = graphene.Field(
+        lambda: TaskCommentConnectionType,
+        first=graphene.Int(default_value=20),
+        after=graphene.String()
+    )
     is_overdue = graphene.Boolean()
     can_start = graphene.Boolean()
     is_completed = graphene.Boolean()
     priority_weight = graphene.Int()
+    is_archived = graphene.Boolean()
     
     class Meta:
         model = Task
@@ -112,7 +131,18 @@ class TaskType(DjangoObjectType):
         )
     
     def resolve_comment_count(self, info):
-        return self.comment_count
+        # Task lists annotate the count; a single task counts on demand
+        count = getattr(self, '_comment_count', None)
+        return count if count is not None else self.comment_count
+    
+    def resolve_comments(self, info, first=20, after=None):
+        if self.is_archived:
+            def wrap(comment):
+                comment = comment.as_comment()
+                comment.task = self
+                return comment
+            return comment_page(ArchivedTaskComment.objects.filter(task_id=self.pk), first, after, wrap)
+        return comment_page(self.comments.all(), first, after)
     
     def resolve_is_overdue(self, info):
         return self.is_overdue
@@ -125,6 +155,9 @@ class TaskType(DjangoObjectType):
     
     def resolve_priority_weight(self, info):
         return self.get_priority_weight()
+    
+    def resolve_is_archived(self, info):
+        return self.is_archived
 
 
 class TaskCommentType(DjangoObjectType):
@@ -142,6 +175,92 @@ class TaskCommentType(DjangoObjectType):
         )
 
 
+class TaskCommentConnectionType(graphene.ObjectType):
+    """A page of comments with a cursor to the next one"""
+    total_count = graphene.Int()
+    comments = graphene.List(TaskCommentType)
+    end_cursor = graphene.String()
+    has_more = graphene.Boolean()
+    
+    def resolve_comments(self, info):
+        return self.items
+
+
+class ActivityEventType(DjangoObjectType):
+    """GraphQL type for an ActivityEvent"""
+    
+    project_id = graphene.ID()
+    
+    class Meta:
+        model = ActivityEvent
+        fields = (
+            'id',
+            'object_type',
+            'object_id',
+            'action',
+            'object_repr',
+            'changed_fields',
+            'created_at'
+        )
+    
+    def resolve_project_id(self, info):
+        return self.project_id
+
+
+class ActivityFeedType(graphene.ObjectType):
+    """A page of an organization's activity, newest first"""
+    total_count = graphene.Int()
+    events = graphene.List(ActivityEventType)
+    end_cursor = graphene.String()
+    has_more = graphene.Boolean()
+    
+    def resolve_events(self, info):
+        return self.items
+
+
+class TombstoneType(graphene.ObjectType):
+    """A project, task or comment that was deleted or is no longer visible"""
+    object_type = graphene.String()
+    id = graphene.ID()
+
+
+class ChangeSetType(graphene.ObjectType):
+    """Current state of the objects changed since a changesSince cursor"""
+    projects = graphene.List(ProjectType)
+    tasks = graphene.List(TaskType)
+    comments = graphene.List(TaskCommentType)
+    deleted = graphene.List(TombstoneType)
+    cursor = graphene.String()
+    has_more = graphene.Boolean()
+
+
+class JobType(DjangoObjectType):
+    """GraphQL type for a background Job"""
+    
+    is_finished = graphene.Boolean()
+    
+    class Meta:
+        model = Job
+        fields = (
+            'id',
+            'name',
+            'status',
+            'priority',
+            'attempts',
+            'max_attempts',
+            'progress',
+            'result',
+            'error',
+            'run_after',
+            'created_at',
+            'started_at',
+            'finished_at'
+        )
+    
+    def resolve_is_finished(self, info):
+        return self.is_finished
+
+
 # Custom scalar types for choices
 class ProjectStatusEnum(graphene.Enum):
     ACTIVE = 'ACTIVE'
@@ -173,6 +292,8 @@ class ProjectStatsType(graphene.ObjectType):
     on_hold_projects = graphene.Int()
     cancelled_projects = graphene.Int()
     completion_rate = graphene.Float()
+    # When the materialized view was refreshed; null for live stats
+    as_of = graphene.DateTime()
 
 
 class TaskStatsType(graphene.ObjectType):
@@ -184,6 +305,8 @@ class TaskStatsType(graphene.ObjectType):
     blocked_tasks = graphene.Int()
     overdue_tasks = graphene.Int()
     completion_rate = graphene.Float()
+    # When the materialized view was refreshed; null for live stats
+    as_of = graphene.DateTime()
 
 
 class OrganizationStatsType(graphene.ObjectType):
@@ -191,4 +314,45 @@ class OrganizationStatsType(graphene.ObjectType):
     project_stats = graphene.Field(ProjectStatsType)
     task_stats = graphene.Field(TaskStatsType)
     recent_activity_count = graphene.Int()
-    active_users_count = graphene.Int()
\ No newline at end of file
+    active_users_count = graphene.Int()
+
+
+class TimeSeriesMetricEnum(graphene.Enum):
+    TASKS_CREATED = 'tasks_created'
+    TASKS_COMPLETED = 'tasks_completed'
+    STATUS_CHANGES = 'status_changes'
+    COMMENTS_CREATED = 'comments_created'
+
+
+class TimeSeriesBucketEnum(graphene.Enum):
+    DAY = 'DAY'
+    WEEK = 'WEEK'
+    MONTH = 'MONTH'
+
+
+class TimeSeriesPointType(graphene.ObjectType):
+    """Total of a metric over the bucket starting on ``date``"""
+    date = graphene.Date()
+    value = graphene.Int()
+
+
+class TimeSeriesType(graphene.ObjectType):
+    """A metric of the daily activity counters, bucketed"""
+    metric = graphene.Field(TimeSeriesMetricEnum)
+    bucket = graphene.Field(TimeSeriesBucketEnum)
+    points = graphene.List(TimeSeriesPointType)
+
+
+class TaskBoardColumnType(graphene.ObjectType):
+    """One status column of a project's task board"""
+    status = graphene.String()
+    label = graphene.String()
+    total_count = graphene.Int()
+    tasks = graphene.List(TaskType)
+    end_cursor = graphene.String()
+    has_more = graphene.Boolean()
+
+
+class TaskBoardType(graphene.ObjectType):
+    """A project's tasks grouped into one column per status"""
+    columns = graphene.List(TaskBoardColumnType)
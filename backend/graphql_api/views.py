@@ -0,0 +1,335 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import HttpResponseNotAllowed, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.http.response import HttpResponseBadRequest
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.views import GraphQLView as BaseGraphQLView, HttpError, set_rollback
+from graphql import ExecutionResult, OperationType, execute, validate_schema
+
+from .cost import analyze_operation_cost, budget_error, charge_budget, cost_error, get_client_key, log_cost
+from .document_cache import get_document_cache
+from .encoding import add_etag_suffix, compress, dumps, negotiate_encoding
+from .incremental import IncrementalExecution, accepts_multipart, plan_incremental_delivery
+from .http_cache import compute_etag, etag_matches, get_cache_policy, get_data_versions, get_organization_scope
+from .profiling import RequestProfiling, profiling_trigger
+from .persisted_queries import PersistedQueryError, register_persisted_query, resolve_persisted_query
+from .slow_queries import ResolverTracker, SlowQueryRecorder
+
+
+class GraphQLView(BaseGraphQLView):
+    """
+    GraphQL endpoint that skips parsing and validation for documents it has
+    already seen.
+
+    The frontend sends the same dozen documents over and over, so parsed and
+    validated ASTs are kept in a bounded LRU cache keyed by query hash, and
+    introspection results are computed once per schema build.
+
+    Apollo automatic persisted queries are supported, so clients can send a
+    sha256 hash (also over GET) in place of the query text.
+
+    Every operation is costed before it runs; operations above the configured
+    cost or depth ceiling are rejected and the estimate is reported in the
+    response ``extensions``.
+
+    Queries sent over GET carry a ``Cache-Control`` header combined from the
+    schema's cache hints and a strong ETag over the query, its variables and
+    the data versions of the organizations it reads. A matching
+    ``If-None-Match`` gets ``304 Not Modified`` without running any resolver.
+
+    Responses are encoded with orjson when available and compressed with
+    brotli or gzip when they are large enough and the client accepts it.
+
+    Queries using ``@defer`` or ``@stream`` from clients that accept
+    ``multipart/mixed`` get the initial result first and the deferred and
+    streamed parts as later parts of a streaming response.
+
+    SQL statements slower than ``GRAPHQL_SLOW_QUERY_MS`` are logged with the
+    operation, root field and organization that issued them.
+
+    Staff can have a request profiled by sending ``X-GraphQL-Profile``, and
+    ``GRAPHQL_PROFILE_SAMPLE_RATE`` profiles a fraction of all requests; the
+    profiles are stored as RequestProfile rows.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        request.graphql_http_cache = None
+        request.graphql_incremental = None
+        request.graphql_operation_name = None
+
+        profiling = profiling_trigger(request)
+        if profiling is None:
+            response = super().dispatch(request, *args, **kwargs)
+        else:
+            trigger, format = profiling
+            with RequestProfiling(format) as profile:
+                response = super().dispatch(request, *args, **kwargs)
+            saved = profile.save(request, trigger)
+            response['X-GraphQL-Profile-Id'] = str(saved.pk)
+
+        if request.graphql_incremental is not None and response.status_code == 200:
+            return request.graphql_incremental.response(response.content)
+
+        http_cache = request.graphql_http_cache
+        if response.status_code == 304:
+            response = HttpResponseNotModified()
+        if http_cache is not None and response.status_code in (200, 304):
+            policy, etag = http_cache
+            response['ETag'] = etag
+            response['Cache-Control'] = policy.header
+        elif response.get('Content-Type', '').startswith('application/json'):
+            response['Cache-Control'] = 'no-store'
+        self.compress_response(request, response)
+        return response
+
+    def compress_response(self, request, response):
+        if (
+            not getattr(settings, 'GRAPHQL_COMPRESS_RESPONSES', True)
+            or response.status_code != 200
+            or response.streaming
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith('application/json')
+        ):
+            return
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < getattr(settings, 'GRAPHQL_COMPRESSION_MIN_SIZE', 1024):
+            return
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return
+
+        response.content = compress(response.content, encoding)
+        response['Content-Encoding'] = encoding
+        response['Content-Length'] = str(len(response.content))
+        if response.has_header('ETag'):
+            response['ETag'] = add_etag_suffix(response['ETag'], encoding)
+
+    def json_encode(self, request, d, pretty=False):
+        content = dumps(d, pretty=self.pretty or pretty or bool(request.GET.get('pretty')))
+        # Batched responses are joined as text by the base dispatch
+        return content.decode('utf-8') if self.batch else content
+
+    def get_http_cache(self, request, query, variables, operation_name):
+        """Return ``(policy, etag)`` for a cacheable GET query, otherwise None"""
+        if request.method.lower() != 'get' or self.batch or not query:
+            return None
+
+        cached = self.get_document_cache().get(query)
+        operation_ast = cached.get_operation(operation_name)
+        if (
+            cached.errors
+            or operation_ast is None
+            or operation_ast.operation != OperationType.QUERY
+            or cached.is_introspection(operation_name)
+        ):
+            return None
+
+        schema = self.schema.graphql_schema
+        policy = get_cache_policy(schema, cached.document, operation_ast)
+        if not policy.versioned:
+            return None
+        data_versions = get_data_versions(get_organization_scope(operation_ast, variables))
+        return policy, compute_etag(query, operation_name, variables, data_versions, policy)
+
+    def get_response(self, request, data, show_graphiql=False):
+        try:
+            data, register = resolve_persisted_query(
+                request, data, strict=getattr(settings, 'GRAPHQL_PERSISTED_QUERIES_STRICT', False)
+            )
+        except PersistedQueryError as e:
+            return self.json_encode(request, {'errors': [e.formatted]}), e.status_code
+
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+        request.graphql_cost = None
+
+        if register and not self.get_document_cache().get(query).errors:
+            register_persisted_query(query, operation_name)
+
+        request.graphql_accepts_multipart = accepts_multipart(request) and not self.batch
+        if not show_graphiql and not request.graphql_accepts_multipart:
+            request.graphql_http_cache = self.get_http_cache(request, query, variables, operation_name)
+            if request.graphql_http_cache is not None:
+                policy, etag = request.graphql_http_cache
+                matched = etag_matches(request, etag)
+                if matched is not None:
+                    request.graphql_http_cache = (policy, matched)
+                    return None, 304
+
+        execution_result = self.execute_graphql_request(
+            request, data, query, variables, operation_name, show_graphiql
+        )
+
+        if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+            set_rollback()
+
+        status_code = 200
+        if not execution_result:
+            return None, status_code
+
+        response = {}
+        if execution_result.errors:
+            request.graphql_http_cache = None
+            set_rollback()
+            response['errors'] = [self.format_error(e) for e in execution_result.errors]
+
+        if execution_result.errors and any(not getattr(e, 'path', None) for e in execution_result.errors):
+            status_code = 400
+            if any(
+                (getattr(e, 'extensions', None) or {}).get('code') == 'COST_BUDGET_EXCEEDED'
+                for e in execution_result.errors
+            ):
+                status_code = 429
+        else:
+            response['data'] = execution_result.data
+
+        if request.graphql_cost is not None:
+            response['extensions'] = {'cost': request.graphql_cost.as_extension()}
+
+        if getattr(request, 'graphql_incremental', None) is not None and status_code == 200:
+            response['hasNext'] = True
+
+        if self.batch:
+            response['id'] = id
+            response['status'] = status_code
+
+        return self.json_encode(request, response, pretty=show_graphiql), status_code
+
+    def get_document_cache(self):
+        return get_document_cache(
+            self.schema.graphql_schema,
+            self.validation_rules,
+            maxsize=getattr(settings, 'GRAPHQL_DOCUMENT_CACHE_SIZE', 256),
+            max_errors=graphene_settings.MAX_VALIDATION_ERRORS,
+        )
+
+    def execute_graphql_request(
+        self, request, data, query, variables, operation_name, show_graphiql=False
+    ):
+        if not query:
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseBadRequest('Must provide query string.'))
+
+        schema = self.schema.graphql_schema
+
+        schema_validation_errors = validate_schema(schema)
+        if schema_validation_errors:
+            return ExecutionResult(data=None, errors=schema_validation_errors)
+
+        document_cache = self.get_document_cache()
+        cached = document_cache.get(query)
+        if cached.errors:
+            return ExecutionResult(data=None, errors=cached.errors)
+
+        operation_ast = cached.get_operation(operation_name)
+        request.graphql_operation_name = operation_name or (
+            operation_ast.name.value if operation_ast is not None and operation_ast.name else None
+        )
+
+        if (
+            request.method.lower() == 'get'
+            and operation_ast is not None
+            and operation_ast.operation != OperationType.QUERY
+        ):
+            if show_graphiql:
+                return None
+
+            raise HttpError(
+                HttpResponseNotAllowed(
+                    ['POST'],
+                    'Can only perform a {} operation from a POST request.'.format(
+                        operation_ast.operation.value
+                    ),
+                )
+            )
+
+        if operation_ast is not None and not cached.is_introspection(operation_name):
+            report = analyze_operation_cost(schema, cached.document, operation_ast, variables)
+            log_cost(operation_name, report)
+            request.graphql_cost = report
+            if report.exceeded:
+                return ExecutionResult(data=None, errors=[cost_error(report)])
+
+            budget = getattr(settings, 'GRAPHQL_QUERY_COST_BUDGET', 0)
+            if not charge_budget(get_client_key(request), report.cost, budget):
+                return ExecutionResult(data=None, errors=[budget_error(budget)])
+
+        if (
+            request.graphql_accepts_multipart
+            and operation_ast is not None
+            and operation_ast.operation == OperationType.QUERY
+        ):
+            plan = plan_incremental_delivery(schema, cached.document, operation_ast, variables)
+            if plan is not None:
+                request.graphql_incremental = IncrementalExecution(
+                    self, request, plan, variables, operation_name
+                )
+                return request.graphql_incremental.execute_initial()
+
+        def run():
+            return self.execute_document(request, cached.document, operation_ast, variables, operation_name)
+
+        if cached.is_introspection(operation_name):
+            return document_cache.get_introspection_result(query, operation_name, run)
+        return run()
+
+    def execute_document(
+        self, request, document, operation_ast, variables, operation_name, extra_middleware=None,
+        execution_context_class=None,
+    ):
+        if getattr(settings, 'GRAPHQL_SLOW_QUERY_MS', 100) < 0:
+            return self._execute_document(
+                request, document, operation_ast, variables, operation_name, extra_middleware,
+                execution_context_class,
+            )
+
+        tracker = ResolverTracker()
+        recorder = SlowQueryRecorder(
+            request,
+            getattr(request, 'graphql_operation_name', None) or operation_name,
+            tracker,
+            get_organization_scope(operation_ast, variables) if operation_ast is not None else None,
+        )
+        with connection.execute_wrapper(recorder):
+            return self._execute_document(
+                request, document, operation_ast, variables, operation_name,
+                [tracker, *(extra_middleware or ())], execution_context_class,
+            )
+
+    def _execute_document(
+        self, request, document, operation_ast, variables, operation_name, extra_middleware=None,
+        execution_context_class=None,
+    ):
+        schema = self.schema.graphql_schema
+        try:
+            execute_options = {
+                'root_value': self.get_root_value(request),
+                'context_value': self.get_context(request),
+                'variable_values': variables,
+                'operation_name': operation_name,
+                'middleware': [*(self.get_middleware(request) or ()), *(extra_middleware or ())],
+            }
+            execution_context_class = execution_context_class or self.execution_context_class
+            if execution_context_class:
+                execute_options['execution_context_class'] = execution_context_class
+
+            if (
+                operation_ast is not None
+                and operation_ast.operation == OperationType.MUTATION
+                and (
+                    graphene_settings.ATOMIC_MUTATIONS is True
+                    or connection.settings_dict.get('ATOMIC_MUTATIONS', False) is True
+                )
+            ):
+                with transaction.atomic():
+                    result = execute(schema, document, **execute_options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result
+
+            return execute(schema, document, **execute_options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
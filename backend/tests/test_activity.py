@@ -0,0 +1,350 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from graphene.test import Client
+from graphql_api.schema import schema
+from apps.activity.events import SETTLE_TIME, recent_activity_count
+from apps.activity.models import ActivityEvent, OrganizationDailyCounts
+from apps.organizations.models import Organization
+from apps.projects.deletion import purge_organization
+from apps.projects.models import Project
+from apps.tasks.archive import archive_project, restore_project
+from apps.tasks.escalation import escalate_tasks
+from apps.tasks.models import Task, TaskComment
+
+
+class ActivityEventTests(TestCase):
+    def setUp(self):
+        self.graphql = Client(schema)
+        self.org = Organization.objects.create(name='Activity Org', contact_email='activity@example.com')
+        self.project = Project.objects.create(organization=self.org, name='Tracked')
+
+    def events(self):
+        return list(ActivityEvent.objects.order_by('id').values_list('object_type', 'action', 'changed_fields'))
+
+    def execute(self, query, **variables):
+        result = self.graphql.execute(query, variables=variables)
+        self.assertIsNone(result.get('errors'))
+        return result['data']
+
+    def test_saves_and_deletes_are_recorded(self):
+        task_id = self.execute('''
+            mutation($projectId: ID!) {
+                createTask(input: {projectId: $projectId, title: "Write docs"}) { task { id } }
+            }
+        ''', projectId=self.project.pk)['createTask']['task']['id']
+        self.execute('''
+            mutation($id: ID!) {
+                updateTask(id: $id, input: {status: "IN_PROGRESS", title: "Write docs"}) { success }
+            }
+        ''', id=task_id)
+        task = Task.objects.get(pk=task_id)
+        task.save()
+        comment = TaskComment.objects.create(task=task, content='On it', author_email='dev@example.com')
+        comment.delete()
+        task.delete()
+
+        self.assertEqual(self.events(), [
+            ('PROJECT', 'CREATED', {}),
+            ('TASK', 'CREATED', {}),
+            ('TASK', 'UPDATED', {'status': ['TODO', 'IN_PROGRESS']}),
+            ('COMMENT', 'CREATED', {}),
+            ('COMMENT', 'DELETED', {}),
+            ('TASK', 'DELETED', {}),
+        ])
+        event = ActivityEvent.objects.get(object_type='TASK', action='UPDATED')
+        self.assertEqual(
+            (event.organization_id, event.project_id, event.object_id, event.object_repr),
+            (self.org.pk, self.project.pk, int(task_id), 'Write docs')
+        )
+
+    def test_consecutive_saves_diff_against_the_last_save(self):
+        task = Task.objects.create(project=self.project, title='First')
+        task.title = 'Second'
+        task.save()
+        task.title = 'Third'
+        task.save()
+
+        self.assertEqual(
+            [changes for _, action, changes in self.events() if action == 'UPDATED'],
+            [{'title': ['First', 'Second']}, {'title': ['Second', 'Third']}]
+        )
+
+    def test_project_soft_delete_is_recorded(self):
+        self.execute('mutation($id: ID!) { deleteProject(id: $id) { success } }', id=self.project.pk)
+        self.assertEqual(self.events()[-1], ('PROJECT', 'DELETED', {}))
+
+    def test_bulk_updates_are_recorded(self):
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        tasks = [Task.objects.create(project=self.project, title=f'Task {i}') for i in range(3)]
+        Task.objects.filter(pk=tasks[2].pk).update(status='IN_PROGRESS')
+
+        self.client.post(reverse('admin:tasks_task_changelist'), {
+            'action': 'change_status', '_selected_action': [task.pk for task in tasks], 'status': 'BLOCKED',
+        })
+
+        Task.objects.filter(pk=tasks[0].pk).update(status='TODO', due_date=timezone.now() - timedelta(days=2))
+        escalate_tasks()
+
+        updates = list(ActivityEvent.objects.filter(action='UPDATED').order_by('id').values_list(
+            'object_id', 'changed_fields'
+        ))
+        self.assertEqual(updates, [
+            (tasks[0].pk, {'status': ['TODO', 'BLOCKED']}),
+            (tasks[1].pk, {'status': ['TODO', 'BLOCKED']}),
+            (tasks[2].pk, {'status': ['IN_PROGRESS', 'BLOCKED']}),
+            (tasks[0].pk, {'priority': ['MEDIUM', 'URGENT']}),
+        ])
+
+    def test_bulk_deletes_are_recorded(self):
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        tasks = [Task.objects.create(project=self.project, title=f'Task {i}') for i in range(2)]
+        comment = TaskComment.objects.create(task=tasks[0], content='Gone soon', author_email='dev@example.com')
+
+        self.client.post(reverse('admin:tasks_task_changelist'), {
+            'action': 'delete_selected', '_selected_action': [task.pk for task in tasks], 'post': 'yes',
+        })
+
+        deletions = list(ActivityEvent.objects.filter(action='DELETED').order_by('id').values_list(
+            'object_type', 'object_id'
+        ))
+        self.assertEqual(deletions, [('TASK', tasks[0].pk), ('TASK', tasks[1].pk), ('COMMENT', comment.pk)])
+        self.assertFalse(Task.objects.filter(project=self.project).exists())
+
+    def test_activity_feed_pages_newest_first(self):
+        other = Organization.objects.create(name='Other Org', contact_email='other@example.com')
+        Project.objects.create(organization=other, name='Elsewhere')
+        for index in range(4):
+            Task.objects.create(project=self.project, title=f'Task {index}')
+        query = '''
+            query($slug: String!, $after: String) {
+                activityFeed(organizationSlug: $slug, first: 2, after: $after) {
+                    hasMore endCursor events { objectType action objectRepr projectId }
+                }
+            }
+        '''
+
+        titles, cursor = [], None
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                page = self.execute(query, slug=self.org.slug, after=cursor)['activityFeed']
+            self.assertEqual(len(queries), 2)
+            titles += [event['objectRepr'] for event in page['events']]
+            cursor = page['endCursor']
+            if not page['hasMore']:
+                break
+
+        self.assertEqual(titles, ['Task 3', 'Task 2', 'Task 1', 'Task 0', 'Tracked'])
+
+    def test_purge_removes_activity(self):
+        purge_organization(self.org.pk, batch_size=1)
+        self.assertFalse(ActivityEvent.objects.exists())
+
+
+class RecentActivityCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.org = Organization.objects.create(name='Busy Org', contact_email='busy@example.com')
+        self.project = Project.objects.create(organization=self.org, name='Busy')
+        self.now = timezone.now()
+
+    def add_events(self, count, age):
+        ActivityEvent.objects.bulk_create([
+            ActivityEvent(
+                organization=self.org, object_type='TASK', object_id=index,
+                action='UPDATED', object_repr='Task', created_at=self.now - age,
+            )
+            for index in range(count)
+        ])
+
+    def test_counts_the_window_incrementally(self):
+        ActivityEvent.objects.all().delete()
+        self.add_events(2, timedelta(days=8))
+        self.add_events(3, timedelta(days=6, hours=23, minutes=30))
+        self.add_events(4, timedelta(days=1))
+        self.add_events(1, timedelta(seconds=5))
+
+        self.assertEqual(recent_activity_count(self.org, now=self.now), 8)
+
+        # An hour later the oldest three have left the window and two arrived
+        later = self.now + timedelta(hours=1)
+        self.now = later
+        self.add_events(2, timedelta(minutes=30))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(recent_activity_count(self.org, now=later), 7)
+
+        self.assertTrue(all('"activity_events"' in query['sql'] for query in queries))
+        self.assertEqual(cache.get(f'activity:recent:{self.org.pk}')[2], 7)
+
+        cache.clear()
+        self.assertEqual(recent_activity_count(self.org, now=later), 7)
+
+    def test_organization_stats(self):
+        Task.objects.create(project=self.project, title='New')
+        result = Client(schema).execute(
+            'query($slug: String!) { organizationStats(organizationSlug: $slug) { recentActivityCount } }',
+            variables={'slug': self.org.slug}
+        )
+        # The project and the task
+        self.assertEqual(result['data']['organizationStats']['recentActivityCount'], 2)
+
+
+class ChangesSinceTests(TestCase):
+    query = '''
+        query($slug: String!, $cursor: String, $first: Int) {
+            changesSince(organizationSlug: $slug, cursor: $cursor, first: $first) {
+                cursor hasMore
+                projects { name } tasks { title commentCount } comments { content }
+                deleted { objectType id }
+            }
+        }
+    '''
+
+    def setUp(self):
+        self.graphql = Client(schema)
+        self.org = Organization.objects.create(name='Sync Org', contact_email='sync@example.com')
+        self.project = Project.objects.create(organization=self.org, name='Synced')
+        self.task = Task.objects.create(project=self.project, title='Existing')
+        self.settle()
+
+    def settle(self):
+        ActivityEvent.objects.update(created_at=timezone.now() - SETTLE_TIME * 2)
+
+    def changes(self, cursor=None, first=100):
+        result = self.graphql.execute(self.query, variables={'slug': self.org.slug, 'cursor': cursor, 'first': first})
+        self.assertIsNone(result.get('errors'))
+        return result['data']['changesSince']
+
+    def delete_project(self):
+        result = self.graphql.execute(
+            'mutation($id: ID!) { deleteProject(id: $id) { success } }', variables={'id': self.project.pk}
+        )
+        self.assertIsNone(result.get('errors'))
+
+    def test_first_call_only_returns_a_cursor(self):
+        head = self.changes()
+        self.assertEqual(
+            (head['projects'], head['tasks'], head['comments'], head['deleted'], head['hasMore']),
+            ([], [], [], [], False)
+        )
+        self.assertEqual(self.changes(head['cursor'])['tasks'], [])
+
+    def test_upserts_are_sent_until_settled(self):
+        cursor = self.changes()['cursor']
+        TaskComment.objects.create(task=self.task, content='Looks good', author_email='dev@example.com')
+        self.task.title = 'Renamed'
+        self.task.save()
+
+        unsettled = self.changes(cursor)
+        self.assertEqual(unsettled['tasks'], [{'title': 'Renamed', 'commentCount': 1}])
+        self.assertEqual(unsettled['comments'], [{'content': 'Looks good'}])
+        # Recent events may still be joined by lower ids, so the cursor waits
+        self.assertEqual(unsettled['cursor'], cursor)
+
+        self.settle()
+        settled = self.changes(cursor)
+        self.assertEqual(len(settled['tasks']), 1)
+        self.assertNotEqual(settled['cursor'], cursor)
+        after = self.changes(settled['cursor'])
+        self.assertEqual((after['tasks'], after['comments']), ([], []))
+
+    def test_deletions_become_tombstones(self):
+        cursor = self.changes()['cursor']
+        other = Task.objects.create(project=self.project, title='Short lived')
+        other_id = other.pk
+        other.delete()
+        self.delete_project()
+
+        changes = self.changes(cursor)
+        self.assertEqual((changes['projects'], changes['tasks']), ([], []))
+        self.assertEqual(changes['deleted'], [
+            {'objectType': 'PROJECT', 'id': str(self.project.pk)},
+            {'objectType': 'TASK', 'id': str(other_id)},
+        ])
+
+    def test_deleted_task_takes_its_comments(self):
+        comment = TaskComment.objects.create(task=self.task, content='Cascaded', author_email='dev@example.com')
+        self.settle()
+        cursor = self.changes()['cursor']
+        task_id = self.task.pk
+        self.task.delete()
+        self.settle()
+
+        self.assertEqual(self.changes(cursor)['deleted'], [
+            {'objectType': 'TASK', 'id': str(task_id)},
+            {'objectType': 'COMMENT', 'id': str(comment.pk)},
+        ])
+
+    def test_deleted_project_tombstone_covers_its_tasks(self):
+        cursor = self.changes()['cursor']
+        self.delete_project()
+        self.settle()
+
+        # The tasks are hidden with the project but get no tombstones of their own
+        changes = self.changes(cursor)
+        self.assertEqual((changes['tasks'], changes['comments']), ([], []))
+        self.assertEqual(changes['deleted'], [{'objectType': 'PROJECT', 'id': str(self.project.pk)}])
+
+    def test_deleted_organization_has_no_changes(self):
+        cursor = self.changes()['cursor']
+        self.org.soft_delete()
+
+        result = self.graphql.execute(self.query, variables={'slug': self.org.slug, 'cursor': cursor})
+        self.assertEqual(result, {'data': {'changesSince': None}})
+
+    def test_archived_tasks_become_tombstones_until_restored(self):
+        comment = TaskComment.objects.create(task=self.task, content='Old news', author_email='dev@example.com')
+        self.settle()
+        cursor = self.changes()['cursor']
+        created = OrganizationDailyCounts.objects.get(organization=self.org)
+
+        archive_project(self.project.pk)
+        self.settle()
+        archived = self.changes(cursor)
+        self.assertEqual((archived['projects'], archived['tasks']), ([{'name': 'Synced'}], []))
+        self.assertEqual(archived['deleted'], [
+            {'objectType': 'TASK', 'id': str(self.task.pk)},
+            {'objectType': 'COMMENT', 'id': str(comment.pk)},
+        ])
+
+        restore_project(self.project.pk)
+        self.settle()
+        restored = self.changes(archived['cursor'])
+        self.assertEqual(restored['tasks'], [{'title': 'Existing', 'commentCount': 1}])
+        self.assertEqual((restored['comments'], restored['deleted']), ([{'content': 'Old news'}], []))
+        # Moving rows back and forth does not count as creating them
+        counts = OrganizationDailyCounts.objects.get(organization=self.org)
+        self.assertEqual(
+            (counts.tasks_created, counts.comments_created), (created.tasks_created, created.comments_created)
+        )
+
+    def test_pages_through_a_backlog(self):
+        cursor = self.changes()['cursor']
+        for index in range(5):
+            Task.objects.create(project=self.project, title=f'Task {index}')
+        self.settle()
+
+        titles = []
+        with CaptureQueriesContext(connection) as queries:
+            while True:
+                page = self.changes(cursor, first=2)
+                titles += [task['title'] for task in page['tasks']]
+                cursor = page['cursor']
+                if not page['hasMore']:
+                    break
+
+        self.assertEqual(sorted(titles), [f'Task {index}' for index in range(5)])
+        self.assertEqual(self.changes(cursor)['tasks'], [])
+        # No query per task for comment counts
+        self.assertLessEqual(len(queries), 3 * 6)
+
+    def test_invalid_cursor(self):
+        result = self.graphql.execute(self.query, variables={'slug': self.org.slug, 'cursor': 'nope'})
+        self.assertEqual(result['errors'][0]['extensions']['code'], 'INVALID_CURSOR')
@@ -0,0 +1,174 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apps.organizations.models import Organization
+from apps.projects.models import Project
+from apps.tasks.admin import EstimatedCountPaginator, estimate_count
+from apps.tasks.models import Task, TaskComment
+
+
+class ChangelistQueryTests(TestCase):
+    def setUp(self):
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        self.org = Organization.objects.create(name='Admin Org', contact_email='admin@example.com')
+
+    def add_projects(self, count):
+        for _ in range(count):
+            project = Project.objects.create(
+                organization=self.org, name=f'Project {Project.all_objects.count()}'
+            )
+            for status in ['TODO', 'DONE', 'DONE']:
+                task = Task.objects.create(project=project, title=f'Task {status}', status=status)
+                TaskComment.objects.create(task=task, content='Looks good', author_email='dev@example.com')
+
+    def count_queries(self, url_name, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(url_name), params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assert_constant_queries(self, url_name):
+        self.add_projects(2)
+        few = self.count_queries(url_name)
+        self.add_projects(4)
+        many = self.count_queries(url_name)
+        self.assertEqual(few, many)
+
+    def test_project_changelist(self):
+        self.assert_constant_queries('admin:projects_project_changelist')
+
+    def test_task_changelist(self):
+        self.assert_constant_queries('admin:tasks_task_changelist')
+
+    def test_comment_changelist(self):
+        self.assert_constant_queries('admin:tasks_taskcomment_changelist')
+
+    def test_organization_changelist(self):
+        for index in range(3):
+            Organization.objects.create(name=f'Other Org {index}', contact_email='other@example.com')
+        few = self.count_queries('admin:organizations_organization_changelist')
+        for index in range(3, 9):
+            Organization.objects.create(name=f'Other Org {index}', contact_email='other@example.com')
+        self.assertEqual(self.count_queries('admin:organizations_organization_changelist'), few)
+
+    def test_projects_sort_by_annotated_counts(self):
+        self.add_projects(2)
+        busy = Project.objects.get(name='Project 0')
+        Task.objects.create(project=busy, title='Extra task')
+
+        url = reverse('admin:projects_project_changelist')
+        list_display = self.client.get(url).context['cl'].list_display
+        for column, expected in [('task_count', [4, 3]), ('completion_percentage', [50.0, 66.7])]:
+            response = self.client.get(url, {'o': list_display.index(column)})
+            values = [getattr(response.context['cl'].model_admin, column)(project)
+                      for project in response.context['cl'].result_list]
+            self.assertEqual(values, sorted(expected))
+
+    def test_change_pages_use_annotations(self):
+        self.add_projects(1)
+        project = Project.objects.get()
+        task = project.tasks.first()
+
+        for url in [
+            reverse('admin:projects_project_change', args=[project.pk]),
+            reverse('admin:tasks_task_change', args=[task.pk]),
+            reverse('admin:organizations_organization_change', args=[self.org.pk]),
+        ]:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.get(reverse('admin:projects_project_change', args=[project.pk]))
+        self.assertContains(response, '66.7')
+
+
+class LargeTableAdminTests(TestCase):
+    def setUp(self):
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        self.org = Organization.objects.create(name='Big Org', contact_email='big@example.com')
+        self.project = Project.objects.create(organization=self.org, name='Big Project')
+        self.other = Project.objects.create(organization=self.org, name='Hidden Project')
+        self.tasks = [
+            Task.objects.create(project=self.project, title=f'Task {status}', status=status)
+            for status in ['TODO', 'IN_PROGRESS', 'DONE', 'BLOCKED']
+        ]
+
+    def test_paginator_uses_estimate_above_threshold(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE tasks')
+
+        estimate = estimate_count(Task.objects.all())
+        self.assertEqual(estimate, 4)
+        self.assertIsInstance(estimate_count(Task.objects.filter(status='DONE')), int)
+
+        with override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(EstimatedCountPaginator(Task.objects.all(), 10).count, 4)
+            self.assertFalse(any('COUNT(' in query['sql'] for query in queries))
+        with override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=10 ** 9):
+            self.assertEqual(EstimatedCountPaginator(Task.objects.filter(status='DONE'), 10).count, 1)
+
+    def test_project_filter_is_autocomplete(self):
+        url = reverse('admin:tasks_task_changelist')
+        response = self.client.get(url, {'project__id__exact': self.project.pk})
+
+        self.assertEqual(len(response.context['cl'].result_list), 4)
+        self.assertContains(response, 'data-ajax--url="/admin/autocomplete/"')
+        self.assertContains(response, 'tasks/autocomplete_filter.js')
+        self.assertNotContains(response, 'Hidden Project')
+
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'tasks', 'model_name': 'task', 'field_name': 'project', 'term': 'Hidden',
+        })
+        self.assertEqual([result['text'] for result in response.json()['results']], ['Big Org - Hidden Project'])
+
+    @override_settings(ADMIN_COMMENT_INLINE_LIMIT=3)
+    def test_comment_inline_is_limited(self):
+        task = self.tasks[0]
+        for index in range(5):
+            TaskComment.objects.create(task=task, content=f'Comment {index}', author_email='dev@example.com')
+
+        response = self.client.get(reverse('admin:tasks_task_change', args=[task.pk]))
+
+        formset = response.context['inline_admin_formsets'][0].formset
+        self.assertEqual([form.instance.content for form in formset.forms], ['Comment 4', 'Comment 3', 'Comment 2'])
+        self.assertContains(response, 'View all 5 comments')
+
+    def post_action(self, action, tasks, follow=False, **data):
+        return self.client.post(reverse('admin:tasks_task_changelist'), {
+            'action': action, '_selected_action': [task.pk for task in tasks], **data,
+        }, follow=follow)
+
+    def test_change_status_respects_transitions(self):
+        self.org.refresh_from_db()
+        version = self.org.data_version
+        with CaptureQueriesContext(connection) as queries:
+            self.post_action('change_status', self.tasks, status='TODO')
+
+        self.assertEqual(
+            list(Task.objects.order_by('id').values_list('status', flat=True)),
+            ['TODO', 'TODO', 'DONE', 'TODO']
+        )
+        self.assertEqual(sum(query['sql'].startswith('UPDATE "tasks"') for query in queries), 1)
+        self.org.refresh_from_db()
+        self.assertEqual(self.org.data_version, version + 1)
+
+    def test_change_status_reports_skipped_tasks(self):
+        response = self.post_action('change_status', self.tasks, follow=True, status='TODO')
+        self.assertContains(
+            response, '2 tasks changed to To Do. 1 tasks cannot move to that status and were left unchanged.'
+        )
+
+        # Tasks already in the status are not reported as skipped
+        response = self.post_action('change_status', self.tasks[:2], follow=True, status='TODO')
+        self.assertContains(response, '0 tasks changed to To Do.')
+        self.assertNotContains(response, 'cannot move')
+
+    def test_reassign(self):
+        self.post_action('reassign', self.tasks[:2], assignee_email='new@example.com')
+        self.assertEqual(Task.objects.filter(assignee_email='new@example.com').count(), 2)
+
+        response = self.post_action('reassign', self.tasks, assignee_email='someone@tempmail.com', follow=True)
+        self.assertContains(response, 'is not allowed')
+        self.assertFalse(Task.objects.filter(assignee_email='someone@tempmail.com').exists())
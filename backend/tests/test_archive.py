@@ -0,0 +1,93 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from graphene.test import Client
+from graphql_api.schema import schema
+from apps.organizations.models import Organization
+from apps.projects.deletion import purge_project
+from apps.projects.models import Project
+from apps.tasks.archive import archive_project
+from apps.tasks.models import ArchivedTask, ArchivedTaskComment, Task, TaskComment
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.client = Client(schema)
+        self.org = Organization.objects.create(name='Archive Org', contact_email='archive@example.com')
+        self.project = Project.objects.create(organization=self.org, name='Finished', description='Done')
+        self.active = Project.objects.create(organization=self.org, name='Running', description='Ongoing')
+        for i in range(3):
+            task = Task.objects.create(project=self.project, title=f'Closed {i}', status='DONE' if i else 'TODO')
+            TaskComment.objects.create(task=task, content='Note', author_email='a@example.com')
+        Task.objects.create(project=self.active, title='Open task')
+        self.project.status = 'CANCELLED'
+        self.project.save()
+
+    def test_archive_command_moves_old_closed_projects(self):
+        Project.objects.filter(pk=self.project.pk).update(updated_at=timezone.now() - timedelta(days=40))
+
+        out = StringIO()
+        call_command('archive_tasks', days=30, stdout=out)
+
+        self.assertIn('Archived 1 projects (3 tasks, 3 comments)', out.getvalue())
+        self.assertEqual(Task.objects.filter(project=self.project).count(), 0)
+        self.assertEqual(ArchivedTask.objects.filter(project=self.project).count(), 3)
+        self.assertEqual(ArchivedTaskComment.objects.count(), 3)
+        self.assertIsNotNone(Project.objects.get(pk=self.project.pk).archived_at)
+        self.assertEqual(Task.objects.filter(project=self.active).count(), 1)
+
+    def test_recently_closed_projects_stay_hot(self):
+        call_command('archive_tasks', days=30, stdout=StringIO())
+        self.assertEqual(ArchivedTask.objects.count(), 0)
+
+    def test_include_archived(self):
+        archive_project(self.project.pk)
+        query = '''
+            query($slug: String!, $archived: Boolean!) {
+                tasks(organizationSlug: $slug, includeArchived: $archived) { title isArchived commentCount }
+            }
+        '''
+        result = self.client.execute(query, variables={'slug': self.org.slug, 'archived': False})
+        self.assertEqual(result['data']['tasks'], [{'title': 'Open task', 'isArchived': False, 'commentCount': 0}])
+
+        result = self.client.execute(query, variables={'slug': self.org.slug, 'archived': True})
+        self.assertEqual(len(result['data']['tasks']), 4)
+        archived = [task for task in result['data']['tasks'] if task['isArchived']]
+        self.assertEqual({task['commentCount'] for task in archived}, {1})
+
+        query = '''
+            query($id: ID!, $archived: Boolean!) {
+                project(id: $id, includeArchived: $archived) { taskCount completedTaskCount archivedAt }
+            }
+        '''
+        result = self.client.execute(query, variables={'id': self.project.pk, 'archived': False})
+        self.assertEqual(result['data']['project']['taskCount'], 0)
+        self.assertIsNotNone(result['data']['project']['archivedAt'])
+        result = self.client.execute(query, variables={'id': self.project.pk, 'archived': True})
+        self.assertEqual(result['data']['project']['taskCount'], 3)
+        self.assertEqual(result['data']['project']['completedTaskCount'], 2)
+
+    def test_reactivating_restores_tasks(self):
+        task_ids = set(Task.objects.filter(project=self.project).values_list('id', flat=True))
+        archive_project(self.project.pk)
+
+        project = Project.objects.get(pk=self.project.pk)
+        project.status = 'ACTIVE'
+        project.save()
+
+        self.assertIsNone(Project.objects.get(pk=self.project.pk).archived_at)
+        self.assertEqual(set(Task.objects.filter(project=self.project).values_list('id', flat=True)), task_ids)
+        self.assertEqual(TaskComment.objects.filter(task__project=self.project).count(), 3)
+        self.assertEqual(ArchivedTask.objects.count(), 0)
+        self.assertEqual(ArchivedTaskComment.objects.count(), 0)
+
+    def test_purge_removes_archived_rows(self):
+        archive_project(self.project.pk)
+        self.project.soft_delete()
+
+        counts = purge_project(self.project.pk, batch_size=2)
+
+        self.assertEqual(counts, {'comments': 3, 'tasks': 3, 'projects': 1})
+        self.assertEqual(ArchivedTask.objects.count(), 0)
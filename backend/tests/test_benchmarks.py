@@ -0,0 +1,176 @@
+import asyncio
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import skipUnless
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, LiveServerTestCase
+from benchmarks.datasets import get_scale, seed_dataset, clear_dataset
+from benchmarks.documents import extract_documents
+from benchmarks.explain import ExplainRunner, PlanAnalyzer, capture_operation, render_meta_indexes
+from benchmarks.load import LoadHarness, discover_fixture
+from benchmarks.operations import get_operations, load_fixture
+from benchmarks.runner import BenchmarkRunner, compare_reports, percentile
+from apps.organizations.models import Organization
+from apps.tasks.models import Task
+
+
+class BenchmarkDatasetTests(TestCase):
+    def test_seed_dataset_builds_requested_scale(self):
+        totals = seed_dataset(get_scale('tiny'))
+
+        self.assertEqual(totals['organizations'], 2)
+        self.assertEqual(totals['projects'], 4)
+        self.assertEqual(totals['tasks'], 40)
+        self.assertEqual(Task.objects.count(), 40)
+
+    def test_seed_dataset_is_reproducible(self):
+        seed_dataset(get_scale('tiny'), seed=7)
+        first = list(Task.objects.order_by('id').values_list('title', 'status', 'priority'))
+        clear_dataset()
+        self.assertFalse(Organization.objects.exists())
+
+        seed_dataset(get_scale('tiny'), seed=7)
+        second = list(Task.objects.order_by('id').values_list('title', 'status', 'priority'))
+        self.assertEqual(first, second)
+
+
+class BenchmarkRunnerTests(TestCase):
+    def setUp(self):
+        seed_dataset(get_scale('tiny'))
+        self.fixture = load_fixture()
+
+    def test_run_reports_every_operation(self):
+        runner = BenchmarkRunner(self.fixture, iterations=2, warmup=0)
+        report = runner.run(get_operations())
+
+        self.assertEqual(set(report['operations']), {op.name for op in get_operations()})
+        for result in report['operations'].values():
+            self.assertGreater(result['queries'], 0)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+
+    def test_mutations_are_rolled_back(self):
+        runner = BenchmarkRunner(self.fixture, iterations=2, warmup=0)
+        count = Task.objects.count()
+        runner.run(get_operations(['create_task']))
+        self.assertEqual(Task.objects.count(), count)
+
+    def test_compare_reports_flags_regressions(self):
+        baseline = {'operations': {'projects': {'p50_ms': 10, 'p95_ms': 10, 'queries': 3, 'peak_memory_kb': 100}}}
+        current = {'operations': {'projects': {'p50_ms': 12, 'p95_ms': 15, 'queries': 4, 'peak_memory_kb': 100}}}
+
+        comparison = compare_reports(baseline, current, threshold=10)
+        self.assertEqual(comparison['projects']['regressions'], ['p95_ms', 'queries'])
+
+    def test_percentile(self):
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 50), 3)
+        self.assertEqual(percentile([1, 2], 100), 2)
+
+
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN analysis needs PostgreSQL')
+class ExplainTests(TestCase):
+    def setUp(self):
+        seed_dataset(get_scale('tiny'))
+        self.fixture = load_fixture()
+
+    def test_findings_merge_partitions_and_flag_problems(self):
+        scan = {
+            'Node Type': 'Seq Scan', 'Relation Name': 'tasks_p0', 'Filter': "((status)::text = 'TODO'::text)",
+            'Plan Rows': 10, 'Actual Rows': 600, 'Rows Removed by Filter': 100, 'Actual Loops': 1,
+        }
+        plan = [{'Plan': {
+            'Node Type': 'Sort', 'Sort Key': ['tasks.created_at DESC'], 'Sort Space Type': 'Disk',
+            'Sort Space Used': 2048, 'Plan Rows': 20, 'Actual Rows': 1200, 'Actual Loops': 1,
+            'Plans': [{
+                'Node Type': 'Append', 'Plan Rows': 20, 'Actual Rows': 1200, 'Actual Loops': 1,
+                'Plans': [scan, dict(scan, **{'Relation Name': 'tasks_p1'})],
+            }],
+        }}]
+        findings = PlanAnalyzer(min_rows=1000).findings(plan)
+
+        self.assertEqual(findings[0], {
+            'type': 'seq_scan', 'relation': 'tasks', 'filter': "((status)::text = '?'::text)", 'rows_scanned': 1400,
+        })
+        self.assertIn({'type': 'sort_spill', 'sort_key': ['tasks.created_at DESC'], 'space_kb': 2048}, findings)
+        self.assertEqual({f['node'] for f in findings if f['type'] == 'row_estimate'}, {'Sort', 'Append'})
+
+    def test_proposed_index(self):
+        analyzer = PlanAnalyzer()
+        model, index = analyzer.propose_index({
+            'relation': 'tasks', 'filter': "((status)::text = '?'::text) AND (due_date < '?')",
+            'sort_key': ['tasks.created_at DESC'],
+        })
+        self.assertEqual(index.fields, ['status', 'due_date', '-created_at'])
+        self.assertIsNone(analyzer.propose_index({'relation': 'tasks', 'filter': '(project_id = 1)'}))
+
+        self.assertEqual(render_meta_indexes([(model, index)]), {
+            'tasks.Task': [f"models.Index(fields=['status', 'due_date', '-created_at'], name='{index.name}')"],
+        })
+
+    def test_queries_are_attributed_to_resolvers(self):
+        operation = get_operations(['task_with_comments'])[0]
+        queries = capture_operation(operation, self.fixture)
+
+        self.assertIn('Query.task', {query['resolver'] for query in queries})
+        report = ExplainRunner(timing=False).run(queries)
+        self.assertTrue(report['queries'])
+        for entry in report['queries']:
+            self.assertEqual(entry['operation'], 'task_with_comments')
+            self.assertIn('findings', entry)
+            self.assertNotIn('execution_ms', entry)
+
+    def test_command_reads_query_log(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log = os.path.join(directory, 'queries.jsonl')
+            with open(log, 'w') as f:
+                f.write(json.dumps({
+                    'resolver': 'Query.tasks', 'sql': 'SELECT id FROM tasks WHERE status = %s', 'params': ['TODO'],
+                }) + '\n')
+            output = os.path.join(directory, 'report.json')
+            stderr = StringIO()
+            call_command('explain_operations', log=log, output=output, min_rows=0, stdout=StringIO(), stderr=stderr)
+
+            with open(output) as f:
+                report = json.load(f)
+        self.assertEqual(report['queries'][0]['resolver'], 'Query.tasks')
+        self.assertEqual(report['proposed_indexes'][0]['fields'], ['status'])
+        self.assertEqual(list(report['meta_indexes']), ['tasks.Task'])
+        self.assertIn("Meta.indexes, then run makemigrations", stderr.getvalue())
+        self.assertIn("models.Index(fields=['status']", stderr.getvalue())
+
+class FrontendDocumentTests(TestCase):
+    def test_extracts_frontend_operations(self):
+        documents = {doc.operation_name: doc for doc in extract_documents()}
+
+        self.assertIn('GetTasks', documents)
+        self.assertIn('UpdateTask', documents)
+        self.assertTrue(documents['UpdateTask'].is_mutation)
+        self.assertEqual(documents['GetTask'].variables, ['id'])
+        self.assertTrue(documents['GetProjects'].is_valid)
+
+
+class LoadHarnessTests(LiveServerTestCase):
+    def setUp(self):
+        seed_dataset(get_scale('tiny'))
+        self.url = f'{self.live_server_url}/graphql/'
+
+    def test_harness_replays_mix_over_reused_connections(self):
+        fixture = asyncio.run(discover_fixture(self.url))
+        harness = LoadHarness(
+            self.url,
+            extract_documents(),
+            fixture,
+            concurrency=2,
+            write_ratio=0.5,
+            total_requests=20,
+        )
+        report = asyncio.run(harness.run())
+
+        self.assertEqual(report['totals']['requests'], 20)
+        self.assertEqual(report['totals']['errors'], 0)
+        self.assertEqual(report['totals']['connections'], 2)
+        self.assertNotIn('GetOrganizations', harness.skipped)
+        self.assertIn('DeleteTask', harness.skipped)
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from graphene.test import Client
+from graphql_api.schema import schema
+from apps.jobs.models import Job
+from apps.jobs.worker import claim_jobs, execute_job
+from apps.organizations.models import Organization
+from apps.projects.dashboard import dashboard_stats, refresh_dashboard_stats
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+
+@override_settings(DASHBOARD_STATS_MIN_TASKS=0, DASHBOARD_STATS_MAX_AGE=600)
+class DashboardStatsTests(TestCase):
+    query = '''
+        query($slug: String!, $projectId: ID, $maxAge: Int) {
+            projectStats(organizationSlug: $slug, maxAge: $maxAge) { totalProjects completedProjects asOf }
+            taskStats(organizationSlug: $slug, projectId: $projectId, maxAge: $maxAge) {
+                totalTasks doneTasks overdueTasks completionRate asOf
+            }
+        }
+    '''
+
+    def setUp(self):
+        self.org = Organization.objects.create(name='Dashboard Org', contact_email='dash@example.com')
+        self.project = Project.objects.create(organization=self.org, name='Tracked')
+        Project.objects.create(organization=self.org, name='Finished', status='COMPLETED')
+        Task.objects.create(project=self.project, title='Done', status='DONE')
+        late = Task.objects.create(project=self.project, title='Late')
+        Task.objects.filter(pk=late.pk).update(overdue=True)
+        Task.objects.create(project=self.project, title='Open')
+        refresh_dashboard_stats()
+
+    def stats(self, **variables):
+        result = Client(schema).execute(self.query, variables={'slug': self.org.slug, **variables})
+        self.assertIsNone(result.get('errors'))
+        return result['data']
+
+    def test_stats_are_read_from_the_views(self):
+        Task.objects.create(project=self.project, title='After the refresh')
+
+        stats = self.stats()
+        self.assertIsNotNone(stats['taskStats']['asOf'])
+        self.assertEqual(
+            (stats['projectStats']['totalProjects'], stats['projectStats']['completedProjects']), (2, 1)
+        )
+        self.assertEqual(
+            {key: stats['taskStats'][key] for key in ['totalTasks', 'doneTasks', 'overdueTasks', 'completionRate']},
+            {'totalTasks': 3, 'doneTasks': 1, 'overdueTasks': 1, 'completionRate': 33.3}
+        )
+        self.assertEqual(self.stats(projectId=self.project.pk)['taskStats']['totalTasks'], 3)
+
+        refresh_dashboard_stats()
+        self.assertEqual(self.stats()['taskStats']['totalTasks'], 4)
+
+    def test_live_stats_when_asked_stale_or_small(self):
+        Task.objects.create(project=self.project, title='After the refresh')
+
+        live = self.stats(maxAge=0)['taskStats']
+        self.assertEqual((live['totalTasks'], live['asOf']), (4, None))
+
+        self.assertIsNotNone(dashboard_stats(self.org))
+        self.assertIsNone(dashboard_stats(self.org, now=timezone.now() + timedelta(seconds=601)))
+
+        with override_settings(DASHBOARD_STATS_MIN_TASKS=10):
+            self.assertEqual(self.stats()['taskStats']['totalTasks'], 4)
+
+    def test_organizations_missing_from_the_views_are_aggregated_live(self):
+        other = Organization.objects.create(name='New Org', contact_email='new@example.com')
+        Project.objects.create(organization=other, name='Fresh')
+
+        self.assertIsNone(dashboard_stats(other))
+        result = Client(schema).execute(
+            'query($slug: String!) { projectStats(organizationSlug: $slug) { totalProjects asOf } }',
+            variables={'slug': other.slug}
+        )
+        self.assertEqual(result['data']['projectStats'], {'totalProjects': 1, 'asOf': None})
+
+    def test_command_and_job(self):
+        out = StringIO()
+        call_command('refresh_dashboard_stats', stdout=out)
+        self.assertIn('Refreshed 2 views', out.getvalue())
+
+        call_command('refresh_dashboard_stats', queue=True, stdout=StringIO())
+        job = Job.objects.get(name='projects.refresh_dashboard_stats')
+        self.assertEqual(claim_jobs('test', 1), [job.pk])
+        self.assertEqual(execute_job(job.pk), 'COMPLETED')
@@ -0,0 +1,77 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from graphene.test import Client
+from graphql_api.schema import schema
+from apps.jobs.models import Job
+from apps.organizations.jobs import delete_organization
+from apps.organizations.models import Organization
+from apps.projects.deletion import purge_project
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskComment
+
+
+class DeletionTests(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name='Deletion Org', contact_email='del@example.com')
+        self.project = Project.objects.create(organization=self.org, name='Doomed', description='To delete')
+        self.other = Project.objects.create(organization=self.org, name='Kept', description='Stays')
+        for i in range(5):
+            task = Task.objects.create(project=self.project, title=f'Task {i}')
+            TaskComment.objects.create(task=task, content='Comment', author_email='a@example.com')
+        Task.objects.create(project=self.other, title='Other task')
+
+    def test_soft_deleted_project_is_hidden(self):
+        version = Organization.objects.get(pk=self.org.pk).data_version
+        self.project.soft_delete()
+
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertEqual(self.org.projects.count(), 1)
+        self.assertEqual(Task.objects.visible().count(), 1)
+        self.assertEqual(TaskComment.objects.visible().count(), 0)
+        self.assertGreater(Organization.objects.get(pk=self.org.pk).data_version, version)
+
+        result = Client(schema).execute(
+            'query($slug: String!) { tasks(organizationSlug: $slug) { title } }',
+            variables={'slug': self.org.slug}
+        )
+        self.assertEqual(result['data']['tasks'], [{'title': 'Other task'}])
+
+    def test_purge_project_in_batches(self):
+        self.project.soft_delete()
+        progress = []
+
+        counts = purge_project(self.project.pk, batch_size=2, progress=progress.append)
+
+        self.assertEqual(counts, {'comments': 5, 'tasks': 5, 'projects': 1})
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual(progress[-1], 100)
+        self.assertGreater(len(progress), 6)
+        self.assertFalse(Project.all_objects.filter(pk=self.project.pk).exists())
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(TaskComment.objects.count(), 0)
+
+    def test_delete_organization_job(self):
+        queued = delete_organization.enqueue(organization_id=self.org.pk)
+        call_command('run_jobs', processes=0, burst=True, stdout=StringIO())
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'COMPLETED')
+        self.assertEqual(queued.result['projects'], 2)
+        self.assertEqual(queued.result['organizations'], 1)
+        self.assertFalse(Organization.all_objects.filter(pk=self.org.pk).exists())
+        self.assertEqual(Task.objects.count(), 0)
+
+    def test_admin_delete_queues_job(self):
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+
+        url = reverse('admin:projects_project_delete', args=[self.project.pk])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.post(url, {'post': 'yes'})
+
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        job = Job.objects.get(name='projects.delete_project')
+        self.assertEqual(job.args, {'project_id': self.project.pk})
@@ -0,0 +1,117 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from graphene.test import Client
+from graphql_api.schema import schema
+from apps.jobs.models import Job
+from apps.jobs.worker import claim_jobs, execute_job
+from apps.organizations.models import Organization
+from apps.projects.models import Project
+from apps.tasks.escalation import escalate_tasks
+from apps.tasks.models import Task
+
+
+class EscalationTests(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name='Escalation Org', contact_email='esc@example.com')
+        self.project = Project.objects.create(organization=self.org, name='Deadlines')
+        self.now = timezone.now()
+
+    def task(self, title, days, status='TODO', priority='MEDIUM'):
+        task = Task.objects.create(project=self.project, title=title, priority=priority)
+        # Past due dates and closed statuses cannot be saved through the model
+        Task.objects.filter(pk=task.pk).update(
+            due_date=self.now + timedelta(days=days) if days is not None else None, status=status
+        )
+        task.refresh_from_db()
+        return task
+
+    def test_priorities_match_auto_assign_priority(self):
+        tasks = [
+            self.task('Late', -2),
+            self.task('Tomorrow', 1, priority='LOW'),
+            self.task('Soon', 3),
+            self.task('Later', 10, status='IN_PROGRESS'),
+            self.task('Undated', None),
+            self.task('Finished', -2, status='DONE', priority='LOW'),
+        ]
+
+        counts = escalate_tasks(batch_size=2, now=self.now)
+
+        for task in tasks[:5]:
+            task.auto_assign_priority()
+        expected = [task.priority for task in tasks]
+        tasks = Task.objects.filter(pk__in=[task.pk for task in tasks]).order_by('id')
+        self.assertEqual([task.priority for task in tasks], expected)
+        self.assertEqual([task.overdue for task in tasks], [True, False, False, False, False, False])
+        # 'Soon' already had the right priority
+        self.assertEqual(counts, {'examined': 4, 'updated': 3})
+
+    def test_unchanged_tasks_are_not_rewritten(self):
+        self.task('Late', -2)
+        escalate_tasks(now=self.now)
+        self.org.refresh_from_db()
+        version = self.org.data_version
+
+        with CaptureQueriesContext(connection) as queries:
+            counts = escalate_tasks(batch_size=10, now=self.now)
+
+        self.assertEqual(counts['updated'], 0)
+        self.assertEqual(sum(query['sql'].startswith('UPDATE "tasks"') for query in queries), 1)
+        self.org.refresh_from_db()
+        self.assertEqual(self.org.data_version, version)
+
+    def test_stale_flags_are_cleared(self):
+        task = self.task('Late', -2)
+        escalate_tasks(now=self.now)
+        Task.objects.filter(pk=task.pk).update(status='DONE')
+
+        escalate_tasks(now=self.now)
+
+        task.refresh_from_db()
+        self.assertFalse(task.overdue)
+        self.org.refresh_from_db()
+        self.assertGreater(self.org.data_version, 0)
+
+    def test_save_keeps_flag_current(self):
+        task = self.task('Late', -2, status='IN_PROGRESS')
+        escalate_tasks(now=self.now)
+        task.refresh_from_db()
+        self.assertTrue(task.overdue)
+
+        task.status = 'DONE'
+        task.save(update_fields=['status'])
+        self.assertFalse(Task.objects.get(pk=task.pk).overdue)
+
+    def test_stats_count_flagged_tasks(self):
+        self.task('Late', -2)
+        self.task('Later', 5)
+        query = '''
+            query($slug: String!) { taskStats(organizationSlug: $slug) { overdueTasks } }
+        '''
+        client = Client(schema)
+
+        before = client.execute(query, variables={'slug': self.org.slug})
+        escalate_tasks(now=self.now)
+        after = client.execute(query, variables={'slug': self.org.slug})
+
+        self.assertEqual(before['data']['taskStats']['overdueTasks'], 0)
+        self.assertEqual(after['data']['taskStats']['overdueTasks'], 1)
+
+    def test_command_and_job(self):
+        self.task('Late', -2)
+
+        out = StringIO()
+        call_command('escalate_tasks', stdout=out)
+        self.assertIn('Examined 1 open tasks, updated 1', out.getvalue())
+
+        call_command('escalate_tasks', queue=True, stdout=StringIO())
+        job = Job.objects.get(name='tasks.escalate_overdue_tasks')
+        self.assertEqual(claim_jobs('test', 1), [job.pk])
+        self.assertEqual(execute_job(job.pk), 'COMPLETED')
+        job.refresh_from_db()
+        self.assertEqual(job.result, {'examined': 1, 'updated': 0})
@@ -1,6 +1,9 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from graphene.test import Client
 from graphql_api.schema import schema
+from apps.tasks.archive import archive_project
 from apps.organizations.models import Organization
 from apps.projects.models import Project
 from apps.tasks.models import Task, TaskComment
@@ -174,4 +177,198 @@ class GraphQLMutationTests(TestCase):
         data = result['data']['createProject']
         self.assertFalse(data['success'])
         self.assertIn('Organization not found', data['errors'])
-        self.assertIsNone(data['project'])
\ No newline at end of file
+        self.assertIsNone(data['project'])
+
+class TaskBoardTests(TestCase):
+    BOARD_QUERY = '''
+        query($projectId: ID!, $perColumn: Int, $priorityOrder: Boolean) {
+            taskBoard(projectId: $projectId, perColumn: $perColumn, priorityOrder: $priorityOrder) {
+                columns { status label totalCount hasMore endCursor tasks { title } }
+            }
+        }
+    '''
+    COLUMN_QUERY = '''
+        query($projectId: ID!, $status: String!, $first: Int, $after: String, $priorityOrder: Boolean) {
+            taskBoardColumn(projectId: $projectId, status: $status, first: $first,
+                            after: $after, priorityOrder: $priorityOrder) {
+                totalCount hasMore endCursor tasks { title }
+            }
+        }
+    '''
+    
+    def setUp(self):
+        self.client = Client(schema)
+        self.org = Organization.objects.create(name='Board Org', contact_email='board@example.com')
+        self.project = Project.objects.create(organization=self.org, name='Board')
+        priorities = ['LOW', 'URGENT', 'MEDIUM', 'HIGH', 'LOW']
+        for index, priority in enumerate(priorities):
+            Task.objects.create(project=self.project, title=f'Todo {index}', priority=priority)
+        Task.objects.create(project=self.project, title='Working', status='IN_PROGRESS')
+        # Cursors must page correctly through tasks created at the same instant
+        Task.objects.filter(title__in=['Todo 1', 'Todo 2']).update(
+            created_at=Task.objects.get(title='Todo 1').created_at
+        )
+    
+    def board(self, **variables):
+        result = self.client.execute(self.BOARD_QUERY, variables={'projectId': self.project.pk, **variables})
+        self.assertIsNone(result.get('errors'))
+        return result['data']['taskBoard']['columns']
+    
+    def column(self, **variables):
+        result = self.client.execute(self.COLUMN_QUERY, variables={
+            'projectId': self.project.pk, 'status': 'TODO', **variables
+        })
+        self.assertIsNone(result.get('errors'))
+        return result['data']['taskBoardColumn']
+    
+    def titles(self, column):
+        return [task['title'] for task in column['tasks']]
+    
+    def test_columns_follow_status_choices(self):
+        with CaptureQueriesContext(connection) as queries:
+            columns = self.board(perColumn=2)
+        
+        self.assertEqual([column['status'] for column in columns], ['TODO', 'IN_PROGRESS', 'DONE', 'BLOCKED'])
+        self.assertEqual(columns[0]['label'], 'To Do')
+        self.assertEqual([column['totalCount'] for column in columns], [5, 1, 0, 0])
+        self.assertEqual([column['hasMore'] for column in columns], [True, False, False, False])
+        self.assertEqual(self.titles(columns[0]), ['Todo 4', 'Todo 3'])
+        self.assertEqual(self.titles(columns[1]), ['Working'])
+        self.assertIsNone(columns[2]['endCursor'])
+        # The project lookup and one windowed query for every column
+        self.assertEqual(len(queries), 2)
+        self.assertIn('ROW_NUMBER() OVER (PARTITION BY "tasks"."status"', queries[1]['sql'])
+    
+    def test_priority_order(self):
+        columns = self.board(perColumn=3, priorityOrder=True)
+        self.assertEqual(self.titles(columns[0]), ['Todo 1', 'Todo 3', 'Todo 2'])
+    
+    def test_cursors_page_through_a_column(self):
+        for priority_order in [False, True]:
+            expected = self.titles(self.column(first=10, priorityOrder=priority_order))
+            
+            first = self.board(perColumn=2, priorityOrder=priority_order)[0]
+            titles = self.titles(first)
+            cursor = first['endCursor']
+            while True:
+                page = self.column(first=2, after=cursor, priorityOrder=priority_order)
+                self.assertEqual(page['totalCount'], 5)
+                titles += self.titles(page)
+                cursor = page['endCursor']
+                if not page['hasMore']:
+                    break
+            
+            self.assertEqual(len(expected), 5)
+            self.assertEqual(titles, expected)
+    
+    def test_invalid_arguments(self):
+        result = self.client.execute(self.COLUMN_QUERY, variables={
+            'projectId': self.project.pk, 'status': 'TODO', 'after': 'not-a-cursor'
+        })
+        self.assertEqual(result['errors'][0]['message'], 'Invalid cursor')
+        self.assertIsNone(self.column(status='ARCHIVED'))
+        
+        self.project.soft_delete()
+        result = self.client.execute(self.BOARD_QUERY, variables={'projectId': self.project.pk})
+        self.assertIsNone(result['data']['taskBoard'])
+
+
+class CommentPaginationTests(TestCase):
+    PAGE_QUERY = '''
+        query($taskId: ID!, $first: Int, $after: String) {
+            taskComments(taskId: $taskId, first: $first, after: $after) {
+                totalCount hasMore endCursor comments { content task { title } }
+            }
+        }
+    '''
+    
+    def setUp(self):
+        self.client = Client(schema)
+        self.org = Organization.objects.create(name='Comment Org', contact_email='comments@example.com')
+        self.project = Project.objects.create(organization=self.org, name='Chatty')
+        self.task = Task.objects.create(project=self.project, title='Busy task')
+        for index in range(5):
+            TaskComment.objects.create(task=self.task, content=f'Comment {index}', author_email='dev@example.com')
+        # Cursors must page correctly through comments posted at the same instant
+        TaskComment.objects.filter(content__in=['Comment 2', 'Comment 3']).update(
+            created_at=TaskComment.objects.get(content='Comment 2').created_at
+        )
+    
+    def execute(self, query, **variables):
+        result = self.client.execute(query, variables=variables)
+        self.assertIsNone(result.get('errors'))
+        return result['data']
+    
+    def test_task_without_comments_selected_does_no_comment_work(self):
+        query = 'query($id: ID!) { task(id: $id) { title } }'
+        with CaptureQueriesContext(connection) as queries:
+            self.execute(query, id=self.task.pk)
+        self.assertEqual(len(queries), 1)
+        
+        query = 'query($id: ID!) { task(id: $id) { commentCount } }'
+        with CaptureQueriesContext(connection) as queries:
+            data = self.execute(query, id=self.task.pk)
+        self.assertEqual(data['task']['commentCount'], 5)
+        self.assertEqual(len(queries), 2)
+        self.assertIn('COUNT(*)', queries[1]['sql'])
+    
+    def test_root_connection_pages_in_order(self):
+        contents, cursor = [], None
+        while True:
+            page = self.execute(self.PAGE_QUERY, taskId=self.task.pk, first=2, after=cursor)['taskComments']
+            self.assertEqual(page['totalCount'], 5)
+            self.assertTrue(all(comment['task']['title'] == 'Busy task' for comment in page['comments']))
+            contents += [comment['content'] for comment in page['comments']]
+            cursor = page['endCursor']
+            if not page['hasMore']:
+                break
+        
+        self.assertEqual(contents, [f'Comment {index}' for index in range(5)])
+    
+    def test_task_connection(self):
+        query = '''
+            query($id: ID!) {
+                task(id: $id) { comments(first: 2) { totalCount hasMore comments { content } } }
+            }
+        '''
+        with CaptureQueriesContext(connection) as queries:
+            comments = self.execute(query, id=self.task.pk)['task']['comments']
+        
+        self.assertEqual(comments['totalCount'], 5)
+        self.assertTrue(comments['hasMore'])
+        self.assertEqual([comment['content'] for comment in comments['comments']], ['Comment 0', 'Comment 1'])
+        # The task, the count and one page of comments
+        self.assertEqual(len(queries), 3)
+    
+    def test_task_lists_annotate_comment_counts(self):
+        for index in range(3):
+            Task.objects.create(project=self.project, title=f'Quiet task {index}')
+        query = 'query($projectId: ID) { tasks(projectId: $projectId) { title commentCount } }'
+        
+        with CaptureQueriesContext(connection) as queries:
+            tasks = self.execute(query, projectId=self.project.pk)['tasks']
+        
+        self.assertEqual(sorted(task['commentCount'] for task in tasks), [0, 0, 0, 5])
+        self.assertEqual(len(queries), 1)
+    
+    def test_archived_task_comments(self):
+        self.project.status = 'COMPLETED'
+        self.project.save()
+        archive_project(self.project.pk)
+        query = '''
+            query($projectId: ID) {
+                tasks(projectId: $projectId, includeArchived: true) {
+                    commentCount comments(first: 3) { totalCount comments { content task { title } } }
+                }
+            }
+        '''
+        
+        task = self.execute(query, projectId=self.project.pk)['tasks'][0]
+        
+        self.assertEqual(task['commentCount'], 5)
+        self.assertEqual(task['comments']['totalCount'], 5)
+        self.assertEqual(
+            [comment['content'] for comment in task['comments']['comments']],
+            ['Comment 0', 'Comment 1', 'Comment 2']
+        )
+        self.assertEqual(task['comments']['comments'][0]['task']['title'], 'Busy task')
@@ -0,0 +1,103 @@
+import re
+from datetime import timedelta
+from unittest import skipUnless
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from graphql_api.queries import Query, get_task_board, get_task_stats
+from graphql_api.types import comment_page
+from apps.organizations.models import Organization
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskComment
+
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN output is PostgreSQL specific')
+class ResolverIndexTests(TestCase):
+    """
+    The statements the resolvers issue are served by the task indexes, with
+    the planner at its defaults. Each project is a small share of a tenant
+    large enough for the planner to prefer the indexes to scanning.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name='Index Org', contact_email='index@example.com')
+        projects = Project.objects.bulk_create([
+            Project(organization=cls.org, name=f'Project {i}') for i in range(200)
+        ])
+        statuses = ['TODO', 'IN_PROGRESS', 'DONE', 'BLOCKED']
+        now = timezone.now()
+        Task.objects.bulk_create([
+            Task(
+                project=project, title=f'Task {i}', status=statuses[i % 4],
+                created_at=now - timedelta(minutes=i), overdue=i % 10 == 0,
+            )
+            for project in projects for i in range(40)
+        ])
+        TaskComment.objects.bulk_create([
+            TaskComment(task_id=task_id, content='Note', author_email='a@example.com')
+            for task_id in Task.objects.values_list('id', flat=True) for _ in range(2)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE tasks')
+            cursor.execute('ANALYZE task_comments')
+        cls.project = projects[0]
+        cls.task = cls.project.tasks.first()
+
+    def plans(self, run):
+        """``(plan, indexes)`` of each SELECT ``run`` issues"""
+        with CaptureQueriesContext(connection) as queries:
+            run()
+        return [self.explain(query['sql']) for query in queries if query['sql'].startswith('SELECT')]
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN {sql}')
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+            # Partitions carry their own copy of each index; report the parent index
+            children = re.findall(r'(?:Scan using|Index Scan on) (\S+)', plan)
+            cursor.execute('''
+                SELECT child.relname, parent.relname FROM pg_inherits
+                JOIN pg_class child ON child.oid = inhrelid
+                JOIN pg_class parent ON parent.oid = inhparent
+                WHERE child.relname = ANY(%s)
+            ''', [children])
+            parents = dict(cursor.fetchall())
+        return plan, {parents.get(name, name) for name in children}
+
+    def assert_no_task_scan(self, plan):
+        self.assertNotRegex(plan, r'Seq Scan on tasks_p\d')
+
+    def test_project_task_list(self):
+        # The project's rows are found through the index and sorted in memory
+        [(plan, indexes)] = self.plans(lambda: list(Query.resolve_tasks(None, None, project_id=self.project.pk)))
+        self.assertIn('tasks_project_created_idx', indexes)
+        self.assertIn('task_commen_task_id_413a08_idx', indexes)
+        self.assert_no_task_scan(plan)
+
+    def test_task_board(self):
+        # One sort of the project's rows feeds both status windows
+        [(plan, indexes)] = self.plans(lambda: get_task_board(self.project, 20))
+        self.assertIn('tasks_project_created_idx', indexes)
+        self.assertEqual(len(re.findall(r'(?:^|->\s+)Sort\b', plan, re.MULTILINE)), 1)
+        self.assertIn('WindowAgg', plan)
+        self.assert_no_task_scan(plan)
+
+    def test_open_tasks_are_index_only(self):
+        [(plan, indexes)] = self.plans(self.project.can_be_completed)
+        self.assertIn('Index Only Scan', plan)
+        self.assertEqual(indexes, {'tasks_open_idx'})
+
+    def test_overdue_count_is_index_only(self):
+        (_, totals), (plan, indexes) = self.plans(lambda: get_task_stats(self.org, self.project.pk, max_age=0))
+        self.assertIn('tasks_project_created_idx', totals)
+        self.assertIn('Index Only Scan', plan)
+        self.assertIn('tasks_overdue_idx', indexes)
+
+    def test_task_comments(self):
+        queryset = TaskComment.objects.visible().filter(task_id=self.task.pk).select_related('task')
+        # Empty monthly partitions cost nothing to scan; the filled one uses the index
+        [(plan, indexes)] = self.plans(lambda: comment_page(queryset, 20).items)
+        self.assertIn('task_commen_task_id_413a08_idx', indexes)
+        self.assertRegex(plan, r'Scan using task_comments_y\d+m\d+_task_id_created_at_idx')
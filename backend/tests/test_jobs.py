@@ -0,0 +1,150 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from graphene.test import Client
+from graphql_api.schema import schema
+from apps.jobs.models import Job
+from apps.jobs.registry import enqueue, job
+from apps.jobs.worker import claim_jobs, execute_job, renew_leases
+from apps.organizations.models import Organization
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+
+calls = []
+
+
+@job('tests.record', max_attempts=2)
+def record(job, value):
+    calls.append(value)
+    job.set_progress(50)
+    return {'value': value}
+
+
+@job('tests.explode', max_attempts=2)
+def explode(job):
+    raise RuntimeError('boom')
+
+
+@job('tests.taken_over')
+def taken_over(job):
+    # The lease runs out mid-run and another worker takes the job over
+    Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+    claim_jobs('other-worker', 1)
+    job.set_progress(50)
+    return {'done': True}
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        queued = record.enqueue(value=7)
+
+        self.assertEqual(claim_jobs('test', 5), [queued.pk])
+        self.assertEqual(execute_job(queued.pk), 'COMPLETED')
+
+        queued.refresh_from_db()
+        self.assertEqual(calls, [7])
+        self.assertEqual(queued.result, {'value': 7})
+        self.assertEqual(queued.progress, 100)
+        self.assertEqual(queued.attempts, 1)
+        self.assertIsNotNone(queued.finished_at)
+
+    def test_claim_order_and_leasing(self):
+        low = enqueue('tests.record', value=1)
+        high = enqueue('tests.record', priority=5, value=2)
+        enqueue('tests.record', run_after=timezone.now() + timedelta(hours=1), value=3)
+
+        self.assertEqual(claim_jobs('test', 5), [high.pk, low.pk])
+        self.assertEqual(claim_jobs('test', 5), [])
+        self.assertEqual(Job.objects.get(pk=high.pk).status, 'RUNNING')
+
+    def test_expired_lease_is_reclaimed(self):
+        queued = record.enqueue(value=1)
+        claim_jobs('dead-worker', 1)
+        Job.objects.filter(pk=queued.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(claim_jobs('test', 1), [queued.pk])
+        self.assertEqual(Job.objects.get(pk=queued.pk).attempts, 2)
+
+    def test_expired_last_attempt_fails(self):
+        queued = record.enqueue(value=1)
+        for _ in range(queued.max_attempts):
+            claim_jobs('dying-worker', 1)
+            Job.objects.filter(pk=queued.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(claim_jobs('test', 1), [])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('FAILED', 2))
+        self.assertIn('lease', queued.error)
+
+    def test_stale_run_cannot_overwrite_the_new_one(self):
+        queued = taken_over.enqueue()
+        claim_jobs('slow-worker', 1)
+
+        self.assertEqual(execute_job(queued.pk), 'LOST')
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.locked_by, queued.attempts), ('RUNNING', 'other-worker', 2))
+        self.assertIsNone(queued.result)
+        self.assertEqual(renew_leases('slow-worker', [queued.pk]), 0)
+        self.assertEqual(renew_leases('other-worker', [queued.pk]), 1)
+
+    @override_settings(JOB_RETRY_BACKOFF_SECONDS=10)
+    def test_failures_retry_with_backoff_then_fail(self):
+        queued = explode.enqueue()
+
+        claim_jobs('test', 1)
+        self.assertEqual(execute_job(queued.pk), 'PENDING')
+        queued.refresh_from_db()
+        self.assertIn('boom', queued.error)
+        self.assertGreater(queued.run_after, timezone.now() + timedelta(seconds=5))
+
+        Job.objects.filter(pk=queued.pk).update(run_after=timezone.now())
+        claim_jobs('test', 1)
+        self.assertEqual(execute_job(queued.pk), 'FAILED')
+
+    def test_run_jobs_command_in_process(self):
+        record.enqueue(value=1)
+        record.enqueue(value=2)
+        out = StringIO()
+
+        call_command('run_jobs', processes=0, burst=True, stdout=out)
+
+        self.assertEqual(sorted(calls), [1, 2])
+        self.assertIn('Processed 2 jobs', out.getvalue())
+
+
+class JobGraphQLTests(TestCase):
+    def setUp(self):
+        self.client = Client(schema)
+        org = Organization.objects.create(name='Jobs Org', contact_email='jobs@example.com')
+        self.project = Project.objects.create(organization=org, name='Doomed', description='To delete')
+        Task.objects.create(project=self.project, title='Task')
+
+    def test_delete_project_is_queued(self):
+        result = self.client.execute('''
+            mutation($id: ID!) {
+                deleteProject(id: $id) { success job { id status } }
+            }
+        ''', variables={'id': self.project.id})
+
+        payload = result['data']['deleteProject']
+        self.assertTrue(payload['success'])
+        self.assertEqual(payload['job']['status'], 'PENDING')
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertTrue(Project.all_objects.filter(pk=self.project.pk).exists())
+
+        call_command('run_jobs', processes=0, burst=True, stdout=StringIO())
+
+        result = self.client.execute(
+            'query($id: ID!) { job(id: $id) { status isFinished result } }',
+            variables={'id': payload['job']['id']}
+        )
+        self.assertEqual(result['data']['job']['status'], 'COMPLETED')
+        self.assertTrue(result['data']['job']['isFinished'])
+        self.assertFalse(Project.all_objects.filter(pk=self.project.pk).exists())
+        self.assertFalse(Task.objects.filter(project_id=self.project.pk).exists())
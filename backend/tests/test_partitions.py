@@ -0,0 +1,70 @@
+import re
+from datetime import datetime, timezone as dt_timezone
+from unittest import skipUnless
+from django.db import connection
+from django.test import TestCase
+from apps.organizations.models import Organization
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskComment
+from apps.tasks.partitions import (
+    COMMENTS_DEFAULT_PARTITION,
+    add_months,
+    comment_partition_name,
+    create_comment_partition,
+    ensure_comment_partitions,
+    is_partitioned,
+    month_start,
+)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Partitioning needs PostgreSQL')
+class PartitioningTests(TestCase):
+    def setUp(self):
+        org = Organization.objects.create(name='Partition Org', contact_email='part@example.com')
+        self.project = Project.objects.create(organization=org, name='Partitioned', description='Split')
+        self.task = Task.objects.create(project=self.project, title='Task')
+        self.comment = TaskComment.objects.create(task=self.task, content='Hi', author_email='a@example.com')
+
+    def partition_of(self, table, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT tableoid::regclass::text FROM {table} WHERE id = %s', [pk])
+            return cursor.fetchone()[0]
+
+    def test_tables_are_partitioned(self):
+        self.assertTrue(is_partitioned(connection, 'tasks'))
+        self.assertTrue(is_partitioned(connection, 'task_comments'))
+        self.assertRegex(self.partition_of('tasks', self.task.pk), r'^tasks_p\d$')
+        self.assertEqual(
+            self.partition_of('task_comments', self.comment.pk),
+            comment_partition_name(month_start(self.comment.created_at)),
+        )
+
+    def test_queries_are_pruned(self):
+        plan = Task.objects.filter(project_id=self.project.pk).explain()
+        self.assertEqual(len(set(re.findall(r'tasks_p\d', plan))), 1)
+
+        since = month_start(self.comment.created_at)
+        plan = TaskComment.objects.filter(created_at__gte=since).explain()
+        self.assertNotIn(comment_partition_name(add_months(since, -1)), plan)
+        self.assertIn(comment_partition_name(since), plan)
+
+    def test_new_partition_takes_rows_from_default(self):
+        future = add_months(month_start(datetime.now(dt_timezone.utc)), 24)
+        TaskComment.objects.filter(pk=self.comment.pk).update(created_at=future)
+        self.assertEqual(self.partition_of('task_comments', self.comment.pk), COMMENTS_DEFAULT_PARTITION)
+
+        self.assertTrue(create_comment_partition(connection, future))
+        self.assertFalse(create_comment_partition(connection, future))
+        self.assertEqual(self.partition_of('task_comments', self.comment.pk), comment_partition_name(future))
+
+    def test_ensure_comment_partitions_is_idempotent(self):
+        ensure_comment_partitions(months_ahead=6)
+        self.assertEqual(ensure_comment_partitions(months_ahead=6), [])
+
+    def test_orm_round_trip(self):
+        self.task.title = 'Renamed'
+        self.task.save()
+        self.comment.delete()
+        self.task.delete()
+        self.assertFalse(Task.objects.filter(pk=self.task.pk).exists())
+        self.assertFalse(TaskComment.objects.exists())
@@ -0,0 +1,157 @@
+from datetime import date, timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from graphene.test import Client
+from graphql_api.schema import schema
+from apps.activity.events import record_task_updates
+from apps.activity.models import ActivityEvent, OrganizationDailyCounts, ProjectDailyCounts
+from apps.activity.rollups import METRICS, reconcile_rollups
+from apps.jobs.models import Job
+from apps.jobs.worker import claim_jobs, execute_job
+from apps.organizations.models import Organization
+from apps.projects.deletion import purge_organization
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskComment
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name='Rollup Org', contact_email='rollup@example.com')
+        self.project = Project.objects.create(organization=self.org, name='Counted')
+        self.other = Project.objects.create(organization=self.org, name='Also counted')
+        self.today = timezone.localdate()
+
+    def counts(self, model=OrganizationDailyCounts, **lookup):
+        return {
+            row['date']: tuple(row[metric] for metric in METRICS)
+            for row in model.objects.filter(**lookup).values('date', *METRICS)
+        }
+
+    def make_activity(self):
+        first = Task.objects.create(project=self.project, title='First')
+        second = Task.objects.create(project=self.project, title='Second')
+        Task.objects.create(project=self.other, title='Elsewhere')
+        first.status = 'IN_PROGRESS'
+        first.save()
+        first.status = 'DONE'
+        first.save()
+        second.title = 'Renamed'
+        second.save()
+        TaskComment.objects.create(task=second, content='Hello', author_email='dev@example.com')
+        tasks = Task.objects.filter(pk=second.pk)
+        record_task_updates(tasks, status='BLOCKED')
+        tasks.update(status='BLOCKED')
+
+    def test_writes_update_the_counters(self):
+        self.make_activity()
+
+        # (tasks created, tasks completed, status changes, comments created)
+        self.assertEqual(self.counts(), {self.today: (3, 1, 3, 1)})
+        self.assertEqual(self.counts(ProjectDailyCounts, project=self.project), {self.today: (2, 1, 3, 1)})
+        self.assertEqual(self.counts(ProjectDailyCounts, project=self.other), {self.today: (1, 0, 0, 0)})
+
+    def test_reconciliation_matches_incremental_counts(self):
+        self.make_activity()
+        # Events from before the counters existed, or whose update was lost
+        ActivityEvent.objects.bulk_create([
+            ActivityEvent(
+                organization=self.org, project=self.other, object_type='TASK', object_id=0,
+                action='CREATED', object_repr='Old', created_at=timezone.now() - timedelta(days=3),
+            )
+        ])
+        expected = self.counts()
+        OrganizationDailyCounts.objects.update(tasks_created=99)
+        ProjectDailyCounts.objects.filter(project=self.other).delete()
+
+        version = Organization.objects.get(pk=self.org.pk).data_version
+        untouched = Organization.objects.create(name='Quiet Org', contact_email='quiet@example.com')
+
+        reconcile_rollups(self.today - timedelta(days=3), self.today)
+
+        # Cached time series of the reconciled organization are invalidated
+        self.assertGreater(Organization.objects.get(pk=self.org.pk).data_version, version)
+        self.assertEqual(Organization.objects.get(pk=untouched.pk).data_version, untouched.data_version)
+        expected[self.today - timedelta(days=3)] = (1, 0, 0, 0)
+        self.assertEqual(self.counts(), expected)
+        self.assertEqual(self.counts(ProjectDailyCounts, project=self.other), {
+            self.today - timedelta(days=3): (1, 0, 0, 0),
+            self.today: (1, 0, 0, 0),
+        })
+
+    def test_time_series(self):
+        OrganizationDailyCounts.objects.bulk_create([
+            OrganizationDailyCounts(organization=self.org, date=date(2026, 3, 2), tasks_created=2),
+            OrganizationDailyCounts(organization=self.org, date=date(2026, 3, 4), tasks_created=3),
+            OrganizationDailyCounts(organization=self.org, date=date(2026, 3, 10), tasks_created=5),
+        ])
+        ProjectDailyCounts.objects.bulk_create([
+            ProjectDailyCounts(organization=self.org, project=self.project, date=date(2026, 3, 4), tasks_created=1),
+        ])
+        query = '''
+            query($slug: String!, $from: Date!, $to: Date!, $bucket: TimeSeriesBucketEnum, $projectId: ID) {
+                timeSeries(organizationSlug: $slug, metric: TASKS_CREATED, from: $from, to: $to,
+                           bucket: $bucket, projectId: $projectId) {
+                    metric bucket points { date value }
+                }
+            }
+        '''
+
+        def series(**variables):
+            with CaptureQueriesContext(connection) as queries:
+                result = Client(schema).execute(query, variables={'slug': self.org.slug, **variables})
+            self.assertEqual(len(queries), 2)
+            return result['data']['timeSeries']
+
+        days = series(**{'from': '2026-03-03', 'to': '2026-03-05'})
+        self.assertEqual((days['metric'], days['bucket']), ('TASKS_CREATED', 'DAY'))
+        self.assertEqual(days['points'], [
+            {'date': '2026-03-03', 'value': 0},
+            {'date': '2026-03-04', 'value': 3},
+            {'date': '2026-03-05', 'value': 0},
+        ])
+        weeks = series(**{'from': '2026-03-01', 'to': '2026-03-15', 'bucket': 'WEEK'})['points']
+        self.assertEqual(weeks, [
+            {'date': '2026-02-23', 'value': 0},
+            {'date': '2026-03-02', 'value': 5},
+            {'date': '2026-03-09', 'value': 5},
+        ])
+        project = series(**{'from': '2026-03-01', 'to': '2026-03-31', 'bucket': 'MONTH', 'projectId': self.project.pk})
+        self.assertEqual(project['points'], [{'date': '2026-03-01', 'value': 1}])
+
+    def test_time_series_range_is_limited(self):
+        query = '''
+            query($slug: String!, $from: Date!, $to: Date!) {
+                timeSeries(organizationSlug: $slug, metric: COMMENTS_CREATED, from: $from, to: $to) { points { value } }
+            }
+        '''
+        client = Client(schema)
+        for start, end in [('2026-03-02', '2026-03-01'), ('2024-01-01', '2026-01-01')]:
+            result = client.execute(query, variables={'slug': self.org.slug, 'from': start, 'to': end})
+            self.assertEqual(result['errors'][0]['extensions']['code'], 'INVALID_RANGE')
+
+    def test_command_and_job(self):
+        Task.objects.create(project=self.project, title='Yesterday')
+        ActivityEvent.objects.update(created_at=timezone.now() - timedelta(days=1))
+
+        out = StringIO()
+        call_command('reconcile_rollups', stdout=out)
+        self.assertIn('Reconciled 2 days (1 organization and 1 project rows)', out.getvalue())
+        # Today is left to the incremental updates
+        self.assertEqual(self.counts(), {self.today - timedelta(days=1): (1, 0, 0, 0), self.today: (1, 0, 0, 0)})
+
+        call_command('reconcile_rollups', days=1, queue=True, stdout=StringIO())
+        job = Job.objects.get(name='activity.reconcile_rollups')
+        self.assertEqual(claim_jobs('test', 1), [job.pk])
+        self.assertEqual(execute_job(job.pk), 'COMPLETED')
+        job.refresh_from_db()
+        self.assertEqual(job.result, {'days': 1, 'projects': 1, 'organizations': 1})
+
+    def test_purge_removes_counters(self):
+        Task.objects.create(project=self.project, title='Counted')
+        purge_organization(self.org.pk)
+        self.assertFalse(OrganizationDailyCounts.objects.exists())
+        self.assertFalse(ProjectDailyCounts.objects.exists())
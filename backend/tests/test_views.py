@@ -0,0 +1,587 @@
+import gzip
+import json
+import marshal
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from graphql import get_introspection_query
+from graphql_api.document_cache import LRUCache, query_hash
+from graphql_api.encoding import available_encodings, dumps, negotiate_encoding
+from graphql_api.models import PersistedQuery, RequestProfile
+from graphql_api.persisted_queries import store
+from graphql_api.schema import schema
+from graphql_api.slow_queries import recent_slow_queries
+from graphql_api.views import GraphQLView
+from apps.organizations.models import Organization
+from apps.projects.dashboard import refresh_dashboard_stats
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+
+def document_cache():
+    return GraphQLView(schema=schema).get_document_cache()
+
+
+class GraphQLViewTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(
+            name='Test Organization',
+            contact_email='test@example.com'
+        )
+        document_cache().documents.clear()
+        document_cache().introspection.clear()
+        store.memory.clear()
+
+    def post(self, query, variables=None, extensions=None, **extra):
+        body = {'query': query, 'variables': variables or {}}
+        if extensions:
+            body['extensions'] = extensions
+        return self.client.post(
+            '/graphql/',
+            data=json.dumps(body),
+            content_type='application/json',
+            **extra
+        )
+
+
+class DocumentCacheTests(GraphQLViewTestCase):
+    def test_repeated_query_is_parsed_once(self):
+        query = '{ organizations { name } }'
+        cache = document_cache()
+
+        self.post(query)
+        cached = cache.documents.get(query_hash(query))
+        response = self.post(query)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['data']['organizations'][0]['name'], 'Test Organization')
+        self.assertIs(cache.documents.get(query_hash(query)), cached)
+
+    def test_validation_errors_are_cached(self):
+        query = '{ organizations { missingField } }'
+
+        first = self.post(query)
+        second = self.post(query)
+
+        self.assertEqual(first.status_code, 400)
+        self.assertEqual(json.loads(first.content), json.loads(second.content))
+        self.assertTrue(document_cache().documents.get(query_hash(query)).errors)
+
+    def test_mutations_are_refused_over_get(self):
+        response = self.client.get('/graphql/', {
+            'query': 'mutation { deleteTask(id: 1) { success } }'
+        }, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 405)
+
+    def test_introspection_result_is_computed_once(self):
+        query = get_introspection_query(descriptions=True)
+
+        first = self.post(query)
+        cached = document_cache().introspection.get((query_hash(query), None))
+        second = self.post(query)
+
+        self.assertIsNotNone(cached)
+        self.assertIn('__schema', json.loads(first.content)['data'])
+        self.assertEqual(first.content, second.content)
+
+
+class PersistedQueryTests(GraphQLViewTestCase):
+    query = '{ organizations { name } }'
+
+    def extensions(self, query=None):
+        return {'persistedQuery': {'version': 1, 'sha256Hash': query_hash(query or self.query)}}
+
+    def test_unknown_hash_asks_for_full_query(self):
+        response = self.post(None, extensions=self.extensions())
+
+        self.assertEqual(response.status_code, 200)
+        error = json.loads(response.content)['errors'][0]
+        self.assertEqual(error['extensions']['code'], 'PERSISTED_QUERY_NOT_FOUND')
+
+    def test_full_query_registers_hash(self):
+        self.post(self.query, extensions=self.extensions())
+        self.assertTrue(PersistedQuery.objects.filter(sha256_hash=query_hash(self.query)).exists())
+        store.memory.clear()
+
+        response = self.post(None, extensions=self.extensions())
+        data = json.loads(response.content)['data']
+        self.assertEqual(data['organizations'][0]['name'], 'Test Organization')
+
+    def test_hash_only_get_request(self):
+        self.post(self.query, extensions=self.extensions())
+
+        response = self.client.get('/graphql/', {
+            'extensions': json.dumps(self.extensions()),
+        }, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('organizations', json.loads(response.content)['data'])
+
+    def test_invalid_or_long_queries_are_not_registered(self):
+        for query in ['{ organizations { name ', '{ organizations { noSuchField } }']:
+            response = self.post(query, extensions=self.extensions(query))
+            self.assertIn('errors', json.loads(response.content))
+
+        with override_settings(GRAPHQL_PERSISTED_QUERY_MAX_LENGTH=10):
+            response = self.post(self.query, extensions=self.extensions())
+        self.assertIn('organizations', json.loads(response.content)['data'])
+
+        self.assertFalse(PersistedQuery.objects.exists())
+        self.assertEqual(store.memory.get(query_hash(self.query)), None)
+
+    def test_mismatched_hash_is_rejected(self):
+        response = self.post(self.query, extensions=self.extensions('{ organizations { id } }'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PersistedQuery.objects.exists())
+
+    @override_settings(GRAPHQL_PERSISTED_QUERIES_STRICT=True)
+    def test_strict_mode_only_runs_registered_operations(self):
+        rejected = self.post(self.query)
+        self.assertEqual(json.loads(rejected.content)['errors'][0]['extensions']['code'],
+                         'PERSISTED_QUERY_NOT_ALLOWED')
+
+        rejected = self.post(self.query, extensions=self.extensions())
+        self.assertEqual(rejected.status_code, 400)
+        self.assertFalse(PersistedQuery.objects.exists())
+
+        store.register(self.query, allowlisted=True)
+        accepted = self.post(None, extensions=self.extensions())
+        self.assertIn('organizations', json.loads(accepted.content)['data'])
+
+    def test_register_command_allowlists_frontend_operations(self):
+        call_command('register_persisted_queries', stdout=StringIO())
+
+        registered = PersistedQuery.objects.get(operation_name='GetTasks')
+        self.assertTrue(registered.is_allowlisted)
+        self.assertIn('__typename', registered.query)
+        self.assertFalse(PersistedQuery.objects.filter(operation_name='GetTaskStats').exists())
+
+
+class QueryCostTests(GraphQLViewTestCase):
+    def test_cost_is_reported_in_extensions(self):
+        response = self.post('{ organizations { name projectCount } }')
+
+        cost = json.loads(response.content)['extensions']['cost']
+        self.assertEqual(cost['requested'], 20 * 2 + 1)
+        self.assertEqual(cost['depth'], 2)
+
+    def test_expensive_operation_is_rejected(self):
+        response = self.post(
+            '{ tasks { title project { taskCount completionPercentage organization { projectCount } } } }'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        body = json.loads(response.content)
+        self.assertNotIn('data', body)
+        self.assertEqual(body['errors'][0]['extensions']['code'], 'COST_LIMIT_EXCEEDED')
+
+    def test_unfiltered_task_list_is_rejected(self):
+        response = self.post('{ tasks { id project { organization { projectCount } } } }')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content)['errors'][0]['extensions']['code'], 'COST_LIMIT_EXCEEDED')
+
+    def test_narrowing_arguments_lower_the_estimate(self):
+        query = '''
+            query($slug: String, $projectId: ID) {
+                tasks(organizationSlug: $slug, projectId: $projectId) { title commentCount }
+            }
+        '''
+
+        def requested(**variables):
+            return json.loads(self.post(query, variables).content)['extensions']['cost']['requested']
+
+        self.assertEqual(requested(), 2000001)
+        self.assertEqual(requested(slug=self.org.slug), 2001)
+        self.assertEqual(requested(slug=self.org.slug, projectId=1), 401)
+
+    def test_fragments_and_skip_are_followed(self):
+        query = """
+            query($skip: Boolean!) {
+                organizations { ...Counts projectCount @skip(if: $skip) }
+            }
+            fragment Counts on OrganizationType { activeProjectCount }
+        """
+        response = self.post(query, {'skip': True})
+
+        self.assertEqual(json.loads(response.content)['extensions']['cost']['requested'], 41)
+
+    @override_settings(GRAPHQL_MAX_QUERY_DEPTH=2)
+    def test_deep_operation_is_rejected(self):
+        response = self.post('{ projects { organization { name } } }')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content)['errors'][0]['extensions']['code'], 'QUERY_TOO_DEEP')
+
+    @override_settings(GRAPHQL_QUERY_COST_BUDGET=50)
+    def test_budget_throttles_client(self):
+        query = '{ organizations { name projectCount } }'
+        cache.clear()
+
+        self.assertEqual(self.post(query).status_code, 200)
+        throttled = self.post(query)
+
+        self.assertEqual(throttled.status_code, 429)
+        self.assertEqual(json.loads(throttled.content)['errors'][0]['extensions']['code'],
+                         'COST_BUDGET_EXCEEDED')
+
+    def test_introspection_is_not_costed(self):
+        response = self.post(get_introspection_query())
+        self.assertNotIn('extensions', json.loads(response.content))
+
+
+class HttpCacheTests(GraphQLViewTestCase):
+    projects_query = 'query($slug: String) { projects(organizationSlug: $slug) { name } }'
+
+    def get(self, query, variables=None, **extra):
+        return self.client.get('/graphql/', {
+            'query': query,
+            'variables': json.dumps(variables or {}),
+        }, HTTP_ACCEPT='application/json', **extra)
+
+    def create_project(self, organization, name='Project'):
+        return Project.objects.create(organization=organization, name=name, description='Description')
+
+    def test_conditional_get_skips_execution(self):
+        first = self.get(self.projects_query, {'slug': self.org.slug})
+        etag = first['ETag']
+
+        with self.assertNumQueries(1):
+            second = self.get(self.projects_query, {'slug': self.org.slug}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(first['Cache-Control'], 'private, no-cache')
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], etag)
+        self.assertEqual(second.content, b'')
+
+    def test_etag_changes_with_tenant_data(self):
+        etag = self.get(self.projects_query, {'slug': self.org.slug})['ETag']
+        project = self.create_project(self.org)
+        self.assertNotEqual(self.get(self.projects_query, {'slug': self.org.slug})['ETag'], etag)
+
+        etag = self.get(self.projects_query, {'slug': self.org.slug})['ETag']
+        task = Task.objects.create(project=project, title='Task')
+        self.assertNotEqual(self.get(self.projects_query, {'slug': self.org.slug})['ETag'], etag)
+
+        etag = self.get(self.projects_query, {'slug': self.org.slug})['ETag']
+        task.delete()
+        response = self.get(self.projects_query, {'slug': self.org.slug}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(DASHBOARD_STATS_MIN_TASKS=1)
+    def test_dashboard_refresh_changes_the_etag(self):
+        query = 'query($slug: String!) { projectStats(organizationSlug: $slug) { totalProjects } }'
+        Task.objects.create(project=self.create_project(self.org), title='Task')
+        refresh_dashboard_stats()
+        first = self.get(query, {'slug': self.org.slug})
+
+        # Served from the view until the next refresh, under the new version
+        self.create_project(self.org, 'Second')
+        stale = self.get(query, {'slug': self.org.slug})
+        self.assertEqual(json.loads(stale.content)['data']['projectStats']['totalProjects'], 1)
+        self.assertNotEqual(stale['ETag'], first['ETag'])
+
+        refresh_dashboard_stats()
+        response = self.get(query, {'slug': self.org.slug}, HTTP_IF_NONE_MATCH=stale['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['data']['projectStats']['totalProjects'], 2)
+
+    def test_other_tenants_do_not_invalidate_scoped_queries(self):
+        other = Organization.objects.create(name='Other Organization', contact_email='other@example.com')
+        scoped = self.get(self.projects_query, {'slug': self.org.slug})['ETag']
+        unscoped = self.get(self.projects_query)['ETag']
+
+        self.create_project(other)
+
+        self.assertEqual(self.get(self.projects_query, {'slug': self.org.slug})['ETag'], scoped)
+        self.assertNotEqual(self.get(self.projects_query)['ETag'], unscoped)
+
+    def test_cache_hints_combine_into_max_age(self):
+        self.assertEqual(
+            self.get('{ organizations { name } }')['Cache-Control'], 'private, max-age=300'
+        )
+        self.assertEqual(
+            self.get('{ organizations { name projectCount } }')['Cache-Control'], 'private, no-cache'
+        )
+
+    def test_mutations_and_errors_are_not_stored(self):
+        mutation = self.post('mutation { deleteTask(id: 1) { success } }')
+        invalid = self.get('{ organizations { missingField } }')
+
+        self.assertEqual(mutation['Cache-Control'], 'no-store')
+        self.assertEqual(invalid['Cache-Control'], 'no-store')
+        self.assertFalse(invalid.has_header('ETag'))
+
+
+class ResponseEncodingTests(GraphQLViewTestCase):
+    query = '{ organizations { name contactEmail createdAt } }'
+
+    def setUp(self):
+        super().setUp()
+        for i in range(30):
+            Organization.objects.create(name=f'Organization {i}', contact_email=f'org{i}@example.com')
+
+    def test_large_responses_are_gzipped(self):
+        response = self.client.get('/graphql/', {'query': self.query}, HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].endswith('-gzip"'))
+        body = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(body['data']['organizations']), 31)
+
+    def test_compressed_etag_revalidates(self):
+        etag = self.client.get('/graphql/', {'query': self.query}, HTTP_ACCEPT_ENCODING='gzip')['ETag']
+
+        response = self.client.get(
+            '/graphql/', {'query': self.query}, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_small_or_unaccepted_responses_are_not_compressed(self):
+        small = self.post('{ organizations { id } }', HTTP_ACCEPT_ENCODING='gzip')
+        refused = self.post(self.query, HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+
+        self.assertFalse(small.has_header('Content-Encoding'))
+        self.assertFalse(refused.has_header('Content-Encoding'))
+        self.assertEqual(len(json.loads(refused.content)['data']['organizations']), 31)
+
+    def test_encoders_agree(self):
+        data = {'when': datetime(2024, 1, 2, 3, 4, 5), 'day': date(2024, 1, 2), 'rate': Decimal('1.5')}
+
+        with mock.patch('graphql_api.encoding.orjson', None):
+            fallback = json.loads(dumps(data))
+
+        self.assertEqual(json.loads(dumps(data)), fallback)
+        self.assertEqual(fallback['day'], '2024-01-02')
+
+    def test_negotiate_encoding(self):
+        self.assertEqual(negotiate_encoding('gzip;q=0.5, br;q=0.1'), 'gzip')
+        self.assertEqual(negotiate_encoding('*'), available_encodings()[0])
+        self.assertIsNone(negotiate_encoding('identity'))
+
+
+class IncrementalDeliveryTests(GraphQLViewTestCase):
+    multipart = 'multipart/mixed;deferSpec=20220824,application/json'
+
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(organization=self.org, name='Project', description='Description')
+        for i in range(5):
+            Task.objects.create(project=self.project, title=f'Task {i}')
+
+    def parts(self, response, body=None):
+        self.assertTrue(response['Content-Type'].startswith('multipart/mixed'))
+        body = (body or b''.join(response.streaming_content)).decode()
+        self.assertTrue(body.endswith('\r\n-----\r\n'))
+        chunks = body.split('\r\n---')[1:-1]
+        return [json.loads(chunk.split('\r\n\r\n', 1)[1]) for chunk in chunks]
+
+    def test_deferred_fragment_arrives_in_later_part(self):
+        query = """
+            query($id: ID!) {
+                project(id: $id) {
+                    name
+                    ... @defer(label: "counts") { taskCount completionPercentage }
+                }
+            }
+        """
+        parts = self.parts(self.post(query, {'id': self.project.id}, HTTP_ACCEPT=self.multipart))
+
+        self.assertEqual(parts[0]['data'], {'project': {'name': 'Project'}})
+        self.assertTrue(parts[0]['hasNext'])
+        self.assertEqual(parts[1]['incremental'], [{
+            'data': {'taskCount': 5, 'completionPercentage': 0.0},
+            'path': ['project'],
+            'label': 'counts',
+        }])
+        self.assertEqual(parts[-1], {'hasNext': False})
+
+    def test_deferred_fragment_in_list_is_split_per_item(self):
+        query = '''
+            query($id: ID) { tasks(projectId: $id) { id ...TaskProject @defer } }
+            fragment TaskProject on TaskType { project { name } }
+        '''
+        parts = self.parts(self.post(query, {'id': self.project.id}, HTTP_ACCEPT=self.multipart))
+
+        paths = [part['incremental'][0]['path'] for part in parts[1:-1]]
+        self.assertEqual(paths, [['tasks', i] for i in range(5)])
+
+    @override_settings(GRAPHQL_STREAM_BATCH_SIZE=2)
+    def test_streamed_list_is_sent_in_batches(self):
+        query = 'query($id: ID) { tasks(projectId: $id) @stream(initialCount: 1) { id } }'
+        parts = self.parts(self.post(query, {'id': self.project.id}, HTTP_ACCEPT=self.multipart))
+
+        streamed = [part['incremental'][0] for part in parts[1:-1]]
+        self.assertEqual(len(parts[0]['data']['tasks']), 1)
+        self.assertEqual([item['path'] for item in streamed], [['tasks', 1], ['tasks', 3]])
+        ids = [task['id'] for task in parts[0]['data']['tasks']]
+        ids += [task['id'] for item in streamed for task in item['items']]
+        self.assertEqual(sorted(ids), sorted(str(pk) for pk in Task.objects.values_list('id', flat=True)))
+
+    @override_settings(GRAPHQL_STREAM_BATCH_SIZE=2)
+    def test_streamed_list_is_read_once(self):
+        query = 'query($id: ID) { tasks(projectId: $id) @stream(initialCount: 1) { id } }'
+        with CaptureQueriesContext(connection) as plain:
+            response = self.post(query, {'id': self.project.id})
+        expected = [task['id'] for task in json.loads(response.content)['data']['tasks']]
+
+        with CaptureQueriesContext(connection) as initial:
+            response = self.post(query, {'id': self.project.id}, HTTP_ACCEPT=self.multipart)
+            content = iter(response.streaming_content)
+            body = next(content)
+        Task.objects.create(project=self.project, title='Inserted mid-stream')
+        with CaptureQueriesContext(connection) as later:
+            body += b''.join(content)
+
+        parts = self.parts(response, body)
+        ids = [task['id'] for task in parts[0]['data']['tasks']]
+        ids += [task['id'] for part in parts[1:-1] for task in part['incremental'][0]['items']]
+        self.assertEqual(ids, expected)
+        self.assertEqual((len(initial), len(later)), (len(plain), 0))
+
+    def test_deferred_fragment_does_not_resolve_its_path_again(self):
+        query = 'query($id: ID) { tasks(projectId: $id) { id ... @defer { title } } }'
+        response = self.post(query, {'id': self.project.id}, HTTP_ACCEPT=self.multipart)
+        with CaptureQueriesContext(connection) as later:
+            parts = self.parts(response)
+
+        self.assertEqual(len(later), 0)
+        self.assertEqual(
+            sorted(part['incremental'][0]['data']['title'] for part in parts[1:-1]),
+            [f'Task {i}' for i in range(5)]
+        )
+
+    def test_directives_are_ignored_without_multipart(self):
+        query = 'query($id: ID!) { project(id: $id) { name ... @defer { taskCount } } }'
+
+        plain = self.post(query, {'id': self.project.id})
+        disabled = self.post(
+            'query($id: ID!) { project(id: $id) { name ... @defer(if: false) { taskCount } } }',
+            {'id': self.project.id}, HTTP_ACCEPT=self.multipart,
+        )
+
+        self.assertEqual(json.loads(plain.content)['data']['project']['taskCount'], 5)
+        self.assertEqual(json.loads(disabled.content)['data']['project']['taskCount'], 5)
+
+
+@override_settings(GRAPHQL_SLOW_QUERY_MS=0)
+class SlowQueryLogTests(GraphQLViewTestCase):
+    query = 'query ProjectList($slug: String) { projects(organizationSlug: $slug) { name } }'
+
+    def setUp(self):
+        super().setUp()
+        recent_slow_queries().clear()
+
+    def test_statements_are_attributed_to_the_operation(self):
+        with self.assertLogs('graphql_api.slow_queries', 'WARNING') as logs:
+            self.post(self.query, {'slug': self.org.slug})
+
+        entries = [json.loads(record.getMessage()) for record in logs.records]
+        self.assertTrue(entries)
+        self.assertEqual(entries, list(recent_slow_queries()))
+        for entry in entries:
+            self.assertEqual(entry['operation'], 'ProjectList')
+            self.assertEqual(entry['root_field'], 'projects')
+            self.assertEqual(entry['organization'], self.org.slug)
+            self.assertIsNone(entry['params'])
+        self.assertTrue(any('"projects"' in entry['sql'] for entry in entries))
+
+    @override_settings(GRAPHQL_SLOW_QUERY_REDACT_PARAMS=False)
+    def test_parameters_are_kept_unless_redacted(self):
+        with self.assertLogs('graphql_api.slow_queries', 'WARNING'):
+            self.post(self.query, {'slug': self.org.slug})
+
+        self.assertIn([self.org.slug], [entry['params'] for entry in recent_slow_queries()])
+
+    @override_settings(GRAPHQL_SLOW_QUERY_MS=-1)
+    def test_negative_threshold_disables_logging(self):
+        self.post(self.query, {'slug': self.org.slug})
+        self.assertEqual(len(recent_slow_queries()), 0)
+
+    def test_admin_page_lists_recent_statements(self):
+        url = reverse('slow_queries')
+        with self.assertLogs('graphql_api.slow_queries', 'WARNING'):
+            self.post(self.query, {'slug': self.org.slug})
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'ProjectList')
+
+
+class RequestProfilingTests(GraphQLViewTestCase):
+    query = 'query ProjectList($slug: String) { projects(organizationSlug: $slug) { name } }'
+
+    def login_staff(self):
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+
+    def test_staff_header_profiles_request(self):
+        self.login_staff()
+        response = self.post(self.query, {'slug': self.org.slug}, HTTP_X_GRAPHQL_PROFILE='deterministic')
+
+        profile = RequestProfile.objects.get()
+        self.assertEqual(response['X-GraphQL-Profile-Id'], str(profile.pk))
+        self.assertEqual(profile.operation_name, 'ProjectList')
+        self.assertEqual(profile.organization_slug, self.org.slug)
+        self.assertEqual(profile.trigger, 'header')
+        stats = marshal.loads(bytes(profile.data))
+        self.assertTrue(any(function == 'dispatch' for _, _, function in stats))
+
+    def test_header_is_ignored_for_anonymous_users(self):
+        response = self.post(self.query, {'slug': self.org.slug}, HTTP_X_GRAPHQL_PROFILE='1')
+
+        self.assertNotIn('X-GraphQL-Profile-Id', response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    @override_settings(GRAPHQL_PROFILE_SAMPLE_RATE=1.0, GRAPHQL_PROFILE_INTERVAL_MS=1, GRAPHQL_PROFILE_KEEP=2)
+    def test_sampled_requests_keep_newest_profiles(self):
+        for _ in range(3):
+            self.post(self.query, {'slug': self.org.slug})
+
+        self.assertEqual(RequestProfile.objects.count(), 2)
+        profile = RequestProfile.objects.first()
+        self.assertEqual((profile.trigger, profile.profiler), ('sampled', 'sampling'))
+        for line in bytes(profile.data).decode().splitlines():
+            stack, count = line.rsplit(' ', 1)
+            self.assertGreater(int(count), 0)
+
+    def test_admin_download(self):
+        self.login_staff()
+        self.post(self.query, {'slug': self.org.slug}, HTTP_X_GRAPHQL_PROFILE='deterministic')
+        profile = RequestProfile.objects.get()
+
+        changelist = self.client.get(reverse('admin:graphql_api_requestprofile_changelist'))
+        download = self.client.get(reverse('admin:graphql_api_requestprofile_download', args=[profile.pk]))
+
+        self.assertContains(changelist, 'ProjectList')
+        self.assertEqual(download['Content-Disposition'], f'attachment; filename="ProjectList-{profile.pk}.prof"')
+        self.assertEqual(download.content, bytes(profile.data))
+
+
+class LRUCacheTests(TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
@@ -5,6 +5,8 @@ import { CREATE_TASK_COMMENT, UPDATE_TASK_COMMENT, DELETE_TASK_COMMENT } from '.
 import type { TaskComment, TaskCommentInput } from '../../types';
 import LoadingSpinner from '../common/LoadingSpinner';
 
+const COMMENTS_PAGE_SIZE = 20;
+
 interface CommentSectionProps {
   taskId: string;
   taskTitle: string;
@@ -17,8 +19,10 @@ export default function CommentSection({ taskId, taskTitle }: CommentSectionProp
   const [editingComment, setEditingComment] = useState<string | null>(null);
   const [editContent, setEditContent] = useState('');
 
-  const { loading, error, data, refetch } = useQuery(GET_TASK_COMMENTS, {
-    variables: { taskId },
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
+
+  const { loading, error, data, refetch, fetchMore } = useQuery(GET_TASK_COMMENTS, {
+    variables: { taskId, first: COMMENTS_PAGE_SIZE },
   });
 
   const [createComment] = useMutation(CREATE_TASK_COMMENT);
@@ -102,6 +106,29 @@ export default function CommentSection({ taskId, taskTitle }: CommentSectionProp
     setEditContent(comment.content);
   };
 
+  const loadMore = async () => {
+    setIsLoadingMore(true);
+    try {
+      await fetchMore({
+        variables: { after: data?.taskComments?.endCursor },
+        updateQuery: (previous, { fetchMoreResult }) => {
+          if (!fetchMoreResult?.taskComments) return previous;
+          return {
+            taskComments: {
+              ...fetchMoreResult.taskComments,
+              comments: [
+                ...previous.taskComments.comments,
+                ...fetchMoreResult.taskComments.comments,
+              ],
+            },
+          };
+        },
+      });
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const cancelEdit = () => {
     setEditingComment(null);
     setEditContent('');
@@ -151,13 +178,14 @@ export default function CommentSection({ taskId, taskTitle }: CommentSectionProp
     );
   }
 
-  const comments: TaskComment[] = data?.taskComments || [];
+  const comments: TaskComment[] = data?.taskComments?.comments || [];
+  const totalComments: number = data?.taskComments?.totalCount ?? comments.length;
 
   return (
     <div className="space-y-6">
       <div>
         <h3 className="text-lg font-medium text-gray-900 mb-2">
-          Comments ({comments.length})
+          Comments ({totalComments})
         </h3>
         <p className="text-sm text-gray-600">Discuss about "{taskTitle}"</p>
       </div>
@@ -281,6 +309,16 @@ export default function CommentSection({ taskId, taskTitle }: CommentSectionProp
             </div>
           ))
         )}
+
+        {data?.taskComments?.hasMore && (
+          <button
+            onClick={loadMore}
+            disabled={isLoadingMore}
+            className="btn-secondary btn-sm w-full"
+          >
+            {isLoadingMore ? 'Loading...' : `Show more comments (${totalComments - comments.length} more)`}
+          </button>
+        )}
       </div>
     </div>
   );
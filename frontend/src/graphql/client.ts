@@ -1,5 +1,6 @@
 import { ApolloClient, InMemoryCache, createHttpLink } from "@apollo/client";
 import { setContext } from "@apollo/client/link/context";
+import { createPersistedQueryLink } from "@apollo/client/link/persisted-queries";
 
 const httpLink = createHttpLink({
   uri: import.meta.env.VITE_API_URL || "http://localhost:8000/graphql/",
@@ -14,8 +15,25 @@ const authLink = setContext((_, { headers }) => {
   };
 });
 
+const sha256 = async (query: string): Promise<string> => {
+  const digest = await crypto.subtle.digest(
+    "SHA-256",
+    new TextEncoder().encode(query)
+  );
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, "0"))
+    .join("");
+};
+
+// Send a hash instead of the full query text; hashed queries go out as GET
+// requests so HTTP caches can serve them.
+const persistedQueriesLink = createPersistedQueryLink({
+  sha256,
+  useGETForHashedQueries: true,
+});
+
 const client = new ApolloClient({
-  link: authLink.concat(httpLink),
+  link: authLink.concat(persistedQueriesLink).concat(httpLink),
   cache: new InMemoryCache({
     typePolicies: {
       Organization: {
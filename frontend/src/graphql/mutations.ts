@@ -49,6 +49,10 @@ export const DELETE_PROJECT = gql`
     deleteProject(id: $id) {
       success
       errors
+      job {
+        id
+        status
+      }
     }
   }
 `;
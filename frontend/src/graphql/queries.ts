@@ -76,11 +76,7 @@ export const GET_PROJECT = gql`
       description
       status
       dueDate
-      taskCount
-      completedTaskCount
-      completionPercentage
       isOverdue
-      canBeCompleted
       canAddTasks
       statusColor
       createdAt
@@ -90,6 +86,12 @@ export const GET_PROJECT = gql`
         name
         slug
       }
+      ... @defer {
+        taskCount
+        completedTaskCount
+        completionPercentage
+        canBeCompleted
+      }
     }
   }
 `;
@@ -169,16 +171,21 @@ export const GET_TASK = gql`
 `;
 
 export const GET_TASK_COMMENTS = gql`
-  query GetTaskComments($taskId: ID!) {
-    taskComments(taskId: $taskId) {
-      id
-      content
-      authorEmail
-      createdAt
-      updatedAt
-      task {
+  query GetTaskComments($taskId: ID!, $first: Int, $after: String) {
+    taskComments(taskId: $taskId, first: $first, after: $after) {
+      totalCount
+      hasMore
+      endCursor
+      comments {
         id
-        title
+        content
+        authorEmail
+        createdAt
+        updatedAt
+        task {
+          id
+          title
+        }
       }
     }
   }
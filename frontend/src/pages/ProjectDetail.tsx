@@ -101,7 +101,7 @@ export default function ProjectDetail() {
           <div className="card">
             <div className="card-body text-center">
               <div className="text-2xl font-bold text-primary-600">
-                {project.taskCount}
+                {project.taskCount ?? "…"}
               </div>
               <div className="text-sm text-gray-600">Total Tasks</div>
             </div>
@@ -109,7 +109,7 @@ export default function ProjectDetail() {
           <div className="card">
             <div className="card-body text-center">
               <div className="text-2xl font-bold text-success-600">
-                {project.completedTaskCount}
+                {project.completedTaskCount ?? "…"}
               </div>
               <div className="text-sm text-gray-600">Completed</div>
             </div>
@@ -117,7 +117,9 @@ export default function ProjectDetail() {
           <div className="card">
             <div className="card-body text-center">
               <div className="text-2xl font-bold text-warning-600">
-                {project.taskCount - project.completedTaskCount}
+                {project.taskCount == null
+                  ? "…"
+                  : project.taskCount - project.completedTaskCount}
               </div>
               <div className="text-sm text-gray-600">Remaining</div>
             </div>
@@ -125,7 +127,7 @@ export default function ProjectDetail() {
           <div className="card">
             <div className="card-body text-center">
               <div className="text-2xl font-bold text-primary-600">
-                {project.completionPercentage}%
+                {project.completionPercentage ?? "…"}%
               </div>
               <div className="text-sm text-gray-600">Progress</div>
             </div>